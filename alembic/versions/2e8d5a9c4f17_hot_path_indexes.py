@@ -0,0 +1,52 @@
+"""composite indexes for the hot lookup paths
+
+Revision ID: 2e8d5a9c4f17
+Revises: 9c4a2e7f1b38
+Create Date: 2026-10-18 16:20:07.532118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e8d5a9c4f17'
+down_revision: Union[str, Sequence[str], None] = '9c4a2e7f1b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns); checked by `python -m app.db.query_plans`
+INDEXES = [
+    ('ix_progress_student_course_content', 'student_course_content_progress', ['student_id', 'course_id', 'content_id']),
+    ('ix_chapter_contents_chapter_position', 'chapter_contents', ['chapter_id', 'position']),
+    ('ix_discussions_content_created', 'discussions', ['content_id', 'created_at']),
+    ('ix_discussion_comments_discussion_created', 'discussion_comments', ['discussion_id', 'created_at']),
+    ('ix_student_batches_user_created', 'student_batches', ['user_id', 'created_at']),
+    ('ix_student_batches_course', 'student_batches', ['course_id']),
+    ('ix_courses_user_created', 'courses', ['user_id', 'created_at']),
+    ('ix_courses_category_created', 'courses', ['category_id', 'created_at']),
+]
+
+
+def _existing(inspector, table):
+    return {ix['name'] for ix in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases built by create_all already have the indexes declared on the models
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name not in _existing(inspector, table):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in reversed(INDEXES):
+        if name in _existing(inspector, table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,51 @@
+"""index student_course_content_progress.content_id
+
+Revision ID: 3c9e7b1f5a48
+Revises: 8d2f6a4c1e95
+Create Date: 2026-10-18 21:04:12.518733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e7b1f5a48'
+down_revision: Union[str, Sequence[str], None] = '8d2f6a4c1e95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = 'student_course_content_progress'
+INDEX = 'ix_progress_content'
+
+
+def _has_index(bind) -> bool:
+    return any(ix['name'] == INDEX for ix in sa.inspect(bind).get_indexes(TABLE))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_index(op.get_bind()):
+        op.create_index(INDEX, TABLE, ['content_id'])
+
+    # summaries written before deleted contents stopped counting: recount the
+    # completions against the contents that still exist
+    op.execute("""
+        UPDATE student_course_summary s
+        JOIN (
+            SELECT p.student_id, p.course_id, COALESCE(SUM(p.is_completed = 1 AND cc.id IS NOT NULL), 0) AS completed
+            FROM student_course_content_progress p
+            LEFT JOIN chapter_contents cc ON cc.id = p.content_id
+            GROUP BY p.student_id, p.course_id
+        ) c ON c.student_id = s.student_id AND c.course_id = s.course_id
+        SET s.completed_contents = c.completed
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _has_index(op.get_bind()):
+        op.drop_index(INDEX, table_name=TABLE)
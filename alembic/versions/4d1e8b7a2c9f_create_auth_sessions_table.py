@@ -0,0 +1,42 @@
+"""create auth_sessions table
+
+Revision ID: 4d1e8b7a2c9f
+Revises: ca2c719aa285
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d1e8b7a2c9f'
+down_revision: Union[str, Sequence[str], None] = 'ca2c719aa285'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'auth_sessions',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('token_digest', sa.CHAR(64), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('user_agent', sa.String(255), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        mysql_engine='InnoDB',
+        mysql_charset='utf8mb4'
+    )
+    op.create_index('ix_auth_sessions_id', 'auth_sessions', ['id'])
+    op.create_index('ix_auth_sessions_user_id', 'auth_sessions', ['user_id'])
+    op.create_index('uq_auth_sessions_token_digest', 'auth_sessions', ['token_digest'], unique=True)
+    op.create_index('ix_auth_sessions_expires_at', 'auth_sessions', ['expires_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('auth_sessions')
@@ -0,0 +1,80 @@
+"""one progress row per student and content
+
+Revision ID: 5b7e1d3a9c62
+Revises: 2e8d5a9c4f17
+Create Date: 2026-10-18 18:05:41.218304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e1d3a9c62'
+down_revision: Union[str, Sequence[str], None] = '2e8d5a9c4f17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = 'student_course_content_progress'
+CONSTRAINT = 'uq_progress_student_content'
+
+
+def _has_constraint(bind) -> bool:
+    inspector = sa.inspect(bind)
+    return any(uq['name'] == CONSTRAINT for uq in inspector.get_unique_constraints(TABLE))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if _has_constraint(bind):
+        return
+
+    # Rows written before percentages were validated may hold NULL or text that
+    # is not a number; CAST would fail on those under strict mode, so they count as 0.
+    op.execute(f"""
+        UPDATE {TABLE}
+        SET complete_per = '0'
+        WHERE complete_per IS NULL
+           OR TRIM(complete_per) NOT REGEXP '^[0-9]{{1,4}}([.][0-9]+)?$'
+    """)
+    # Concurrent heartbeats left duplicate rows behind. The oldest row (MIN(id)) of
+    # each (student, content) keeps the highest percentage, completed if any copy
+    # was and the newest access time ...
+    op.execute(f"""
+        UPDATE {TABLE} p
+        JOIN (
+            SELECT
+                MIN(id) AS keep_id,
+                MAX(CAST(TRIM(complete_per) AS DECIMAL(6, 2))) AS complete_per,
+                MAX(is_completed) AS is_completed,
+                MAX(last_accessed) AS last_accessed
+            FROM {TABLE}
+            GROUP BY student_id, content_id
+            HAVING COUNT(*) > 1
+        ) d ON d.keep_id = p.id
+        SET p.complete_per = CAST(d.complete_per AS CHAR),
+            p.is_completed = d.is_completed,
+            p.last_accessed = d.last_accessed
+    """)
+    # ... and every other copy goes, by id only
+    op.execute(f"""
+        DELETE p FROM {TABLE} p
+        JOIN (
+            SELECT student_id, content_id, MIN(id) AS keep_id
+            FROM {TABLE}
+            GROUP BY student_id, content_id
+            HAVING COUNT(*) > 1
+        ) d ON d.student_id = p.student_id AND d.content_id = p.content_id
+        WHERE p.id <> d.keep_id
+    """)
+    op.create_unique_constraint(CONSTRAINT, TABLE, ['student_id', 'content_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _has_constraint(op.get_bind()):
+        op.drop_constraint(CONSTRAINT, TABLE, type_='unique')
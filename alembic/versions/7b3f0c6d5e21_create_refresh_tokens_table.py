@@ -0,0 +1,49 @@
+"""create refresh_tokens table
+
+Revision ID: 7b3f0c6d5e21
+Revises: 4d1e8b7a2c9f
+Create Date: 2026-10-18 11:40:05.532917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3f0c6d5e21'
+down_revision: Union[str, Sequence[str], None] = '4d1e8b7a2c9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'refresh_tokens',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('family_id', sa.CHAR(32), nullable=False),
+        sa.Column('token_digest', sa.CHAR(64), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('used_at', sa.DateTime(), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        mysql_engine='InnoDB',
+        mysql_charset='utf8mb4'
+    )
+    op.create_index('ix_refresh_tokens_id', 'refresh_tokens', ['id'])
+    op.create_index('ix_refresh_tokens_user_id', 'refresh_tokens', ['user_id'])
+    op.create_index('ix_refresh_tokens_family_id', 'refresh_tokens', ['family_id'])
+    op.create_index('uq_refresh_tokens_token_digest', 'refresh_tokens', ['token_digest'], unique=True)
+    op.create_index('ix_refresh_tokens_expires_at', 'refresh_tokens', ['expires_at'])
+
+    # ties an access-token session to the refresh family that minted it
+    op.add_column('auth_sessions', sa.Column('family_id', sa.CHAR(32), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('auth_sessions', 'family_id')
+    op.drop_table('refresh_tokens')
@@ -0,0 +1,67 @@
+"""student_course_summary completion rollup
+
+Revision ID: 8d2f6a4c1e95
+Revises: 5b7e1d3a9c62
+Create Date: 2026-10-18 19:12:26.640517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f6a4c1e95'
+down_revision: Union[str, Sequence[str], None] = '5b7e1d3a9c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if 'student_course_summary' not in inspector.get_table_names():
+        op.create_table(
+            'student_course_summary',
+            sa.Column('student_id', sa.Integer(), nullable=False, autoincrement=False),
+            sa.Column('course_id', sa.Integer(), nullable=False, autoincrement=False),
+            sa.Column('total_contents', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('completed_contents', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('last_accessed', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+            sa.PrimaryKeyConstraint('student_id', 'course_id'),
+        )
+        op.create_index('ix_student_course_summary_course', 'student_course_summary', ['course_id'])
+
+    # backfill from the existing progress; `python -m app.manage --rebuild-summary` does the same later
+    op.execute("""
+        INSERT INTO student_course_summary
+            (student_id, course_id, total_contents, completed_contents, last_accessed, updated_at)
+        SELECT
+            p.student_id,
+            p.course_id,
+            (
+                SELECT COUNT(cc.id)
+                FROM chapter_contents cc
+                JOIN course_chapters ch ON ch.id = cc.chapter_id
+                WHERE ch.course_id = p.course_id
+            ),
+            COALESCE(SUM(p.is_completed = 1 AND cc.id IS NOT NULL), 0),
+            MAX(p.last_accessed),
+            UTC_TIMESTAMP()
+        FROM student_course_content_progress p
+        LEFT JOIN chapter_contents cc ON cc.id = p.content_id
+        GROUP BY p.student_id, p.course_id
+        ON DUPLICATE KEY UPDATE
+            total_contents = VALUES(total_contents),
+            completed_contents = VALUES(completed_contents),
+            last_accessed = VALUES(last_accessed),
+            updated_at = VALUES(updated_at)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_student_course_summary_course', table_name='student_course_summary')
+    op.drop_table('student_course_summary')
@@ -0,0 +1,45 @@
+"""ensure unique (role_id, module_id) on permissions
+
+Revision ID: 9c4a2e7f1b38
+Revises: 7b3f0c6d5e21
+Create Date: 2026-10-18 13:05:51.204716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4a2e7f1b38'
+down_revision: Union[str, Sequence[str], None] = '7b3f0c6d5e21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases built by create_all never got uq_role_module, which the
+    # bulk permission upsert relies on.
+    inspector = sa.inspect(op.get_bind())
+    if any(ix['name'] == 'uq_role_module' for ix in inspector.get_indexes('permissions')):
+        return
+
+    # keep the newest row of each (role_id, module_id) pair
+    op.execute(
+        """
+        DELETE p FROM permissions p
+        JOIN permissions newer
+          ON newer.role_id = p.role_id
+         AND newer.module_id = p.module_id
+         AND newer.id > p.id
+        """
+    )
+    op.create_index('uq_role_module', 'permissions', ['role_id', 'module_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # uq_role_module predates this revision on most databases, leave it in place
+    pass
@@ -1,8 +1,8 @@
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.services.course_service import CourseService
 from app.schemas.course import CourseCreate
-from app.models.course import Course
 
 class CourseController:
 
@@ -43,8 +43,8 @@ class CourseController:
             )
 
     @staticmethod
-    def list(db, user_id: int, title=None, course_type=None, course_mode=None, category_id=None, skip=0, limit=10):
-        return CourseService.list_courses(
+    async def list(db: AsyncSession, user_id: int, title=None, course_type=None, course_mode=None, category_id=None, skip=0, limit=10, cursor=None, include_total=True, estimate_total=False):
+        return await CourseService.list_courses(
             db=db,
             user_id=user_id,
             title=title,
@@ -52,12 +52,15 @@ class CourseController:
             course_mode=course_mode,
             category_id=category_id,
             skip=skip,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+            estimate_total=estimate_total
         )
 
     @staticmethod
-    def adminCourseList(db, user_id: int, title=None, course_type=None, course_mode=None, category_id=None, skip=0, limit=10):
-        return CourseService.adminCourseList(
+    async def adminCourseList(db: AsyncSession, user_id: int, title=None, course_type=None, course_mode=None, category_id=None, skip=0, limit=10, cursor=None, include_total=True, estimate_total=False):
+        return await CourseService.adminCourseList(
             db=db,
             user_id=user_id,
             title=title,
@@ -65,12 +68,15 @@ class CourseController:
             course_mode=course_mode,
             category_id=category_id,
             skip=skip,
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+            estimate_total=estimate_total
         )
 
     @staticmethod
-    def get(course_id: int, user_id: int, db):
-        return CourseService.get_course(db, course_id, user_id)
+    async def get(course_id: int, user_id: int, db: AsyncSession):
+        return await CourseService.get_course(db, course_id, user_id)
 
     @staticmethod
     def update(course_id: int, payload: dict, user_id: int, db):
@@ -82,21 +88,21 @@ class CourseController:
         return course
 
     @staticmethod
-    def get_latest_by_category(category_id: int, db: Session, limit: int = 3):
-        return CourseService.get_latest_courses_by_category(db, category_id, limit)
+    async def get_latest_by_category(category_id: int, db: AsyncSession, limit: int = 3):
+        return await CourseService.get_latest_courses_by_category(db, category_id, limit)
 
     # Get singal course detail on the frontend
     @staticmethod
-    def ViewCourse(id: int, db: Session):
-        return CourseService.get_singal_course(db, id)
+    async def ViewCourse(id: int, db: AsyncSession):
+        return await CourseService.get_singal_course_async(db, id)
 
     @staticmethod
-    def get_all(db: Session):
-        return db.query(Course).order_by(Course.title.asc()).all()
+    async def get_all(db: AsyncSession):
+        return await CourseService.list_all(db)
 
     @staticmethod
-    def get_all_by_user(user_id: int, db: Session):
-        return db.query(Course).filter(Course.user_id == user_id).all()
+    async def get_all_by_user(user_id: int, db: AsyncSession):
+        return await CourseService.list_all(db, user_id)
 
 
 
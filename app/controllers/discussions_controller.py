@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.discussions import Discussion
 from app.models.discussion_comments import DiscussionComment
@@ -47,18 +49,37 @@ class DiscussionService:
     # GET DISCUSSIONS BY CONTENT ID + USER DETAIL
     # ---------------------------------------------------------
     @staticmethod
-    def get_discussions_by_content_id(db: Session, content_id: int):
+    async def get_discussions_by_content_id(db: AsyncSession, content_id: int):
 
         discussions = (
-            db.query(Discussion)
-            .filter(Discussion.content_id == content_id)
-            .order_by(Discussion.created_at.desc())
-            .all()
+            await db.execute(
+                select(Discussion)
+                .where(Discussion.content_id == content_id)
+                .order_by(Discussion.created_at.desc())
+            )
+        ).scalars().all()
+
+        # All comments of these discussions in one query, grouped per discussion
+        comments = (
+            await db.execute(
+                select(DiscussionComment)
+                .where(DiscussionComment.discussion_id.in_([d.id for d in discussions]))
+                .order_by(DiscussionComment.created_at.asc())
+            )
+        ).scalars().all() if discussions else []
+
+        users = await DiscussionService._users_by_id(
+            db, {d.user_id for d in discussions} | {c.user_id for c in comments}
         )
+        comments_by_discussion = {}
+        for c in comments:
+            comments_by_discussion.setdefault(c.discussion_id, []).append(
+                DiscussionService._comment_item(c, users.get(c.user_id))
+            )
 
         result = []
         for d in discussions:
-            user = db.query(User).filter(User.id == d.user_id).first()
+            user = users.get(d.user_id)
 
             user_data = None
             if user:
@@ -68,9 +89,6 @@ class DiscussionService:
                     "email": user.email
                 }
 
-            # Fetch nested comments for each discussion
-            comments = DiscussionService.get_comments_by_discussion(db, d.id)
-
             result.append({
                 "id": d.id,
                 "course_id": d.course_id,
@@ -83,11 +101,18 @@ class DiscussionService:
                 "updated_at": d.updated_at,
                 "user": user_data,
                 "user_id": d.user_id,
-                "comments": comments,
+                "comments": comments_by_discussion.get(d.id, []),
             })
 
         return result
 
+    @staticmethod
+    async def _users_by_id(db: AsyncSession, user_ids: set) -> dict:
+        if not user_ids:
+            return {}
+        users = (await db.execute(select(User).where(User.id.in_(user_ids)))).scalars().all()
+        return {u.id: u for u in users}
+
     # ---------------------------------------------------------
     # CREATE COMMENT (TOP LEVEL OR REPLY)
     # ---------------------------------------------------------
@@ -114,43 +139,41 @@ class DiscussionService:
     # GET COMMENTS (NESTED)
     # ---------------------------------------------------------
     @staticmethod
-    def get_comments_by_discussion(db: Session, discussion_id: int):
+    async def get_comments_by_discussion(db: AsyncSession, discussion_id: int):
         comments = (
-            db.query(DiscussionComment)
-            .filter(DiscussionComment.discussion_id == discussion_id)
-            .order_by(DiscussionComment.created_at.asc())
-            .all()
-        )
+            await db.execute(
+                select(DiscussionComment)
+                .where(DiscussionComment.discussion_id == discussion_id)
+                .order_by(DiscussionComment.created_at.asc())
+            )
+        ).scalars().all()
 
-        results = []
+        users = await DiscussionService._users_by_id(db, {c.user_id for c in comments})
+        return [DiscussionService._comment_item(c, users.get(c.user_id)) for c in comments]
 
-        for c in comments:
-            # fetch user info
-            user = db.query(User).filter(User.id == c.user_id).first()
-
-            results.append({
-                "id": c.id,
-                "discussion_id": c.discussion_id,
-                "course_id": c.course_id,
-                "chapter_id": c.chapter_id,
-                "content_id": c.content_id,
-                "user_id": c.user_id,
-                "parent_id": c.parent_id,
-                "content": c.content,
-                "likes": c.likes,
-                "created_at": c.created_at,
-                "replies": [],
-
-                # ALWAYS INCLUDE THIS KEY
-                "user": {
-                    "id": user.id if user else None,
-                    "name": getattr(user, "name", None) if user else None,
-                    "email": getattr(user, "email", None) if user else None,
-                    "avatar": getattr(user, "avatar", None) if user else None,
-                }
-            })
-
-        return results
+    @staticmethod
+    def _comment_item(c: DiscussionComment, user) -> dict:
+        return {
+            "id": c.id,
+            "discussion_id": c.discussion_id,
+            "course_id": c.course_id,
+            "chapter_id": c.chapter_id,
+            "content_id": c.content_id,
+            "user_id": c.user_id,
+            "parent_id": c.parent_id,
+            "content": c.content,
+            "likes": c.likes,
+            "created_at": c.created_at,
+            "replies": [],
+
+            # ALWAYS INCLUDE THIS KEY
+            "user": {
+                "id": user.id if user else None,
+                "name": getattr(user, "name", None) if user else None,
+                "email": getattr(user, "email", None) if user else None,
+                "avatar": getattr(user, "avatar", None) if user else None,
+            }
+        }
 
     @staticmethod
     def attach_replies(tree_node, comment_obj):
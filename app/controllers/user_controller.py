@@ -1,17 +1,17 @@
-from sqlalchemy.orm import Session,joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from fastapi.responses import JSONResponse
 from app.models.user_details import UserDetails
-from app.schemas.auth import UserCreate, UserUpdate,UserLogin, UserOut, Token, AssignPermissionRequest
+from app.schemas.auth import UserCreate, UserUpdate,UserLogin, UserOut, Token, AssignPermissionRequest, AssignPermissionMatrixRequest
 from app.services.auth_service import AuthService
 from app.services.user_service import UserService
+from app.core.permission_matrix import permission_matrix
 
 from app.models.models import User, UserRole, Role, Permission
-from datetime import datetime
 
 class UserController:
 
     @staticmethod
-    def create(payload: UserCreate, db: Session, authorization: str):
+    def create(payload: UserCreate, db: Session):
         #print(f'asdfasdf {payload}')
         auth_service = AuthService()
         new_user = auth_service.register(db, payload)
@@ -30,19 +30,25 @@ class UserController:
         )
 
     @staticmethod
-    def list(db: Session, skip: int = 0, limit: int = 10, users=None, total=None):
+    def list(db: Session, skip: int = 0, limit: int = 10, users=None, total=None, cursor=None, next_cursor=None,
+             total_estimated=False):
         if users is None:
-            query = db.query(User)
+            query = db.query(User).options(selectinload(User.roles)).order_by(User.id)
             total = query.count()
             users = query.offset(skip).limit(limit).all()
 
+        if cursor is not None:
+            # keyset mode: no total, the client follows next_cursor
+            page = {"cursor": cursor or None, "limit": limit}
+        else:
+            page = {"total": total, "total_estimated": total_estimated, "skip": skip, "limit": limit}
+
         return JSONResponse(
             content={
                 "success": True,
                 "message": "Users retrieved successfully",
-                "total": total,
-                "skip": skip,
-                "limit": limit,
+                **page,
+                "next_cursor": next_cursor,
                 "data": [
                     {
                         "id": u.id,
@@ -246,6 +252,7 @@ class UserController:
 
             db.commit()
             db.refresh(permission)
+            permission_matrix.apply_permission(permission)
 
             return JSONResponse(
                 content={
@@ -323,28 +330,45 @@ class UserController:
             )
 
     @staticmethod
-    def get_user_by_token(authorization: str, db: Session, user_controller=None):
+    def assign_permission_matrix(payload: AssignPermissionMatrixRequest, db: Session):
+        try:
+            diff = UserService.assign_permission_matrix(payload, db)
+            return JSONResponse(
+                content={
+                    "success": True,
+                    "message": "Permissions assigned successfully",
+                    "data": diff,
+                },
+                status_code=200,
+            )
+        except ValueError as e:
+            db.rollback()
+            return JSONResponse(
+                content={"error_code": 400, "success": False, "message": str(e)},
+                status_code=400,
+            )
+        except Exception as e:
+            db.rollback()
+            return JSONResponse(
+                content={"success": False, "message": str(e)},
+                status_code=500,
+            )
+
+    @staticmethod
+    def get_user_details(user_id: int, db: Session):
         """
-        Get user details using access_token and ensure it's not expired.
+        Get user details for the already authenticated caller.
         """
 
         try:
-            # Extract the token from the header (Bearer <token>)
-            token = authorization.split(" ")[1] if " " in authorization else authorization
-            #return token
-            # Query the user table for a valid token
             user = (
                 db.query(User)
-                .join(User.roles)
-                .filter(
-                    User.access_token.like(f"%{token}%"),
-                    User.token_expiry > datetime.utcnow()
-                )
+                .options(joinedload(User.roles))
+                .filter(User.id == user_id)
                 .first()
             )
-            #return user
             if not user:
-                return None  # token invalid or expired
+                return None
 
             # Prepare a clean response dict
             return {
@@ -361,11 +385,11 @@ class UserController:
                 "father_name": user.father_name,
                 "mother_name": user.mother_name,
                 "profile_picture": user.profile_picture,
-                "token_expiry": user.token_expiry.strftime("%Y-%m-%d %H:%M:%S")
+                "token_expiry": user.token_expiry.strftime("%Y-%m-%d %H:%M:%S") if user.token_expiry else None
             }
 
         except Exception as e:
-            print(f"Error fetching user by token: {e}")
+            print(f"Error fetching user details: {e}")
             return None
 
     # Get student users
@@ -0,0 +1,103 @@
+import threading
+from collections import deque
+from datetime import datetime
+from sqlalchemy import insert
+from app.core.config import settings
+from app.db.session import db as database
+from app.models.models import ActivityLog
+
+
+class ActivitySink:
+    """
+    Write-behind buffer for activity_logs rows.
+
+    record() only appends to memory; a background thread writes the rows
+    with one multi-row INSERT when batch_size rows are waiting or every
+    flush_seconds. Once max_buffer rows are waiting new events are dropped
+    and counted, so a slow database never blocks login.
+    """
+
+    def __init__(self, engine, max_buffer: int = 10000, batch_size: int = 500, flush_seconds: float = 2.0):
+        self.engine = engine
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._rows: deque = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.dropped = 0
+        self.written = 0
+        self.failed_flushes = 0
+
+    def record(self, user_id: int, action: str) -> None:
+        with self._lock:
+            if self._stopped.is_set() or len(self._rows) >= self.max_buffer:
+                self.dropped += 1
+                return
+            self._rows.append({"user_id": user_id, "action": action, "timestamp": datetime.utcnow()})
+            depth = len(self._rows)
+            if self._thread is None:
+                self._start()
+        if depth >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """Write everything buffered so far, returns the number of rows written."""
+        total = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._rows.popleft() for _ in range(min(self.batch_size, len(self._rows)))]
+                if not batch:
+                    return total
+                try:
+                    with self.engine.begin() as conn:
+                        # list of dicts -> executemany / multi-row INSERT
+                        conn.execute(insert(ActivityLog.__table__), batch)
+                except Exception as e:
+                    self.failed_flushes += 1
+                    self.dropped += len(batch)
+                    print(f"Activity log flush failed, dropped {len(batch)} rows: {e}")
+                    return total
+                total += len(batch)
+                self.written += len(batch)
+
+    def close(self) -> None:
+        """Stop the flusher and write what is left; called on application shutdown."""
+        self._stopped.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=self.flush_seconds + 5)
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "buffer_depth": len(self._rows),
+                "max_buffer": self.max_buffer,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed_flushes": self.failed_flushes,
+            }
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="activity-sink", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_seconds)
+            self._wakeup.clear()
+            self.flush()
+
+
+activity_sink = ActivitySink(
+    database.engine,
+    max_buffer=settings.ACTIVITY_BUFFER_MAX,
+    batch_size=settings.ACTIVITY_FLUSH_BATCH,
+    flush_seconds=settings.ACTIVITY_FLUSH_SECONDS,
+)
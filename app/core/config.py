@@ -17,18 +17,107 @@ class Settings:
     # MYSQL_PORT: str = os.getenv("MYSQL_PORT")
     # MYSQL_DB: str = os.getenv("MYSQL_DB")
 
+    # Connection pool, per uvicorn worker
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # "always" | "idle" | "never"
+    DB_POOL_PRE_PING: str = os.getenv("DB_POOL_PRE_PING", "idle").lower()
+    DB_POOL_PING_IDLE_SECONDS: int = int(os.getenv("DB_POOL_PING_IDLE_SECONDS", "30"))
+    # Per-request query count / DB time in Server-Timing, and the same statement
+    # shape repeated this many times in one request is reported as a likely N+1
+    QUERY_STATS_ENABLED: bool = os.getenv("QUERY_STATS_ENABLED", "true").lower() == "true"
+    QUERY_REPEAT_THRESHOLD: int = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+    # Slow statement log (0 disables): rotating JSON-lines file plus an EXPLAIN
+    # of this share of the slow SELECTs, aggregated at GET /system/slow-queries
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "500"))
+    SLOW_QUERY_EXPLAIN_SAMPLE: float = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE", "0.1"))
+    SLOW_QUERY_LOG_FILE: str = os.getenv("SLOW_QUERY_LOG_FILE", "logs/slow_queries.log")
+    SLOW_QUERY_LOG_MAX_BYTES: int = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    SLOW_QUERY_LOG_BACKUPS: int = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+    # Optional read replicas: comma separated SQLAlchemy URLs (mysql+pymysql://...)
+    DB_REPLICA_URLS: str = os.getenv("DB_REPLICA_URLS", "")
+    # Driver and pool of the async engine used by the non-blocking read endpoints
+    DB_ASYNC_DRIVER: str = os.getenv("DB_ASYNC_DRIVER", "aiomysql")
+    DB_ASYNC_POOL_SIZE: int = int(os.getenv("DB_ASYNC_POOL_SIZE", "20"))
+    DB_ASYNC_MAX_OVERFLOW: int = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", "20"))
+    # COUNT(*) cache of the paginated lists (0 disables), invalidated by writes in the same worker
+    COUNT_CACHE_TTL_SECONDS: float = float(os.getenv("COUNT_CACHE_TTL_SECONDS", "30"))
+    COUNT_CACHE_MAX_ENTRIES: int = int(os.getenv("COUNT_CACHE_MAX_ENTRIES", "5000"))
+    # Rows per multi-row INSERT of the BaseRepository bulk helpers
+    BULK_CHUNK_SIZE: int = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+    # Start-up comparison of the Alembic head with the database revision:
+    # "off" | "warn" | "strict" (refuse to start when they differ)
+    SCHEMA_CHECK: str = os.getenv("SCHEMA_CHECK", "off").lower()
+
     SECRET_KEY: str = os.getenv("SECRET_KEY", "BBDULMS")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_MINUTES: int = int(os.getenv("ACCESS_TOKEN_MINUTES", "30"))
+    # Rotating refresh tokens, stored as an HMAC keyed with REFRESH_TOKEN_SECRET
+    REFRESH_TOKEN_DAYS: int = int(os.getenv("REFRESH_TOKEN_DAYS", "30"))
+    REFRESH_TOKEN_SECRET: str = os.getenv("REFRESH_TOKEN_SECRET", SECRET_KEY)
+
+    # "session": tokens are looked up in the database
+    # "stateless": the signed JWT claims are trusted, no database round-trip
+    AUTH_MODE: str = os.getenv("AUTH_MODE", "session").lower()
+    TOKEN_DENYLIST_MAX_ENTRIES: int = int(os.getenv("TOKEN_DENYLIST_MAX_ENTRIES", "10000"))
+
+    # In-process cache of resolved bearer tokens (0 disables)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+    # Safety-net rebuild of the role x module permission matrix (0 = never)
+    PERMISSION_MATRIX_REFRESH_SECONDS: int = int(os.getenv("PERMISSION_MATRIX_REFRESH_SECONDS", "300"))
+
+    # Expired auth_sessions rows are deleted by a background job (0 disables it)
+    AUTH_SESSION_PURGE_SECONDS: int = int(os.getenv("AUTH_SESSION_PURGE_SECONDS", "3600"))
+    AUTH_SESSION_PURGE_BATCH: int = int(os.getenv("AUTH_SESSION_PURGE_BATCH", "1000"))
+
+    # Login admission control: attempts per minute and burst, per username and per client IP
+    LOGIN_RATE_PER_USERNAME: float = float(os.getenv("LOGIN_RATE_PER_USERNAME", "5"))
+    LOGIN_BURST_PER_USERNAME: int = int(os.getenv("LOGIN_BURST_PER_USERNAME", "5"))
+    LOGIN_RATE_PER_IP: float = float(os.getenv("LOGIN_RATE_PER_IP", "60"))
+    LOGIN_BURST_PER_IP: int = int(os.getenv("LOGIN_BURST_PER_IP", "30"))
+    LOGIN_LIMITER_MAX_KEYS: int = int(os.getenv("LOGIN_LIMITER_MAX_KEYS", "50000"))
+    # bcrypt verifications allowed in flight before logins get an immediate 429
+    LOGIN_MAX_IN_FLIGHT: int = int(os.getenv("LOGIN_MAX_IN_FLIGHT", "16"))
+
+    # bcrypt work factor; stored hashes with another cost are rehashed on login
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    # Dedicated bcrypt pool: worker threads and max jobs waiting for one
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "256"))
+
+    # Write-behind buffer for activity_logs (login/logout events)
+    ACTIVITY_BUFFER_MAX: int = int(os.getenv("ACTIVITY_BUFFER_MAX", "10000"))
+    ACTIVITY_FLUSH_BATCH: int = int(os.getenv("ACTIVITY_FLUSH_BATCH", "500"))
+    ACTIVITY_FLUSH_SECONDS: float = float(os.getenv("ACTIVITY_FLUSH_SECONDS", "2"))
+    # Write-behind buffer of progress heartbeats (0 seconds writes every heartbeat directly)
+    PROGRESS_FLUSH_SECONDS: float = float(os.getenv("PROGRESS_FLUSH_SECONDS", "5"))
+    PROGRESS_FLUSH_BATCH: int = int(os.getenv("PROGRESS_FLUSH_BATCH", "500"))
+    PROGRESS_BUFFER_MAX_KEYS: int = int(os.getenv("PROGRESS_BUFFER_MAX_KEYS", "50000"))
 
     BASE_URL: str =os.getenv("BASE_URL")
 
+    @property
+    def stateless_auth(self) -> bool:
+        return self.AUTH_MODE == "stateless"
+
     @property
     def database_url(self) -> str:
         # Encode password safely
         encoded_password = quote_plus(self.MYSQL_PASSWORD)
         return f"mysql+pymysql://{self.MYSQL_USER}:{encoded_password}@{self.MYSQL_HOST}:{self.MYSQL_PORT}/{self.MYSQL_DB}"
 
+    @property
+    def replica_urls(self) -> list[str]:
+        return [url.strip() for url in self.DB_REPLICA_URLS.split(",") if url.strip()]
+
+    @property
+    def async_database_url(self) -> str:
+        encoded_password = quote_plus(self.MYSQL_PASSWORD)
+        return f"mysql+{self.DB_ASYNC_DRIVER}://{self.MYSQL_USER}:{encoded_password}@{self.MYSQL_HOST}:{self.MYSQL_PORT}/{self.MYSQL_DB}"
+
 
 settings = Settings()
 #print(settings.database_url)
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.core.config import settings
+from app.core.security import security
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many bcrypt jobs are already waiting for a worker."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, size-limited thread pool so a login storm
+    queues here instead of taking every slot of the request threadpool.
+
+    max_workers bounds the CPU spent on bcrypt, max_queue bounds how many
+    jobs may wait for a worker before new ones are rejected.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 256):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(security.hash_password, password)
+
+    async def verify_and_update(self, plain: str, hashed: str) -> tuple[bool, str | None]:
+        """Returns (valid, new_hash); new_hash is set when the stored hash uses an old cost."""
+        return await self._submit(security.verify_and_update, plain, hashed)
+
+    async def _submit(self, fn, *args):
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy("Too many concurrent password operations, retry shortly")
+            self._queued += 1
+            self.peak_queued = max(self.peak_queued, self._queued)
+
+        job = {"started": False}
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, self._run, job, fn, args)
+        finally:
+            with self._lock:
+                if not job["started"]:
+                    # cancelled while still waiting for a worker
+                    self._queued -= 1
+                    job["started"] = True
+                    self.cancelled += 1
+
+    def _run(self, job, fn, args):
+        with self._lock:
+            if job["started"]:
+                return None
+            job["started"] = True
+            self._queued -= 1
+            self._running += 1
+        try:
+            result = fn(*args)
+        except Exception:
+            with self._lock:
+                self._running -= 1
+                self.failed += 1
+            raise
+        with self._lock:
+            self._running -= 1
+            self.completed += 1
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "running": self._running,
+                "queue_depth": self._queued,
+                "peak_queue_depth": self.peak_queued,
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
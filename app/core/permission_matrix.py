@@ -0,0 +1,133 @@
+import threading
+import time
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.models import Permission, Module
+
+# One bit per action in the role x module matrix
+ACTION_BITS = {
+    "create": 1,
+    "read": 2,
+    "update": 4,
+    "delete": 8,
+}
+
+
+def permission_mask(can_create, can_read, can_update, can_delete) -> int:
+    mask = 0
+    if can_create:
+        mask |= ACTION_BITS["create"]
+    if can_read:
+        mask |= ACTION_BITS["read"]
+    if can_update:
+        mask |= ACTION_BITS["update"]
+    if can_delete:
+        mask |= ACTION_BITS["delete"]
+    return mask
+
+
+class PermissionMatrix:
+    """
+    (role_id, module_name) -> action bitmask, compiled once from the
+    permissions/modules tables and patched in place on permission writes.
+
+    Each worker process holds its own copy, so the matrix is also rebuilt
+    after refresh_seconds to pick up writes made by other workers.
+    """
+
+    def __init__(self, refresh_seconds: int = 300):
+        self.refresh_seconds = refresh_seconds
+        self.version = 0
+        self._bits: dict[tuple[int, str], int] = {}
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+
+    def load(self, db: Session) -> None:
+        rows = (
+            db.query(
+                Permission.role_id,
+                Module.name,
+                Permission.can_create,
+                Permission.can_read,
+                Permission.can_update,
+                Permission.can_delete,
+            )
+            .join(Module, Module.id == Permission.module_id)
+            .all()
+        )
+        bits = {}
+        for role_id, module_name, *flags in rows:
+            key = (role_id, module_name)
+            bits[key] = bits.get(key, 0) | permission_mask(*flags)
+
+        with self._lock:
+            self._bits = bits
+            self._loaded_at = time.monotonic()
+            self.version += 1
+
+    def ensure_loaded(self, db: Session) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is None or (
+            self.refresh_seconds > 0 and time.monotonic() - loaded_at > self.refresh_seconds
+        ):
+            self.load(db)
+
+    def allows(self, role_ids, module_name: str, action: str, db: Session) -> bool:
+        bit = ACTION_BITS.get(action)
+        if bit is None:
+            return False
+        self.ensure_loaded(db)
+        bits = self._bits
+        for role_id in role_ids:
+            if bits.get((role_id, module_name), 0) & bit:
+                return True
+        return False
+
+    def set(self, role_id: int, module_name: str, mask: int) -> None:
+        with self._lock:
+            if self._loaded_at is None:
+                # not compiled yet, the first check will load everything
+                return
+            bits = dict(self._bits)
+            if mask:
+                bits[(role_id, module_name)] = mask
+            else:
+                bits.pop((role_id, module_name), None)
+            self._bits = bits
+            self.version += 1
+
+    def apply_permission(self, permission: Permission) -> None:
+        """Patch a single (role, module) cell from a saved Permission row."""
+        if permission.module is None:
+            self.invalidate()
+            return
+        self.set(
+            permission.role_id,
+            permission.module.name,
+            permission_mask(
+                permission.can_create,
+                permission.can_read,
+                permission.can_update,
+                permission.can_delete,
+            ),
+        )
+
+    def discard_role(self, role_id: int) -> None:
+        with self._lock:
+            self._bits = {k: v for k, v in self._bits.items() if k[0] != role_id}
+            self.version += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+            self.version += 1
+
+    def stats(self) -> dict:
+        return {
+            "cells": len(self._bits),
+            "version": self.version,
+            "loaded": self._loaded_at is not None,
+        }
+
+
+permission_matrix = PermissionMatrix(refresh_seconds=settings.PERMISSION_MATRIX_REFRESH_SECONDS)
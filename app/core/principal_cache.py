@@ -0,0 +1,143 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from app.core.config import settings
+
+
+def token_digest(token: str) -> str:
+    """Fixed-length key for a bearer token so raw tokens are never kept in memory maps."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class Principal:
+    """
+    The authenticated caller as seen by the routers.
+    Only carries what auth needs: id, roles and token expiry.
+    """
+
+    __slots__ = ("id", "username", "role", "role_ids", "token_expiry")
+
+    def __init__(self, id: int, username: str | None, role: str | None, role_ids, token_expiry: datetime | None):
+        self.id = id
+        self.username = username
+        self.role = role
+        self.role_ids = tuple(role_ids)
+        self.token_expiry = token_expiry
+
+    @classmethod
+    def from_user(cls, user, token_expiry: datetime | None = None) -> "Principal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            role=user.role,
+            role_ids=[r.id for r in user.roles],
+            token_expiry=token_expiry if token_expiry is not None else user.token_expiry,
+        )
+
+    def expiry_timestamp(self) -> float | None:
+        if self.token_expiry is None:
+            return None
+        expiry = self.token_expiry
+        if expiry.tzinfo is None:
+            expiry = expiry.replace(tzinfo=timezone.utc)
+        return expiry.timestamp()
+
+    def is_expired(self) -> bool:
+        expires = self.expiry_timestamp()
+        return expires is not None and expires <= time.time()
+
+
+class PrincipalCache:
+    """
+    In-process TTL + LRU cache of token digest -> Principal.
+    Entries never outlive the token expiry. Writers that change a user's
+    token, roles or account must call evict_user().
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: int = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, Principal]]" = OrderedDict()
+        self._by_user: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Principal | None:
+        key = token_digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, principal = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return principal
+
+    def put(self, token: str, principal: Principal) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        token_expires = principal.expiry_timestamp()
+        if token_expires is not None:
+            expires_at = min(expires_at, token_expires)
+        if expires_at <= time.time():
+            return
+
+        key = token_digest(token)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, principal)
+            self._by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def evict_token(self, token: str) -> None:
+        with self._lock:
+            self._remove(token_digest(token))
+
+    def evict_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in self._by_user.pop(user_id, set()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry[1].id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry[1].id]
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,177 @@
+import threading
+import time
+from collections import OrderedDict
+from app.core.config import settings
+from app.db.session import db as database
+from app.services.student_course_progress_service import progress_row, write_progress
+
+
+class ProgressBuffer:
+    """
+    Write-behind, coalescing buffer for content progress heartbeats.
+
+    record() keeps one pending row per (student_id, content_id) with the
+    highest percentage and the newest access time; a background thread writes
+    the pending rows with bulk upserts every flush_seconds. A heartbeat that
+    completes a content is written right away, so unlocking the next content
+    never waits for the timer; later heartbeats of that content coalesce again.
+    When max_keys rows are pending, new keys are written through directly.
+    """
+
+    def __init__(self, engine, flush_seconds: float = 5.0, batch_size: int = 500, max_keys: int = 50000,
+                 max_completed_keys: int = 100000):
+        self.engine = engine
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self.max_keys = max_keys
+        self.max_completed_keys = max_completed_keys
+        self._pending: dict[tuple[int, int], dict] = {}
+        # keys whose completion was already written, so 96%, 97%... are buffered again
+        self._completed: "OrderedDict[tuple[int, int], None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.recorded = 0
+        self.coalesced = 0
+        self.written = 0
+        self.immediate_writes = 0
+        self.direct_writes = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self._flush_ms_total = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.flush_seconds > 0
+
+    def record(self, student_id: int, course_id: int, chapter_id: int, content_id: int, complete_per) -> None:
+        row = progress_row(student_id, course_id, chapter_id, content_id, complete_per)
+        key = (student_id, content_id)
+        percentage = float(row["complete_per"])
+        write_now = False
+
+        with self._lock:
+            self.recorded += 1
+            current = self._pending.get(key)
+            if current is not None:
+                self.coalesced += 1
+                if percentage < float(current["complete_per"]):
+                    row["complete_per"] = current["complete_per"]
+                    row["is_completed"] = current["is_completed"]
+            elif self._stopped.is_set() or len(self._pending) >= self.max_keys:
+                self.direct_writes += 1
+                write_now = True
+
+            if row["is_completed"] and key not in self._completed:
+                self._pending.pop(key, None)
+                self._remember_completed(key)
+                self.immediate_writes += 1
+                write_now = True
+            elif not write_now:
+                self._pending[key] = row
+                if self._thread is None:
+                    self._start()
+
+        if write_now and not self._write([row]):
+            self._requeue([row])
+
+    def flush(self) -> int:
+        """Write every pending row, returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._pending = list(self._pending.values()), {}
+            total = 0
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start:start + self.batch_size]
+                if not self._write(batch):
+                    self._requeue(rows[start:])
+                    break
+                total += len(batch)
+            return total
+
+    def close(self) -> None:
+        """Stop the flusher and write what is left; called on application shutdown."""
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=self.flush_seconds + 5)
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backlog": len(self._pending),
+                "max_keys": self.max_keys,
+                "recorded": self.recorded,
+                "coalesced": self.coalesced,
+                "written": self.written,
+                "immediate_writes": self.immediate_writes,
+                "direct_writes": self.direct_writes,
+                "flushes": self.flushes,
+                "failed_flushes": self.failed_flushes,
+                "last_flush_ms": round(self.last_flush_ms, 2),
+                "avg_flush_ms": round(self._flush_ms_total / self.flushes, 2) if self.flushes else 0.0,
+                "max_flush_ms": round(self.max_flush_ms, 2),
+                "last_batch_size": self.last_batch_size,
+                "max_batch_size": self.max_batch_size,
+            }
+
+    def _write(self, rows: list[dict]) -> bool:
+        started = time.perf_counter()
+        try:
+            with self.engine.begin() as conn:
+                write_progress(conn, rows)
+        except Exception as e:
+            with self._lock:
+                self.failed_flushes += 1
+            print(f"Progress flush of {len(rows)} rows failed: {e}")
+            return False
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.flushes += 1
+            self.written += len(rows)
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self._flush_ms_total += elapsed_ms
+            self.last_batch_size = len(rows)
+            self.max_batch_size = max(self.max_batch_size, len(rows))
+        return True
+
+    def _requeue(self, rows: list[dict]) -> None:
+        """Put rows of a failed flush back, unless a newer heartbeat already replaced them."""
+        with self._lock:
+            for row in rows:
+                key = (row["student_id"], row["content_id"])
+                current = self._pending.get(key)
+                if current is None:
+                    self._pending[key] = row
+                elif float(row["complete_per"]) > float(current["complete_per"]):
+                    current["complete_per"] = row["complete_per"]
+                    current["is_completed"] = row["is_completed"] or current["is_completed"]
+
+    def _remember_completed(self, key) -> None:
+        self._completed[key] = None
+        self._completed.move_to_end(key)
+        while len(self._completed) > self.max_completed_keys:
+            self._completed.popitem(last=False)
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="progress-buffer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.flush_seconds):
+            self.flush()
+
+
+progress_buffer = ProgressBuffer(
+    database.engine,
+    flush_seconds=settings.PROGRESS_FLUSH_SECONDS,
+    batch_size=settings.PROGRESS_FLUSH_BATCH,
+    max_keys=settings.PROGRESS_BUFFER_MAX_KEYS,
+)
@@ -0,0 +1,123 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from app.core.config import settings
+
+
+class RateLimited(Exception):
+    """Raised when a request is refused; retry_after is in seconds."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.message = message
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket per key (username, client IP ...): `burst` attempts at once,
+    refilled at `per_minute` per minute. Buckets live in an LRU map capped at
+    max_keys, so a flood of distinct keys cannot grow memory without bound.
+    """
+
+    def __init__(self, per_minute: float, burst: int, max_keys: int = 50000):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def acquire(self, key: str) -> float:
+        """Take one token; returns 0 when allowed, otherwise seconds until the next token."""
+        if self.burst <= 0 or self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                self._buckets.move_to_end(key)
+                self.rejected += 1
+                return (1 - tokens) / self.rate
+
+            self._buckets[key] = (tokens - 1, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return 0.0
+
+    def refund(self, key: str) -> None:
+        """Give back the token of an attempt that another limiter refused."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                self._buckets[key] = (min(float(self.burst), bucket[0] + 1), bucket[1])
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"keys": len(self._buckets), "max_keys": self.max_keys, "rejected": self.rejected}
+
+
+class LoginAdmission:
+    """
+    Admission control in front of the password check: per-username and
+    per-IP buckets, plus a global cap on bcrypt verifications in flight.
+    Everything is refused before any bcrypt work is done.
+    """
+
+    def __init__(self, by_username: TokenBucketLimiter, by_ip: TokenBucketLimiter, max_in_flight: int = 16):
+        self.by_username = by_username
+        self.by_ip = by_ip
+        self.max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.rejected_busy = 0
+
+    def admit(self, username: str, client_ip: str | None) -> None:
+        if client_ip:
+            wait = self.by_ip.acquire(client_ip)
+            if wait:
+                raise RateLimited("Too many login attempts from this address, retry later", wait)
+        wait = self.by_username.acquire(username.lower())
+        if wait:
+            # refused attempts must not use up the address's budget
+            if client_ip:
+                self.by_ip.refund(client_ip)
+            raise RateLimited("Too many login attempts for this account, retry later", wait)
+
+    @contextmanager
+    def verify_slot(self):
+        with self._lock:
+            if self.max_in_flight > 0 and self._in_flight >= self.max_in_flight:
+                self.rejected_busy += 1
+                raise RateLimited("Login service busy, retry shortly", 1)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "rejected_busy": self.rejected_busy,
+            "by_username": self.by_username.stats(),
+            "by_ip": self.by_ip.stats(),
+        }
+
+
+login_admission = LoginAdmission(
+    by_username=TokenBucketLimiter(
+        settings.LOGIN_RATE_PER_USERNAME, settings.LOGIN_BURST_PER_USERNAME, settings.LOGIN_LIMITER_MAX_KEYS
+    ),
+    by_ip=TokenBucketLimiter(
+        settings.LOGIN_RATE_PER_IP, settings.LOGIN_BURST_PER_IP, settings.LOGIN_LIMITER_MAX_KEYS
+    ),
+    max_in_flight=settings.LOGIN_MAX_IN_FLIGHT,
+)
@@ -1,9 +1,13 @@
+import hashlib
+import hmac
+import secrets
+import uuid
 from datetime import datetime, timedelta
-from jose import jwt
+from jose import jwt, JWTError
 from passlib.context import CryptContext
 from .config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 class SecurityService:
     def __init__(self, secret_key: str = settings.SECRET_KEY, algorithm: str = settings.ALGORITHM):
@@ -16,18 +20,44 @@ class SecurityService:
     def verify_password(self, plain: str, hashed: str) -> bool:
         return pwd_context.verify(plain, hashed)
 
+    def verify_and_update(self, plain: str, hashed: str) -> tuple[bool, str | None]:
+        """Verify, and return a fresh hash when the stored one no longer matches the configured cost."""
+        return pwd_context.verify_and_update(plain, hashed)
+
     def create_access_token(
         self,
         subject: str,
         role: str,
-        minutes: int = settings.ACCESS_TOKEN_MINUTES
+        minutes: int = settings.ACCESS_TOKEN_MINUTES,
+        role_ids: list[int] | None = None,
+        permission_version: int | None = None,
     ) -> str:
         expire = datetime.utcnow() + timedelta(minutes=minutes)
         to_encode = {
-            "sub": subject,
+            "sub": str(subject),
             "role": role,
-            "exp": expire
+            "exp": expire,
+            "jti": uuid.uuid4().hex,
         }
+        # Claims needed to authenticate without a database round-trip
+        if role_ids is not None:
+            to_encode["roles"] = list(role_ids)
+        if permission_version is not None:
+            to_encode["pv"] = permission_version
         return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
 
+    def new_refresh_token(self) -> str:
+        return secrets.token_urlsafe(48)
+
+    def refresh_token_digest(self, token: str) -> str:
+        """Keyed digest stored instead of the refresh token, a leaked table cannot be replayed."""
+        return hmac.new(settings.REFRESH_TOKEN_SECRET.encode("utf-8"), token.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def decode_access_token(self, token: str) -> dict | None:
+        """Verify signature and expiry in memory, returns the claims or None."""
+        try:
+            return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except JWTError:
+            return None
+
 security = SecurityService()
@@ -0,0 +1,73 @@
+import threading
+import time
+from app.core.config import settings
+from app.db.session import db as database
+from app.repositories.auth_session_repo import AuthSessionRepository
+from app.repositories.refresh_token_repo import RefreshTokenRepository
+
+
+class SessionPurger:
+    """
+    Background job deleting expired auth_sessions and refresh_tokens rows every interval_seconds,
+    batch_size rows per transaction so the table is never locked for long.
+    """
+
+    def __init__(self, session_factory, interval_seconds: int = 3600, batch_size: int = 1000):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.repo = AuthSessionRepository()
+        self.refresh_repo = RefreshTokenRepository()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.runs = 0
+        self.deleted = 0
+        self.last_run_at: float | None = None
+
+    def run_once(self) -> int:
+        db = self.session_factory()
+        try:
+            deleted = self.repo.purge_expired(db, batch_size=self.batch_size)
+            deleted += self.refresh_repo.purge_expired(db, batch_size=self.batch_size)
+        except Exception as e:
+            db.rollback()
+            print(f"Auth session purge failed: {e}")
+            deleted = 0
+        finally:
+            db.close()
+        self.runs += 1
+        self.deleted += deleted
+        self.last_run_at = time.time()
+        return deleted
+
+    def start(self) -> None:
+        if self.interval_seconds <= 0 or self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="session-purge", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "interval_seconds": self.interval_seconds,
+            "runs": self.runs,
+            "deleted": self.deleted,
+            "last_run_at": self.last_run_at,
+        }
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            self.run_once()
+
+
+session_purger = SessionPurger(
+    database.SessionLocal,
+    interval_seconds=settings.AUTH_SESSION_PURGE_SECONDS,
+    batch_size=settings.AUTH_SESSION_PURGE_BATCH,
+)
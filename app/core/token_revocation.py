@@ -0,0 +1,62 @@
+import threading
+import time
+from collections import OrderedDict
+from app.core.config import settings
+
+
+class TokenRevocation:
+    """
+    Revocation state for stateless (signed-claims) tokens.
+
+    - a bounded denylist of token ids (jti), each kept until the token expires
+    - a per-user version counter; tokens carry it in the "pv" claim and any
+      token minted before the last bump is rejected
+
+    State is per process and resets on restart, so keep access tokens short
+    in stateless mode.
+    """
+
+    def __init__(self, max_denylist: int = 10000):
+        self.max_denylist = max_denylist
+        self._denied: "OrderedDict[str, float]" = OrderedDict()
+        self._user_versions: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def deny(self, jti: str, expires_at: float) -> None:
+        if not jti:
+            return
+        with self._lock:
+            self._denied[jti] = expires_at
+            self._denied.move_to_end(jti)
+            self._purge(time.time())
+            while len(self._denied) > self.max_denylist:
+                self._denied.popitem(last=False)
+
+    def is_denied(self, jti: str | None) -> bool:
+        if not jti:
+            return False
+        expires_at = self._denied.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def user_version(self, user_id: int) -> int:
+        return self._user_versions.get(user_id, 0)
+
+    def bump_user(self, user_id: int) -> int:
+        with self._lock:
+            version = self._user_versions.get(user_id, 0) + 1
+            self._user_versions[user_id] = version
+            return version
+
+    def stats(self) -> dict:
+        return {
+            "denylist": len(self._denied),
+            "users_with_version": len(self._user_versions),
+        }
+
+    def _purge(self, now: float) -> None:
+        expired = [jti for jti, exp in self._denied.items() if exp <= now]
+        for jti in expired:
+            del self._denied[jti]
+
+
+token_revocation = TokenRevocation(max_denylist=settings.TOKEN_DENYLIST_MAX_ENTRIES)
@@ -0,0 +1,157 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event, text
+from app.core.config import settings
+
+_DML_TABLE = re.compile(
+    r"^\s*(?:INSERT(?:\s+IGNORE)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+IGNORE)?|DELETE\s+FROM)\s+`?(\w+)`?",
+    re.I,
+)
+
+ESTIMATED_ROWS = text(
+    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+)
+
+
+def normalize_filters(filters: dict | None) -> tuple:
+    """Filters that change the count, in a stable order; unset (None or "") filters are dropped."""
+    return tuple(sorted((key, value) for key, value in (filters or {}).items() if value is not None and value != ""))
+
+
+class CountCache:
+    """
+    In-process TTL + LRU cache of COUNT(*) results for the paginated lists,
+    keyed by table and normalized filter set. Every INSERT/UPDATE/DELETE on a
+    table, seen through the engine events, invalidates that table's counts in
+    this worker; writes made by other workers are only picked up when the
+    entry expires, so the TTL bounds how stale a total can get.
+    """
+
+    def __init__(self, ttl_seconds: float = 30, max_entries: int = 5000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple[float, int, int]]" = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, table: str, filters: dict | None = None) -> int | None:
+        key = (table, normalize_filters(filters))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time() or entry[1] != self._generations.get(table, 0):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def generation(self, table: str) -> int:
+        with self._lock:
+            return self._generations.get(table, 0)
+
+    def put(self, table: str, filters: dict | None, total: int, generation: int) -> None:
+        """Store a count computed while the table was at `generation`; dropped if a write happened since."""
+        if not self.enabled:
+            return
+        key = (table, normalize_filters(filters))
+        with self._lock:
+            if generation != self._generations.get(table, 0):
+                return
+            self._entries[key] = (time.time() + self.ttl_seconds, generation, total)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def count(self, table: str, filters: dict | None, compute) -> int:
+        total = self.get(table, filters)
+        if total is None:
+            generation = self.generation(table)
+            total = compute()
+            self.put(table, filters, total, generation)
+        return total
+
+    async def count_async(self, table: str, filters: dict | None, compute) -> int:
+        """Same as count() for an AsyncSession: `compute` is an async callable."""
+        total = self.get(table, filters)
+        if total is None:
+            generation = self.generation(table)
+            total = await compute()
+            self.put(table, filters, total, generation)
+        return total
+
+    def invalidate(self, table: str) -> None:
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            self.invalidations += 1
+
+    def install(self, engine) -> None:
+        """Invalidate a table's counts whenever a statement on this engine writes to it."""
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _invalidate(conn, cursor, statement, parameters, context, executemany):
+            match = _DML_TABLE.match(statement)
+            if match:
+                self.invalidate(match.group(1))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+def _estimate_supported(db) -> bool:
+    return db.get_bind().dialect.name == "mysql"
+
+
+def list_total(db, table: str, filters: dict | None, compute, include_total: bool = True, estimate: bool = False):
+    """
+    (total, estimated) for a paginated list on a sync Session.
+    include_total=False skips counting (total is None). estimate=True on an
+    unfiltered list reads the InnoDB row estimate from information_schema
+    instead of counting; with filters, or off MySQL, the cached exact count is used.
+    """
+    if not include_total:
+        return None, False
+    if estimate and not normalize_filters(filters) and _estimate_supported(db):
+        rows = db.execute(ESTIMATED_ROWS, {"table": table}).scalar()
+        if rows is not None:
+            return int(rows), True
+    return count_cache.count(table, filters, compute), False
+
+
+async def list_total_async(db, table: str, filters: dict | None, compute, include_total: bool = True,
+                           estimate: bool = False):
+    """list_total() for an AsyncSession; `compute` is an async callable."""
+    if not include_total:
+        return None, False
+    if estimate and not normalize_filters(filters) and _estimate_supported(db):
+        rows = (await db.execute(ESTIMATED_ROWS, {"table": table})).scalar()
+        if rows is not None:
+            return int(rows), True
+    return await count_cache.count_async(table, filters, compute), False
+
+
+count_cache = CountCache(
+    ttl_seconds=settings.COUNT_CACHE_TTL_SECONDS,
+    max_entries=settings.COUNT_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,115 @@
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (ms) of the checkout latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    """Checkout counters and a latency histogram for one pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.pings = 0
+        self.ping_failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def observe(self, elapsed_ms: float, waited: bool) -> None:
+        index = len(LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                index = i
+                break
+        with self._lock:
+            self.checkouts += 1
+            if waited:
+                self.waits += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            self.buckets[index] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            labels = [f"le_{bound}ms" for bound in LATENCY_BUCKETS_MS] + ["inf"]
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "pings": self.pings,
+                "ping_failures": self.ping_failures,
+                "avg_checkout_ms": round(self.total_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_checkout_ms": round(self.max_ms, 3),
+                "checkout_latency_ms": dict(zip(labels, self.buckets)),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times every checkout and counts waits and timeouts."""
+
+    def __init__(self, creator, *args, **kw):
+        super().__init__(creator, *args, **kw)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        # no idle connection and no overflow left: this checkout has to queue
+        waited = self.checkedin() == 0 and self.overflow() >= self._max_overflow
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.count("timeouts")
+            raise
+        self.metrics.observe((time.perf_counter() - start) * 1000, waited)
+        return conn
+
+    def stats(self) -> dict:
+        return {
+            "pool_size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow,
+            **self.metrics.stats(),
+        }
+
+
+def install_idle_ping(engine, idle_seconds: float) -> None:
+    """
+    Pre-ping only connections that sat idle in the pool longer than
+    idle_seconds, instead of a round-trip on every checkout.
+    """
+
+    @event.listens_for(engine, "checkin")
+    def _remember_checkin(dbapi_connection, connection_record):
+        if connection_record is not None:
+            connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        metrics = getattr(engine.pool, "metrics", None)
+        if metrics is not None:
+            metrics.count("pings")
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception:
+            if metrics is not None:
+                metrics.count("ping_failures")
+            # the pool drops this connection and retries with a fresh one
+            raise exc.DisconnectionError()
+        finally:
+            cursor.close()
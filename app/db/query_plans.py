@@ -0,0 +1,122 @@
+"""
+EXPLAIN every hot service query and fail on full table scans.
+
+    python -m app.db.query_plans [--url mysql+pymysql://...]
+
+Run it against a seeded database (a copy of production or a realistic seed):
+on near-empty tables MySQL may prefer a scan even when the index exists.
+Exits with status 1 when any query reads a table with access type ALL.
+"""
+import argparse
+import sys
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.dialects import mysql
+from app.core.config import settings
+from app.models.auth_session import AuthSession
+from app.models.chapter_content import ChapterContent
+from app.models.course import Course
+from app.models.course_assignment import CourseAssignment
+from app.models.course_chapter import CourseChapter
+from app.models.discussion_comments import DiscussionComment
+from app.models.discussions import Discussion
+from app.models.student_batches import StudentBatch
+from app.models.student_course_progress import StudentCourseProgress
+from app.services.course_chapter_service import CHAPTER_CONTENT_WITH_PROGRESS
+from app.services.course_service import CourseService
+
+
+def sample_ids(conn) -> dict:
+    """Real ids from the seeded data, so the optimizer sees realistic values."""
+
+    def first(sql, default=1):
+        value = conn.execute(text(sql)).scalar()
+        return value if value is not None else default
+
+    return {
+        "user_id": first("SELECT user_id FROM courses ORDER BY id LIMIT 1"),
+        "category_id": first("SELECT category_id FROM courses WHERE category_id IS NOT NULL ORDER BY id LIMIT 1"),
+        "course_id": first("SELECT course_id FROM course_chapters ORDER BY id LIMIT 1"),
+        "chapter_id": first("SELECT chapter_id FROM chapter_contents ORDER BY id LIMIT 1"),
+        "student_id": first("SELECT student_id FROM student_course_content_progress ORDER BY id LIMIT 1"),
+        "content_id": first("SELECT content_id FROM discussions ORDER BY id LIMIT 1"),
+        "discussion_id": first("SELECT discussion_id FROM discussion_comments ORDER BY id LIMIT 1"),
+    }
+
+
+def hot_queries(ids: dict) -> list:
+    """(name, statement) for the queries behind the busiest endpoints."""
+    return [
+        ("courses.list_courses", CourseService._filtered_courses()
+            .where(Course.user_id == ids["user_id"]).order_by(Course.created_at.desc()).limit(10)),
+        ("courses.latest_by_category", CourseService._filtered_courses(category_id=ids["category_id"])
+            .order_by(Course.created_at.desc()).limit(3)),
+        ("chapters.by_course", select(CourseChapter).where(CourseChapter.course_id == ids["course_id"]).limit(10)),
+        ("chapters.contents_with_progress", CHAPTER_CONTENT_WITH_PROGRESS.bindparams(
+            chapter_id=ids["chapter_id"], student_id=ids["student_id"])),
+        ("progress.by_content_ids", select(StudentCourseProgress).where(
+            StudentCourseProgress.content_id.in_([ids["content_id"]]),
+            StudentCourseProgress.student_id == ids["student_id"])),
+        ("progress.completed_in_course", select(func.count(StudentCourseProgress.id)).where(
+            StudentCourseProgress.student_id == ids["student_id"],
+            StudentCourseProgress.is_completed == True,
+            StudentCourseProgress.course_id == ids["course_id"])),
+        ("progress.course_content_total", select(func.count(ChapterContent.id))
+            .join(CourseChapter, CourseChapter.id == ChapterContent.chapter_id)
+            .where(CourseChapter.course_id == ids["course_id"])),
+        ("discussions.by_content", select(Discussion).where(Discussion.content_id == ids["content_id"])
+            .order_by(Discussion.created_at.desc())),
+        ("discussion_comments.by_discussion", select(DiscussionComment)
+            .where(DiscussionComment.discussion_id.in_([ids["discussion_id"]]))
+            .order_by(DiscussionComment.created_at.asc())),
+        ("student_batches.by_user", select(StudentBatch).where(StudentBatch.user_id == ids["user_id"])
+            .order_by(StudentBatch.created_at.desc()).limit(10)),
+        ("student_batches.by_course", select(StudentBatch).where(StudentBatch.course_id == ids["course_id"])),
+        ("course_assignments.by_course", select(CourseAssignment).where(
+            CourseAssignment.deleted_at.is_(None), CourseAssignment.course_id == ids["course_id"])
+            .order_by(CourseAssignment.id.desc()).limit(10)),
+        ("auth_sessions.by_digest", select(AuthSession).where(AuthSession.token_digest == "0" * 64)),
+    ]
+
+
+def explain(conn, statement) -> list[dict]:
+    sql = str(statement.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+    return [dict(row._mapping) for row in conn.exec_driver_sql("EXPLAIN " + sql)]
+
+
+def full_scans(plan: list[dict]) -> list[str]:
+    return [row["table"] for row in plan if row.get("type") == "ALL"]
+
+
+def check(engine) -> list[tuple[str, list[str]]]:
+    failures = []
+    with engine.connect() as conn:
+        ids = sample_ids(conn)
+        for name, statement in hot_queries(ids):
+            plan = explain(conn, statement)
+            scans = full_scans(plan)
+            status = "FULL SCAN" if scans else "ok"
+            print(f"{status:9}  {name}")
+            for row in plan:
+                print(f"           {row.get('table')}: type={row.get('type')} key={row.get('key')} rows={row.get('rows')}")
+            if scans:
+                failures.append((name, scans))
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.database_url, help="database to EXPLAIN against")
+    args = parser.parse_args(argv)
+
+    failures = check(create_engine(args.url))
+    if failures:
+        print(f"\n{len(failures)} query(s) fall back to a full table scan:")
+        for name, tables in failures:
+            print(f"  {name}: {', '.join(tables)}")
+        return 1
+    print("\nNo full table scans.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
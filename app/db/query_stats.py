@@ -0,0 +1,125 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.config import settings
+
+_IN_LIST = re.compile(r"\((?:\s*(?:%s|\?|:\w+)\s*,)+\s*(?:%s|\?|:\w+)\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Collapse whitespace and IN (...) lists so the same query always has one shape."""
+    return _SPACES.sub(" ", _IN_LIST.sub("(?)", statement)).strip()
+
+
+class QueryStats:
+    """Statements and database time of one request (or one query_budget block)."""
+
+    def __init__(self, endpoint: str = ""):
+        self.endpoint = endpoint
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes run at least `threshold` times, most frequent first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+_current: ContextVar[list] = ContextVar("query_stats", default=[])
+
+
+def current_stats() -> QueryStats | None:
+    collectors = _current.get()
+    return collectors[-1] if collectors else None
+
+
+@contextmanager
+def collect(endpoint: str = ""):
+    stats = QueryStats(endpoint)
+    token = _current.set(_current.get() + [stats])
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def install_query_stats(engine) -> None:
+    """Count statements and time them for whoever is collecting in the current context."""
+
+    # the start time lives on the statement's execution context: a statement
+    # that raises never reaches after_cursor_execute and leaves nothing behind
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.query_started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "query_started_at", None)
+        collectors = _current.get()
+        if started is not None and collectors:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            # nested collectors (a query_budget inside a request) all see the statement
+            for stats in collectors:
+                stats.record(statement, elapsed_ms)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: int | None = None):
+    """
+    Fail when the block runs more than max_queries statements, or one statement
+    shape more than max_repeats times, e.g. around a TestClient call:
+
+        with query_budget(4, max_repeats=1):
+            client.get("/discussions/?content_id=1")
+    """
+    with collect("query_budget") as stats:
+        yield stats
+    if stats.count > max_queries:
+        raise QueryBudgetExceeded(f"{stats.count} queries, budget is {max_queries}")
+    if max_repeats is not None:
+        repeated = stats.repeated(max_repeats + 1)
+        if repeated:
+            shape, n = repeated[0]
+            raise QueryBudgetExceeded(f"statement ran {n} times, max {max_repeats}: {shape[:200]}")
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    """
+    Adds a Server-Timing header with the query count and database time of
+    each request and prints the statement shapes repeated within a request,
+    which is what an N+1 loop looks like.
+    """
+
+    async def dispatch(self, request, call_next):
+        endpoint = f"{request.method} {request.url.path}"
+        started = time.perf_counter()
+        with collect(endpoint) as stats:
+            response = await call_next(request)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        timings = [
+            f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"',
+            f"app;dur={total_ms:.1f}",
+        ]
+        repeated = stats.repeated(settings.QUERY_REPEAT_THRESHOLD)
+        if repeated:
+            timings.append(f'n1;desc="{len(repeated)} repeated statement(s)"')
+            for shape, n in repeated:
+                print(f"Repeated query on {endpoint}: {n}x {shape[:200]}")
+        response.headers.append("Server-Timing", ", ".join(timings))
+        return response
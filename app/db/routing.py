@@ -0,0 +1,93 @@
+import itertools
+import threading
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select, TextClause
+
+
+class ReadRouter:
+    """
+    Round-robin over the replica engines, with counters for /system/metrics.
+    Holds sync Engines; for async sessions pass the replicas' .sync_engine.
+    """
+
+    def __init__(self, replicas=()):
+        self.replicas = list(replicas)
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+        self._lock = threading.Lock()
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.sticky_reads = 0
+        self.writes = 0
+
+    def next_replica(self):
+        with self._lock:
+            self.replica_reads += 1
+            return next(self._cycle)
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "replicas": len(self.replicas),
+                "replica_reads": self.replica_reads,
+                "primary_reads": self.primary_reads,
+                "sticky_reads": self.sticky_reads,
+                "writes": self.writes,
+            }
+
+
+def is_read_only(clause) -> bool:
+    if isinstance(clause, Select):
+        # SELECT ... FOR UPDATE must see and lock the primary rows
+        return clause._for_update_arg is None
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip().upper().startswith("SELECT")
+    return False
+
+
+class RoutingSession(Session):
+    """
+    Session bound to the primary plus the router's replicas.
+
+    Plain SELECTs go to a replica. INSERT/UPDATE/DELETE, flushes and
+    SELECT ... FOR UPDATE go to the primary, and once the session has
+    written, every later read of the same session (i.e. the same request)
+    stays on the primary so it reads its own writes despite replica lag.
+    """
+
+    def __init__(self, bind=None, router: ReadRouter = None, **kw):
+        super().__init__(bind=bind, **kw)
+        self.router = router or ReadRouter()
+        self._replica = None
+        self.wrote = False
+
+    def use_primary(self) -> None:
+        """Pin the rest of this session to the primary."""
+        self.wrote = True
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kw)
+        # flushes ask for a bind with clause=None, check them first
+        if self._flushing or (clause is not None and not is_read_only(clause)):
+            self.wrote = True
+            self.router.count("writes")
+            return primary
+        if clause is None:
+            return primary
+
+        if self.wrote:
+            self.router.count("sticky_reads")
+            return primary
+        if not self.router.replicas:
+            self.router.count("primary_reads")
+            return primary
+
+        # one replica per session, so a request never mixes two replicas' lag
+        if self._replica is None:
+            self._replica = self.router.next_replica()
+        else:
+            self.router.count("replica_reads")
+        return self._replica
@@ -0,0 +1,118 @@
+import importlib
+import os
+import pkgutil
+import re
+from sqlalchemy import MetaData, text
+from sqlalchemy.exc import SQLAlchemyError
+
+VERSIONS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "alembic", "versions")
+
+_REVISION = re.compile(r"^revision\s*(?::[^=]*)?=\s*['\"]([^'\"]+)['\"]", re.M)
+_DOWN_REVISION = re.compile(r"^down_revision\s*(?::[^=]*)?=(.*)$", re.M)
+_QUOTED = re.compile(r"['\"]([^'\"]+)['\"]")
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def alembic_heads(versions_dir: str = VERSIONS_DIR) -> set[str]:
+    """
+    Head revisions of the migration scripts. The files are scanned with a
+    regex instead of loading Alembic, which keeps worker start-up cheap.
+    """
+    revisions, parents = set(), set()
+    for name in os.listdir(versions_dir):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(versions_dir, name), encoding="utf-8") as f:
+            source = f.read()
+        revision = _REVISION.search(source)
+        if not revision:
+            continue
+        revisions.add(revision.group(1))
+        down = _DOWN_REVISION.search(source)
+        if down:
+            parents.update(_QUOTED.findall(down.group(1)))
+    return revisions - parents
+
+
+def database_revisions(conn) -> set[str]:
+    return {row[0] for row in conn.execute(text("SELECT version_num FROM alembic_version"))}
+
+
+def check_schema_revision(engine, mode: str) -> bool:
+    """
+    Compare the migration head with the database revision in one query.
+    mode "warn" prints the mismatch, "strict" raises SchemaOutOfDate, "off" skips the check.
+    """
+    if mode not in ("warn", "strict"):
+        return True
+
+    heads = alembic_heads()
+    try:
+        with engine.connect() as conn:
+            current = database_revisions(conn)
+    except SQLAlchemyError as e:
+        current, error = set(), e
+    else:
+        error = None
+
+    if current == heads:
+        return True
+
+    message = (
+        f"Database schema revision {sorted(current) or 'none'} does not match migration head {sorted(heads)}; "
+        "run `alembic upgrade head`"
+    )
+    if error is not None:
+        message += f" (could not read alembic_version: {error.__class__.__name__})"
+    if mode == "strict":
+        raise SchemaOutOfDate(message)
+    print(f"WARNING: {message}")
+    return False
+
+
+def combined_metadata() -> MetaData:
+    """
+    All tables of the three declarative bases in one MetaData, so foreign keys
+    between them resolve. Foreign keys to tables no model defines are left out.
+    """
+    import app.models
+    for module in pkgutil.iter_modules(app.models.__path__):
+        importlib.import_module(f"app.models.{module.name}")
+    from app.db.base_class import Base as AlembicBase
+    from app.db.session import Base as SessionBase
+    from app.models.base import Base as ModelBase
+
+    combined = MetaData()
+    for base in (ModelBase, AlembicBase, SessionBase):
+        for table in base.metadata.tables.values():
+            if table.name not in combined.tables:
+                table.to_metadata(combined)
+
+    for table in combined.tables.values():
+        for constraint in list(table.foreign_key_constraints):
+            target = constraint.elements[0].target_fullname.split(".")[0]
+            if target not in combined.tables:
+                print(f"Skipping foreign key {table.name} -> {target}: no model defines {target}")
+                table.constraints.discard(constraint)
+                for fk in constraint.elements:
+                    fk.parent.foreign_keys.discard(fk)
+                    table.foreign_keys.discard(fk)
+    return combined
+
+
+def create_schema(engine, stamp: bool = True) -> list[str]:
+    """Development only: create missing tables from the models and stamp the migration head."""
+    metadata = combined_metadata()
+    with engine.begin() as conn:
+        existing = set(conn.dialect.get_table_names(conn))
+        metadata.create_all(conn, checkfirst=True)
+        created = [name for name in metadata.tables if name not in existing]
+        if stamp:
+            conn.execute(text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)"))
+            if not database_revisions(conn):
+                for head in sorted(alembic_heads()):
+                    conn.execute(text("INSERT INTO alembic_version (version_num) VALUES (:v)"), {"v": head})
+    return created
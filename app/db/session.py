@@ -1,11 +1,86 @@
+import threading
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.core.config import settings
+from app.db.count_cache import count_cache
+from app.db.pool import InstrumentedQueuePool, install_idle_ping
+from app.db.query_stats import install_query_stats
+from app.db.routing import ReadRouter, RoutingSession
+from app.db.slow_query import slow_query_log
 
 class Database:
-    def __init__(self, url: str = settings.database_url):
-        self.engine = create_engine(url, pool_pre_ping=True)
+    def __init__(
+        self,
+        url: str = settings.database_url,
+        async_url: str = settings.async_database_url,
+        replica_urls: list[str] = settings.replica_urls,
+    ):
+        self.async_url = async_url
+        self.async_replica_urls = [self._async_variant(u) for u in replica_urls]
+        self._async_engine = None
+        self._async_replicas = []
+        self._async_session_factory = None
+        self._async_read_session_factory = None
+        self._async_lock = threading.Lock()
+
+        self.engine = self._create_engine(url)
+        self.replicas = [self._create_engine(u) for u in replica_urls]
+        self.read_router = ReadRouter(self.replicas)
+        if slow_query_log.enabled:
+            for engine in [self.engine, *self.replicas]:
+                # plans are always taken on the primary
+                slow_query_log.install(engine, explain_engine=self.engine)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        # reads on a replica, writes (and reads after them) on the primary
+        self.ReadSessionLocal = sessionmaker(
+            class_=RoutingSession, router=self.read_router, autocommit=False, autoflush=False, bind=self.engine
+        )
+
+    @staticmethod
+    def _create_engine(url: str):
+        strategy = settings.DB_POOL_PRE_PING
+        engine = create_engine(
+            url,
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            # "always": ping on every checkout, "idle": only after DB_POOL_PING_IDLE_SECONDS unused
+            pool_pre_ping=strategy == "always",
+        )
+        if strategy == "idle":
+            install_idle_ping(engine, settings.DB_POOL_PING_IDLE_SECONDS)
+        if settings.QUERY_STATS_ENABLED:
+            install_query_stats(engine)
+        if count_cache.enabled:
+            count_cache.install(engine)
+        return engine
+
+    @staticmethod
+    def _create_async_engine(url: str):
+        strategy = settings.DB_POOL_PRE_PING
+        engine = create_async_engine(
+            url,
+            pool_size=settings.DB_ASYNC_POOL_SIZE,
+            max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=strategy == "always",
+        )
+        if strategy == "idle":
+            install_idle_ping(engine.sync_engine, settings.DB_POOL_PING_IDLE_SECONDS)
+        if settings.QUERY_STATS_ENABLED:
+            install_query_stats(engine.sync_engine)
+        if count_cache.enabled:
+            count_cache.install(engine.sync_engine)
+        return engine
+
+    @staticmethod
+    def _async_variant(url: str) -> str:
+        return make_url(url).set(drivername=f"mysql+{settings.DB_ASYNC_DRIVER}").render_as_string(hide_password=False)
 
     def get_db(self):
         db = self.SessionLocal()
@@ -14,5 +89,94 @@ class Database:
         finally:
             db.close()
 
+    def get_read_db(self):
+        """Session for read-mostly endpoints, routed to a replica when one is configured."""
+        db = self.ReadSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @property
+    def async_engine(self):
+        self._init_async()
+        return self._async_engine
+
+    @property
+    def async_session_factory(self):
+        self._init_async()
+        return self._async_session_factory
+
+    @property
+    def async_read_session_factory(self):
+        self._init_async()
+        return self._async_read_session_factory
+
+    def _init_async(self) -> None:
+        """
+        Async engines and session factories for the non-blocking endpoints, created on
+        first use so a worker that never serves them does not need the async driver.
+        """
+        if self._async_session_factory is not None:
+            return
+        with self._async_lock:
+            if self._async_session_factory is not None:
+                return
+            engine = self._create_async_engine(self.async_url)
+            self._async_replicas = [self._create_async_engine(u) for u in self.async_replica_urls]
+            self.async_read_router = ReadRouter([e.sync_engine for e in self._async_replicas])
+            if slow_query_log.enabled:
+                for async_engine in [engine, *self._async_replicas]:
+                    slow_query_log.install(async_engine.sync_engine, explain_engine=self.engine)
+            self._async_engine = engine
+            self._async_read_session_factory = async_sessionmaker(
+                engine,
+                class_=AsyncSession,
+                sync_session_class=RoutingSession,
+                router=self.async_read_router,
+                autoflush=False,
+                expire_on_commit=False,
+            )
+            self._async_session_factory = async_sessionmaker(
+                engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            )
+
+    async def get_async_db(self):
+        async with self.async_session_factory() as session:
+            yield session
+
+    async def get_async_read_db(self):
+        async with self.async_read_session_factory() as session:
+            yield session
+
+    async def dispose_async(self) -> None:
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+        for engine in self._async_replicas:
+            await engine.dispose()
+
+    def pool_stats(self) -> dict:
+        stats = self.engine.pool.stats()
+        if self.replicas:
+            stats["replicas"] = [engine.pool.stats() for engine in self.replicas]
+        stats["read_routing"] = self.read_router.stats()
+        if self._async_engine is not None:
+            stats["async"] = {
+                "primary": self._async_pool_stats(self._async_engine),
+                "replicas": [self._async_pool_stats(e) for e in self._async_replicas],
+                "read_routing": self.async_read_router.stats(),
+            }
+        return stats
+
+    @staticmethod
+    def _async_pool_stats(engine) -> dict:
+        pool = engine.pool
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+        }
+
 db = Database()
 Base = declarative_base()
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from sqlalchemy import event
+from app.core.config import settings
+from app.db.query_stats import current_stats, statement_shape
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+def fingerprint(statement: str) -> tuple[str, str]:
+    """(id, normalized text): literals and IN lists replaced, so raw text() SQL groups too."""
+    normalized = _NUMBER_LITERAL.sub("?", _STRING_LITERAL.sub("?", statement_shape(statement)))
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16], normalized
+
+
+def parameter_shape(parameters, executemany: bool = False):
+    """Types of the bound parameters, never their values."""
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "row": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+class SlowQueryLog:
+    """
+    Statements slower than threshold_ms: one JSON line each in a rotating log
+    file, plus an in-memory aggregate per statement fingerprint for the admin
+    endpoint. A sampled share of slow SELECTs is EXPLAINed afterwards on a
+    background thread, never on the request's own connection.
+    """
+
+    def __init__(self, threshold_ms: float, explain_sample: float = 0.1, log_file: str | None = None,
+                 max_bytes: int = 10 * 1024 * 1024, backups: int = 5, max_fingerprints: int = 500):
+        self.threshold_ms = threshold_ms
+        self.explain_sample = explain_sample
+        self.max_fingerprints = max_fingerprints
+        self.explain_engine = None
+        self._by_fingerprint: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._explain_queue: queue.Queue = queue.Queue(maxsize=100)
+        self._explain_thread: threading.Thread | None = None
+        self.recorded = 0
+        self.explained = 0
+
+        self._logger = None
+        if log_file and self.enabled:
+            os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+            # a private logger: these lines only go to the rotating file
+            self._logger = logging.Logger("lms.slow_query", logging.INFO)
+            self._logger.addHandler(RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups))
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    def install(self, engine, explain_engine=None) -> None:
+        """Time every statement of `engine`; EXPLAINs run on explain_engine (the primary)."""
+        if explain_engine is not None:
+            self.explain_engine = explain_engine
+
+        # kept on the execution context, so a statement that raises leaves nothing behind
+        @event.listens_for(engine, "before_cursor_execute")
+        def _start(conn, cursor, statement, parameters, context, executemany):
+            if context is not None:
+                context.slow_query_started_at = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _stop(conn, cursor, statement, parameters, context, executemany):
+            started = getattr(context, "slow_query_started_at", None)
+            if started is None:
+                return
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if elapsed_ms >= self.threshold_ms:
+                self.record(statement, parameters, elapsed_ms, executemany)
+
+    def record(self, statement: str, parameters, elapsed_ms: float, executemany: bool = False) -> None:
+        if statement.lstrip()[:7].upper() == "EXPLAIN":
+            return
+        stats = current_stats()
+        endpoint = stats.endpoint if stats else None
+        fp, normalized = fingerprint(statement)
+        entry = {
+            "at": datetime.utcnow().isoformat(),
+            "fingerprint": fp,
+            "duration_ms": round(elapsed_ms, 2),
+            "endpoint": endpoint,
+            "parameters": parameter_shape(parameters, executemany),
+            "statement": normalized[:2000],
+        }
+
+        with self._lock:
+            self.recorded += 1
+            agg = self._by_fingerprint.pop(fp, None) or {
+                "fingerprint": fp,
+                "statement": normalized[:2000],
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "endpoints": {},
+                "parameters": entry["parameters"],
+                "explain": None,
+            }
+            agg["count"] += 1
+            agg["total_ms"] += elapsed_ms
+            agg["max_ms"] = max(agg["max_ms"], elapsed_ms)
+            agg["last_at"] = entry["at"]
+            if endpoint:
+                agg["endpoints"][endpoint] = agg["endpoints"].get(endpoint, 0) + 1
+            self._by_fingerprint[fp] = agg
+            while len(self._by_fingerprint) > self.max_fingerprints:
+                self._by_fingerprint.popitem(last=False)
+
+        if self._logger:
+            self._logger.info(json.dumps(entry, default=str))
+
+        if (
+            self.explain_engine is not None
+            and not executemany
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and random.random() < self.explain_sample
+        ):
+            self._queue_explain(fp, statement, parameters)
+
+    def report(self, limit: int = 50, order_by: str = "total_ms") -> list[dict]:
+        with self._lock:
+            rows = [dict(agg, endpoints=dict(agg["endpoints"])) for agg in self._by_fingerprint.values()]
+        for row in rows:
+            row["avg_ms"] = round(row["total_ms"] / row["count"], 2)
+            row["total_ms"] = round(row["total_ms"], 2)
+            row["max_ms"] = round(row["max_ms"], 2)
+        key = order_by if order_by in ("total_ms", "max_ms", "avg_ms", "count") else "total_ms"
+        rows.sort(key=lambda row: row[key], reverse=True)
+        return rows[:limit]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold_ms,
+                "recorded": self.recorded,
+                "fingerprints": len(self._by_fingerprint),
+                "explained": self.explained,
+                "explain_backlog": self._explain_queue.qsize(),
+            }
+
+    def _queue_explain(self, fp: str, statement: str, parameters) -> None:
+        try:
+            self._explain_queue.put_nowait((fp, statement, parameters))
+        except queue.Full:
+            return
+        with self._lock:
+            if self._explain_thread is None:
+                self._explain_thread = threading.Thread(target=self._run_explains, name="slow-query-explain", daemon=True)
+                self._explain_thread.start()
+
+    def _run_explains(self) -> None:
+        while True:
+            fp, statement, parameters = self._explain_queue.get()
+            try:
+                with self.explain_engine.connect() as conn:
+                    plan = [dict(row._mapping) for row in conn.exec_driver_sql("EXPLAIN " + statement, parameters)]
+            except Exception as e:
+                print(f"Slow query EXPLAIN failed for {fp}: {e}")
+                continue
+            with self._lock:
+                self.explained += 1
+                if fp in self._by_fingerprint:
+                    self._by_fingerprint[fp]["explain"] = plan
+            if self._logger:
+                self._logger.info(json.dumps({"fingerprint": fp, "explain": plan}, default=str))
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_MS,
+    explain_sample=settings.SLOW_QUERY_EXPLAIN_SAMPLE,
+    log_file=settings.SLOW_QUERY_LOG_FILE or None,
+    max_bytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+    backups=settings.SLOW_QUERY_LOG_BACKUPS,
+)
@@ -1,63 +1,130 @@
 # app/dependencies.py
-from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from fastapi import Depends, Header, Request
+from sqlalchemy.orm import Session, selectinload
 from fastapi.responses import JSONResponse
 from app.db.session import  db as database
-from app.models.models import User, Permission, Module
-from app.services.auth_service import AuthService  # assumes you have JWT auth
+from app.models.models import User
+from app.models.auth_session import AuthSession
+from app.core.principal_cache import Principal, principal_cache, token_digest
+from app.core.permission_matrix import permission_matrix
+from app.core.security import security
+from app.core.token_revocation import token_revocation
+from app.core.config import settings
 
-def check_permission(authorization: str, module_name: str, action: str, db: Session):
 
+def principal_from_claims(token: str) -> Principal | None:
+    """
+    Stateless mode: verify the JWT in memory and build the Principal from its claims.
+    """
+    claims = security.decode_access_token(token)
+    if not claims or "roles" not in claims:
+        return None
+    try:
+        user_id = int(claims.get("sub"))
+    except (TypeError, ValueError):
+        return None
+    if token_revocation.is_denied(claims.get("jti")):
+        return None
+    if claims.get("pv", 0) < token_revocation.user_version(user_id):
+        return None
 
-    if not authorization.startswith("Bearer "):
-        return None, JSONResponse(
-            status_code=401,
-            content={"error_code": 401, "success": False, "message": "Invalid authorization header format"}
-        )
+    return Principal(
+        id=user_id,
+        username=None,
+        role=claims.get("role"),
+        role_ids=claims.get("roles") or [],
+        token_expiry=datetime.fromtimestamp(claims["exp"], tz=timezone.utc),
+    )
 
-    token = authorization.split(" ")[1]
-    current_user = db.query(User).filter(User.access_token == token).first()
-
-    if not current_user:
-        return None, JSONResponse(
-            status_code=401,
-            content={"error_code": 300, "success": False, "message": "Invalid token"}
-        )
-    for role in current_user.roles:
-        print(role.id)
-    # Iterate through all roles of the user
-    for role in current_user.roles:
-       
-        perm = db.query(Permission).join(Module).filter(
-            Permission.role_id == role.id,
-            Module.name == module_name
-        ).first()
-        #print(f"roless Module.name {perm.module.name}")
-        if perm and getattr(perm, f"can_{action}", False):
-            return True  # Permission granted
-
-    #raise HTTPException(status_code=403, detail="Permission denied")
-    return False
-
-def get_current_user(authorization: str, db: Session):
-    """
-    Extract user from Bearer token in Authorization header
-    """
-    if not authorization.startswith("Bearer "):
-        return None, JSONResponse(
-            status_code=401,
-            content={"error_code": 401, "success": False, "message": "Invalid authorization header format"}
-        )
+
+def resolve_principal(token: str, db: Session) -> Principal | None:
+    """
+    Resolve a bearer token to a Principal.
+    Served from the in-process cache when possible, otherwise one auth_sessions lookup.
+    """
+    if settings.stateless_auth:
+        return principal_from_claims(token)
+
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    # point read on the unique token digest index
+    row = (
+        db.query(User, AuthSession.expires_at)
+        .join(AuthSession, AuthSession.user_id == User.id)
+        .options(selectinload(User.roles))
+        .filter(AuthSession.token_digest == token_digest(token))
+        .first()
+    )
+    if not row:
+        return None
+
+    user, expires_at = row
+    principal = Principal.from_user(user, token_expiry=expires_at)
+    principal_cache.put(token, principal)
+    return principal
+
+
+class AuthError(Exception):
+    """Raised by the auth dependencies, rendered by auth_error_handler in the usual error shape."""
+
+    def __init__(self, status_code: int, error_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.error_code = error_code
+        self.message = message
+
+
+def auth_error_handler(request: Request, exc: AuthError):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"error_code": exc.error_code, "success": False, "message": exc.message},
+    )
+
+
+def current_principal(
+    request: Request,
+    authorization: str | None = Header(None),
+    db: Session = Depends(database.get_db),
+) -> Principal:
+    """
+    Resolve the caller once per request and keep it on request.state,
+    so every dependency and handler of the request shares the same object.
+    """
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
+
+    if not authorization or not authorization.startswith("Bearer "):
+        raise AuthError(401, 401, "Invalid authorization header format")
 
     token = authorization.split(" ")[1]
-    current_user = db.query(User).filter(User.access_token == token).first()
+    principal = resolve_principal(token, db)
+    if not principal:
+        raise AuthError(401, 300, "Invalid token")
+    if principal.is_expired():
+        principal_cache.evict_token(token)
+        raise AuthError(401, 300, "Token expired")
+
+    request.state.principal = principal
+    return principal
+
 
-    if not current_user:
-        return None, JSONResponse(
-            status_code=401,
-            content={"error_code": 401, "success": False, "message": "Invalid token"}
-        )
+def require(module_name: str, action: str):
+    """
+    Dependency factory: authenticate and check one module action, e.g.
+    current_user: Principal = Depends(require("course_category", "create"))
+    """
 
-    return current_user
-    
+    def dependency(
+        principal: Principal = Depends(current_principal),
+        db: Session = Depends(database.get_db),
+    ) -> Principal:
+        # Bit test against the compiled role x module matrix, no queries per role
+        if not permission_matrix.allows(principal.role_ids, module_name, action, db):
+            raise AuthError(403, 403, "Permission denied: You do not have permission to perform this action.")
+        return principal
 
+    return dependency
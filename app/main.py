@@ -1,16 +1,37 @@
 from sys import modules
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.models.base import Base
 from app.db.session import db
-from app.routers import auth, students, courses, course_type, role_routes, modules, user_router, course_category, course_chapter_routes, organization, session, semester, student_batches_router, student_batch_assignments, student_course_progress_router, transcript_routes, discussions_router, course_assignments
+from app.helper.dependencies import AuthError, auth_error_handler
+from app.core.password_hasher import password_hasher
+from app.core.activity_sink import activity_sink
+from app.core.progress_buffer import progress_buffer
+from app.core.session_purge import session_purger
+from app.core.config import settings
+from app.db.query_stats import QueryStatsMiddleware
+from app.db.schema import check_schema_revision
+from app.routers import auth, students, courses, course_type, role_routes, modules, user_router, course_category, course_chapter_routes, organization, session, semester, student_batches_router, student_batch_assignments, student_course_progress_router, transcript_routes, discussions_router, course_assignments, system
 import app.models
-# Create tables at startup
-Base.metadata.create_all(bind=db.engine)
+# Tables are managed by Alembic (`alembic upgrade head`); for a local database
+# without migrations use `python -m app.manage --create-schema`.
 
 
-app = FastAPI(title="LMS API (OOP)")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    check_schema_revision(db.engine, settings.SCHEMA_CHECK)
+    session_purger.start()
+    yield
+    session_purger.stop()
+    progress_buffer.close()
+    activity_sink.close()
+    password_hasher.shutdown()
+    await db.dispose_async()
+
+
+app = FastAPI(title="LMS API (OOP)", lifespan=lifespan)
+app.add_exception_handler(AuthError, auth_error_handler)
 
 from fastapi.staticfiles import StaticFiles
 
@@ -22,6 +43,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
 
 @app.get("/")
 def root():
@@ -46,3 +69,4 @@ app.include_router(student_course_progress_router.router)
 app.include_router(transcript_routes.router)
 app.include_router(discussions_router.router)
 app.include_router(course_assignments.router)
+app.include_router(system.router)
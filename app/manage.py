@@ -0,0 +1,119 @@
+"""
+Development and operations commands.
+
+    python -m app.manage --create-schema        create missing tables from the models (dev only)
+    python -m app.manage --check-schema         compare the Alembic head with the database revision
+    python -m app.manage --rebuild-summary      recompute student_course_summary from the progress table
+    python -m app.manage --bench-startup [--runs 5]
+                                                cold import-to-first-request time of app.main
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Runs in a fresh interpreter per sample: import the app and serve GET / over
+# plain ASGI, so nothing is cached from a previous run.
+_BENCH_SCRIPT = """
+import asyncio, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def first_request():
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": "/", "raw_path": b"/", "root_path": "", "query_string": b"",
+             "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 0), "server": ("localhost", 80)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent[0]["status"]
+
+status = asyncio.run(first_request())
+done = time.perf_counter()
+print(f"{(imported - started) * 1000:.1f} {(done - started) * 1000:.1f} {status}")
+"""
+
+
+def create_schema() -> int:
+    from app.db.schema import create_schema as create
+    from app.db.session import db
+
+    created = create(db.engine)
+    print(f"Created {len(created)} table(s): {', '.join(created)}" if created else "All tables already exist.")
+    return 0
+
+
+def check_schema() -> int:
+    from app.db.schema import SchemaOutOfDate, check_schema_revision
+    from app.db.session import db
+
+    try:
+        check_schema_revision(db.engine, "strict")
+    except SchemaOutOfDate as e:
+        print(e)
+        return 1
+    print("Database schema is at the migration head.")
+    return 0
+
+
+def rebuild_summary() -> int:
+    from app.db.session import db
+    from app.services.student_course_summary_service import rebuild_summaries
+
+    session = db.SessionLocal()
+    try:
+        rows = rebuild_summaries(session)
+    finally:
+        session.close()
+    print(f"Rebuilt student_course_summary: {rows} row(s).")
+    return 0
+
+
+def bench_startup(runs: int) -> int:
+    imports, firsts = [], []
+    for i in range(runs):
+        result = subprocess.run([sys.executable, "-c", _BENCH_SCRIPT], capture_output=True, text=True)
+        if result.returncode != 0:
+            print(result.stderr)
+            return 1
+        import_ms, first_ms, status = result.stdout.strip().splitlines()[-1].split()
+        imports.append(float(import_ms))
+        firsts.append(float(first_ms))
+        print(f"run {i + 1}: import {float(import_ms):.1f} ms, first request {float(first_ms):.1f} ms (HTTP {status})")
+
+    for name, samples in (("import", imports), ("import to first request", firsts)):
+        print(
+            f"{name}: min {min(samples):.1f} ms, median {statistics.median(samples):.1f} ms, "
+            f"max {max(samples):.1f} ms"
+        )
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--create-schema", action="store_true", help="create missing tables and stamp the head")
+    group.add_argument("--check-schema", action="store_true", help="exit 1 when the database is not at the head")
+    group.add_argument("--rebuild-summary", action="store_true", help="repair drift of the completion rollup")
+    group.add_argument("--bench-startup", action="store_true", help="time cold start to the first request")
+    parser.add_argument("--runs", type=int, default=5, help="samples for --bench-startup")
+    args = parser.parse_args(argv)
+
+    if args.create_schema:
+        return create_schema()
+    if args.check_schema:
+        return check_schema()
+    if args.rebuild_summary:
+        return rebuild_summary()
+    return bench_startup(args.runs)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, CHAR, ForeignKey, DateTime, Index, func
+from sqlalchemy.orm import relationship
+from app.models.base import Base
+
+
+class AuthSession(Base):
+    """One row per issued bearer token, so a user can stay logged in on several devices."""
+    __tablename__ = "auth_sessions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # sha256 hex of the bearer token, the raw token is never stored
+    token_digest = Column(CHAR(64), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    user_agent = Column(String(255), nullable=True)
+    # refresh token family that minted this session, revoked with it on logout
+    family_id = Column(CHAR(32), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    user = relationship("User")
+
+    __table_args__ = (Index("uq_auth_sessions_token_digest", "token_digest", unique=True),)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Enum, JSON, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Enum, JSON, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -34,6 +34,8 @@ class ChapterContent(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (Index("ix_chapter_contents_chapter_position", "chapter_id", "position"),)
+
     # Relationships (optional)
 
     #user = relationship("User", back_populates="uploaded_contents")
@@ -1,5 +1,5 @@
 # app/models/course.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Numeric, func, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Numeric, func, Enum, Index
 from sqlalchemy.dialects.mysql import JSON
 from sqlalchemy.orm import relationship
 from app.models.base import Base
@@ -55,3 +55,8 @@ class Course(Base):
 
     chapters = relationship("CourseChapter", back_populates="course", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_courses_user_created", "user_id", "created_at"),
+        Index("ix_courses_category_created", "category_id", "created_at"),
+    )
+
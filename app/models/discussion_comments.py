@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, Integer, String, Text, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, BigInteger, Integer, String, Text, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.session import Base  # Make sure Base is imported
 
@@ -16,5 +16,7 @@ class DiscussionComment(Base):
     likes = Column(Integer, default=0)
     created_at = Column(TIMESTAMP, server_default='CURRENT_TIMESTAMP')
 
+    __table_args__ = (Index("ix_discussion_comments_discussion_created", "discussion_id", "created_at"),)
+
     relationship("Discussion")
     #replies = relationship('DiscussionComment', cascade='all, delete')
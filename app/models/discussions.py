@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, Integer, String, Text, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, BigInteger, Integer, String, Text, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.session import Base  # Make sure Base is imported
 
@@ -16,4 +16,6 @@ class Discussion(Base):
     created_at = Column(TIMESTAMP, server_default='CURRENT_TIMESTAMP')
     updated_at = Column(TIMESTAMP, server_default='CURRENT_TIMESTAMP', onupdate='CURRENT_TIMESTAMP')
 
+    __table_args__ = (Index("ix_discussions_content_created", "content_id", "created_at"),)
+
     relationship("DiscussionComment")
@@ -87,6 +87,8 @@ class Permission(Base):
     role = relationship("Role", back_populates="permissions")
     module = relationship("Module", back_populates="permissions")         
 
+    __table_args__ = (UniqueConstraint("role_id", "module_id", name="uq_role_module"),)
+
 
 # class Student(Base):
 #     __tablename__ = "students"
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, CHAR, ForeignKey, DateTime, Index, func
+from sqlalchemy.orm import relationship
+from app.models.base import Base
+
+
+class RefreshToken(Base):
+    """
+    Long-lived, single-use refresh token. Every refresh marks the row used and
+    issues a successor in the same family; presenting a used token again
+    revokes the whole family.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    family_id = Column(CHAR(32), nullable=False, index=True)
+    # HMAC-SHA256 hex of the token, the raw token is never stored
+    token_digest = Column(CHAR(64), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    user = relationship("User")
+
+    __table_args__ = (Index("uq_refresh_tokens_token_digest", "token_digest", unique=True),)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Enum, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Text, Enum, DateTime, ForeignKey, func, Index
 from app.models.base import Base
 from sqlalchemy.orm import relationship
 
@@ -20,5 +20,10 @@ class StudentBatch(Base):
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        Index("ix_student_batches_user_created", "user_id", "created_at"),
+        Index("ix_student_batches_course", "course_id"),
+    )
+
     student_assignments = relationship("StudentBatchAssignment", back_populates="batch", cascade="all, delete-orphan")
     user = relationship("User", back_populates="batches")
\ No newline at end of file
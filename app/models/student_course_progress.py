@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, TIMESTAMP
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, TIMESTAMP, Index, UniqueConstraint
 from app.db.base_class import Base
 from datetime import datetime
 
@@ -14,4 +14,12 @@ class StudentCourseProgress(Base):
     is_completed = Column(Boolean, default=False)
     last_accessed = Column(DateTime, default=datetime.utcnow)
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
-    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # one row per student and content, written with INSERT ... ON DUPLICATE KEY UPDATE
+        UniqueConstraint("student_id", "content_id", name="uq_progress_student_content"),
+        Index("ix_progress_student_course_content", "student_id", "course_id", "content_id"),
+        # deleting a content finds its progress rows
+        Index("ix_progress_content", "content_id"),
+    )
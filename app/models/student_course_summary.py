@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, DateTime, TIMESTAMP, Index
+from app.db.base_class import Base
+from datetime import datetime
+
+
+class StudentCourseSummary(Base):
+    """
+    Completion rollup per student and course, updated by every progress write
+    (app.services.student_course_summary_service). Repair with
+    `python -m app.manage --rebuild-summary`.
+    """
+    __tablename__ = "student_course_summary"
+
+    student_id = Column(Integer, primary_key=True, autoincrement=False)
+    course_id = Column(Integer, primary_key=True, autoincrement=False)
+    total_contents = Column(Integer, nullable=False, default=0)
+    completed_contents = Column(Integer, nullable=False, default=0)
+    last_accessed = Column(DateTime, nullable=True)
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # content create/delete adjusts the totals of every student of a course
+    __table_args__ = (Index("ix_student_course_summary_course", "course_id"),)
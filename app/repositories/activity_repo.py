@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from app.models.models import ActivityLog
+from app.core.activity_sink import activity_sink
 
 class ActivityRepository:
     def create(self, db: Session, user_id: int, action: str):
@@ -7,4 +8,11 @@ class ActivityRepository:
         db.add(log)
         db.commit()
         db.refresh(log)
-        return log
\ No newline at end of file
+        return log
+
+class BufferedActivityRepository(ActivityRepository):
+    """Queues the row on the activity sink instead of inserting it in the caller's transaction."""
+
+    def create(self, db: Session, user_id: int, action: str):
+        activity_sink.record(user_id, action)
+        return None
@@ -0,0 +1,71 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from .base import BaseRepository
+from app.models.auth_session import AuthSession
+
+
+class AuthSessionRepository(BaseRepository[AuthSession]):
+    def __init__(self):
+        super().__init__(AuthSession)
+
+    def add(
+        self,
+        db: Session,
+        user_id: int,
+        token_digest: str,
+        expires_at: datetime,
+        user_agent: str | None = None,
+        family_id: str | None = None,
+    ):
+        # no commit, the caller commits together with its other login writes
+        session = AuthSession(
+            user_id=user_id,
+            token_digest=token_digest,
+            expires_at=expires_at,
+            user_agent=user_agent[:255] if user_agent else None,
+            family_id=family_id,
+        )
+        db.add(session)
+        return session
+
+    def get_by_digest(self, db: Session, token_digest: str):
+        return db.query(AuthSession).filter(AuthSession.token_digest == token_digest).first()
+
+    def delete_by_digest(self, db: Session, token_digest: str, user_id: int | None = None) -> int:
+        query = db.query(AuthSession).filter(AuthSession.token_digest == token_digest)
+        if user_id is not None:
+            query = query.filter(AuthSession.user_id == user_id)
+        deleted = query.delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    def delete_for_user(self, db: Session, user_id: int) -> int:
+        deleted = db.query(AuthSession).filter(AuthSession.user_id == user_id).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    def delete_for_family(self, db: Session, family_id: str) -> int:
+        deleted = db.query(AuthSession).filter(AuthSession.family_id == family_id).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    def purge_expired(self, db: Session, batch_size: int = 1000) -> int:
+        """Delete expired sessions in batches of batch_size rows, one short transaction each."""
+        total = 0
+        now = datetime.utcnow()
+        while True:
+            ids = [
+                row.id for row in
+                db.query(AuthSession.id)
+                .filter(AuthSession.expires_at <= now)
+                .order_by(AuthSession.expires_at)
+                .limit(batch_size)
+                .all()
+            ]
+            if not ids:
+                return total
+            db.query(AuthSession).filter(AuthSession.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+            total += len(ids)
+            if len(ids) < batch_size:
+                return total
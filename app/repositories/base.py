@@ -1,9 +1,32 @@
-from typing import Generic, TypeVar, Type
+from typing import Generic, List, TypeVar, Type
+from sqlalchemy import insert, text
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.base import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+AUTOINC_INCREMENT = text("SELECT @@auto_increment_increment")
+
+# engine -> @@auto_increment_increment, read once per engine
+_autoinc_increments: dict = {}
+
+
+def autoinc_increment(db: Session) -> int:
+    """@@auto_increment_increment of the session's engine, read once per engine."""
+    engine = db.get_bind().engine
+    increment = _autoinc_increments.get(engine)
+    if increment is None:
+        increment = _autoinc_increments[engine] = int(db.execute(AUTOINC_INCREMENT).scalar())
+    return increment
+
+
+def chunked(rows: list, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
 class BaseRepository(Generic[ModelType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
@@ -20,3 +43,71 @@ class BaseRepository(Generic[ModelType]):
         db.commit()
         db.refresh(obj)
         return obj
+
+    # ---------------- BULK ---------------- #
+    # One multi-row INSERT per chunk of chunk_size rows (BULK_CHUNK_SIZE), all
+    # chunks in the caller's transaction. Rows are plain dicts of column values,
+    # all with the same keys: no ORM objects, events or relationship cascades.
+
+    def create_many(self, db: Session, rows: List[dict], chunk_size: int | None = None,
+                    commit: bool = True) -> List[int]:
+        """Insert rows and return their generated primary keys, in row order."""
+        if not rows:
+            return []
+        table = self.model.__table__
+        pk = table.primary_key.columns.values()[0]
+        dialect = db.get_bind().dialect
+        returning = dialect.insert_executemany_returning_sort_by_parameter_order
+        step = None
+        ids = []
+        for chunk in chunked(rows, chunk_size or settings.BULK_CHUNK_SIZE):
+            if returning:
+                result = db.execute(insert(table).returning(pk, sort_by_parameter_order=True), chunk)
+                ids.extend(result.scalars().all())
+                continue
+            if all(pk.key in row for row in chunk):
+                db.execute(insert(table).values(chunk))
+                ids.extend(row[pk.key] for row in chunk)
+                continue
+            if step is None:
+                step = autoinc_increment(db)
+            # MySQL has no RETURNING: a multi-row VALUES insert is a "simple insert",
+            # InnoDB reserves its ids as one block in every innodb_autoinc_lock_mode
+            # and LAST_INSERT_ID() is the first of them. The block follows
+            # auto_increment_increment (multi-primary / Galera offsets use > 1).
+            result = db.execute(insert(table).values(chunk))
+            first_id = result.lastrowid
+            ids.extend(range(first_id, first_id + len(chunk) * step, step))
+        if commit:
+            db.commit()
+        return ids
+
+    def upsert_many(self, db: Session, rows: List[dict], update_columns: List[str],
+                    chunk_size: int | None = None, commit: bool = True) -> int:
+        """
+        INSERT ... ON DUPLICATE KEY UPDATE (MySQL): rows that hit a primary or unique
+        key update update_columns from the new values. Returns the driver's
+        affected-rows count, in which MySQL counts an updated row twice.
+        """
+        if not rows:
+            return 0
+        affected = 0
+        for chunk in chunked(rows, chunk_size or settings.BULK_CHUNK_SIZE):
+            stmt = mysql_insert(self.model.__table__).values(chunk)
+            stmt = stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in update_columns})
+            affected += db.execute(stmt).rowcount
+        if commit:
+            db.commit()
+        return affected
+
+    def insert_ignore_many(self, db: Session, rows: List[dict], chunk_size: int | None = None,
+                           commit: bool = True) -> int:
+        """INSERT IGNORE (MySQL): rows that hit a primary or unique key are skipped. Returns the rows inserted."""
+        if not rows:
+            return 0
+        inserted = 0
+        for chunk in chunked(rows, chunk_size or settings.BULK_CHUNK_SIZE):
+            inserted += db.execute(mysql_insert(self.model.__table__).values(chunk).prefix_with("IGNORE")).rowcount
+        if commit:
+            db.commit()
+        return inserted
@@ -0,0 +1,6 @@
+from .base import BaseRepository
+from app.models.course_chapter import CourseChapter
+
+class CourseChapterRepository(BaseRepository[CourseChapter]):
+    def __init__(self):
+        super().__init__(CourseChapter)
@@ -0,0 +1,6 @@
+from .base import BaseRepository
+from app.models.models import Permission
+
+class PermissionRepository(BaseRepository[Permission]):
+    def __init__(self):
+        super().__init__(Permission)
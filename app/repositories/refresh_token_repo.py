@@ -0,0 +1,71 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from .base import BaseRepository
+from app.models.refresh_token import RefreshToken
+
+
+class RefreshTokenRepository(BaseRepository[RefreshToken]):
+    def __init__(self):
+        super().__init__(RefreshToken)
+
+    def add(self, db: Session, user_id: int, family_id: str, token_digest: str, expires_at: datetime):
+        # no commit, issued in the same transaction as the access session
+        token = RefreshToken(
+            user_id=user_id,
+            family_id=family_id,
+            token_digest=token_digest,
+            expires_at=expires_at,
+        )
+        db.add(token)
+        return token
+
+    def get_by_digest(self, db: Session, token_digest: str):
+        return db.query(RefreshToken).filter(RefreshToken.token_digest == token_digest).first()
+
+    def mark_used(self, db: Session, token_id: int) -> bool:
+        """Claim a token for rotation; False when another request already used it."""
+        updated = (
+            db.query(RefreshToken)
+            .filter(RefreshToken.id == token_id, RefreshToken.used_at.is_(None), RefreshToken.revoked_at.is_(None))
+            .update({RefreshToken.used_at: datetime.utcnow()}, synchronize_session=False)
+        )
+        return updated == 1
+
+    def revoke_family(self, db: Session, family_id: str) -> int:
+        revoked = (
+            db.query(RefreshToken)
+            .filter(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .update({RefreshToken.revoked_at: datetime.utcnow()}, synchronize_session=False)
+        )
+        db.commit()
+        return revoked
+
+    def revoke_for_user(self, db: Session, user_id: int) -> int:
+        revoked = (
+            db.query(RefreshToken)
+            .filter(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .update({RefreshToken.revoked_at: datetime.utcnow()}, synchronize_session=False)
+        )
+        db.commit()
+        return revoked
+
+    def purge_expired(self, db: Session, batch_size: int = 1000) -> int:
+        """Delete expired refresh tokens in batches of batch_size rows."""
+        total = 0
+        now = datetime.utcnow()
+        while True:
+            ids = [
+                row.id for row in
+                db.query(RefreshToken.id)
+                .filter(RefreshToken.expires_at <= now)
+                .order_by(RefreshToken.expires_at)
+                .limit(batch_size)
+                .all()
+            ]
+            if not ids:
+                return total
+            db.query(RefreshToken).filter(RefreshToken.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+            total += len(ids)
+            if len(ids) < batch_size:
+                return total
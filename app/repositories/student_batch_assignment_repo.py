@@ -0,0 +1,6 @@
+from .base import BaseRepository
+from app.models.student_batch_assignments import StudentBatchAssignment
+
+class StudentBatchAssignmentRepository(BaseRepository[StudentBatchAssignment]):
+    def __init__(self):
+        super().__init__(StudentBatchAssignment)
@@ -1,42 +1,93 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
 from sqlalchemy.orm import Session
 from app.db.session import db as database
-from app.schemas.auth import UserCreate, UserLogin, UserOut, Token
+from app.schemas.auth import UserCreate, UserLogin, UserOut, Token, RefreshRequest, RefreshedToken
+from starlette.concurrency import run_in_threadpool
 from app.services.auth_service import AuthService
+from app.core.password_hasher import PasswordHasherBusy
+from app.core.rate_limit import RateLimited, login_admission
+from app.core.principal_cache import Principal
+from app.helper.dependencies import current_principal, require
 
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 service = AuthService()
 
+def password_pool_busy(e: PasswordHasherBusy):
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+
+def rate_limited(e: RateLimited):
+    return HTTPException(status_code=429, detail=e.message, headers={"Retry-After": str(e.retry_after)})
+
+
+def login_response(user, token: str, refresh_token: str) -> dict:
+    roles = [r.name for r in user.roles] if user.roles else []
+    return {
+        "access_token": token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "user": {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "role":roles,
+            "name": user.name or "",
+        }
+    }
+
+
 @router.post("/register", response_model=UserOut)
-def register(user: UserCreate, db: Session = Depends(database.get_db)):
+async def register(user: UserCreate, db: Session = Depends(database.get_db)):
     try:
-        created = service.register(db, user)
+        created = await service.register_async(db, user)
         return {"id": created.id, "username": created.username, "role": created.role}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except PasswordHasherBusy as e:
+        raise password_pool_busy(e)
 
 @router.post("/login", response_model=Token)
-def login(payload: UserLogin, db: Session = Depends(database.get_db)):
+async def login(payload: UserLogin, request: Request, db: Session = Depends(database.get_db)):
     try:
-        user, token = service.login(db, payload)
-        roles = [r.name for r in user.roles] if user.roles else []
-        #print(f"asdfdsfsd {roles}")
-        return {
-            "access_token": token,
-            "token_type": "bearer",
-            "user": {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "role":roles,
-                "name": user.name or "",
-            }
-        }
+        login_admission.admit(payload.username, request.client.host if request.client else None)
+        user, token, refresh_token = await service.login_async(db, payload, user_agent=request.headers.get("user-agent"))
+        # roles are lazy loaded, keep that query off the event loop
+        return await run_in_threadpool(login_response, user, token, refresh_token)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except RateLimited as e:
+        raise rate_limited(e)
+    except PasswordHasherBusy as e:
+        raise password_pool_busy(e)
         
+@router.post("/refresh", response_model=RefreshedToken)
+def refresh(payload: RefreshRequest, request: Request, db: Session = Depends(database.get_db)):
+    try:
+        token, refresh_token = service.refresh(db, payload.refresh_token, user_agent=request.headers.get("user-agent"))
+        return {"access_token": token, "refresh_token": refresh_token, "token_type": "bearer"}
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
 @router.post("/logout")
-def logout(username: str, db: Session = Depends(database.get_db)):
-    AuthService().logout(db, username)
-    return {"message": "User logged out successfully"}        
+def logout(
+    all_devices: bool = False,
+    authorization: str | None = Header(None),
+    current_user: Principal = Depends(current_principal),
+    db: Session = Depends(database.get_db),
+):
+    # the bearer token's device is logged out, every device with all_devices=true
+    token = authorization.split(" ")[1] if authorization and authorization.startswith("Bearer ") else None
+    service.logout(db, current_user.id, token, all_devices=all_devices)
+    return {"message": "User logged out successfully"}
+
+
+@router.post("/logout/{user_id}")
+def logout_user(
+    user_id: int,
+    current_user: Principal = Depends(require("users", "update")),
+    db: Session = Depends(database.get_db),
+):
+    # admin: end every session of another user
+    service.logout(db, user_id, all_devices=True)
+    return {"message": "User logged out successfully"}
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, Header, Form, UploadFile, File, Query
+from fastapi import APIRouter, Depends, Form, UploadFile, File, Query
 from sqlalchemy.orm import Session
 from typing import Optional, Dict, Any
 
 from app.db.session import db as database
 from app.schemas.course_assignment import CourseAssignmentCreate, CourseAssignmentUpdate
 from app.services.course_assignment import CourseAssignmentService
-from app.helper.dependencies import get_current_user
+from app.core.principal_cache import Principal
+from app.helper.dependencies import current_principal
 
 
 router = APIRouter(prefix="/course-assignments", tags=["Course Assignments"])
@@ -20,11 +21,10 @@ async def create_assignment(
     due_date: str = Form(None),
     max_marks: int = Form(100),
     file_path: UploadFile = File(None),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(current_principal),
     db: Session = Depends(database.get_db)
 ):
     try:
-        current_user = get_current_user(authorization, db)
         service = CourseAssignmentService(db)
 
         payload: Dict[str, Any] = {
@@ -50,20 +50,20 @@ def list_assignments(
     limit: int = Query(10, ge=1, le=100),
     search: Optional[str] = Query(None),
     course_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="Keyset pagination: next_cursor of the previous page, empty for the first page"),
+    include_total: bool = Query(True, description="false skips counting the matching assignments"),
     db: Session = Depends(database.get_db)
 ):
     try:
         service = CourseAssignmentService(db)
-        result = service.get_assignments(page, limit, search, course_id)
+        result = service.get_assignments(page, limit, search, course_id, cursor, include_total)
+        items = result.pop("items")
 
         return {
             "success": True,
             "message": "Assignments fetched successfully",
-            "page": result["page"],
-            "limit": result["limit"],
-            "total": result["total"],
-            "total_pages": result["total_pages"],
-            "data": result["items"]
+            **result,
+            "data": items
         }
 
     except Exception as e:
@@ -96,11 +96,10 @@ async def update_assignment(
     due_date: Optional[str] = Form(None),
     max_marks: Optional[int] = Form(None),
     file_path: Optional[UploadFile] = File(None),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(current_principal),
     db: Session = Depends(database.get_db)
 ):
     try:
-        current_user = get_current_user(authorization, db)
         service = CourseAssignmentService(db)
 
         # Prepare payload only with provided values
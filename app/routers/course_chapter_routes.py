@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, Header, Query, Form, File, UploadFile, HTTPException, Body
+from fastapi import APIRouter, Depends, Query, Form, File, UploadFile, HTTPException, Body
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db.session import db as database
 from app.schemas.course_chapter import CourseChaptersCreate, CourseChapterResponse
 from app.schemas.chapter_content import ChapterContentCreate
 from app.services import course_chapter_service as service
-from app.helper.dependencies import check_permission, get_current_user
+from app.core.principal_cache import Principal
+from app.core.permission_matrix import permission_matrix
+from app.helper.dependencies import AuthError, current_principal
 from pydantic import BaseModel
 from typing import List, Optional
 import json
@@ -16,10 +19,8 @@ router = APIRouter(prefix="/chapters", tags=["Course Chapters"])
 def create_multiple_chapters(
     data: CourseChaptersCreate,
     db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(current_principal),
 ):
-    current_user = get_current_user(authorization, db)
-
     chapters = service.create_multiple_chapters(db, data, current_user.id)
 
     return chapters
@@ -32,11 +33,8 @@ def update_course_chapter(
     chapter_name: str = Form(...),
     description: str = Form(...),
     db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(current_principal),
 ):
-
-    current_user = get_current_user(authorization, db)
-
     try:
         updated_chapter = service.update_chapter_service(
             db=db,
@@ -62,32 +60,27 @@ def update_course_chapter(
 
 
 @router.get("/by-course/{course_id}")
-def get_chapters_by_course_id(
+async def get_chapters_by_course_id(
     course_id: int,
-    db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    db: AsyncSession = Depends(database.get_async_read_db),
+    current_user: Principal = Depends(current_principal),
     search: Optional[str] = Query(None, description="Search by chapter title"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
 ):
-
-    current_user = get_current_user(authorization, db)
     #return current_user
 
-    chapters = service.get_chapters_by_course_id(db, course_id, current_user.id, search, page, limit)
+    chapters = await service.get_chapters_by_course_id(db, course_id, current_user.id, search, page, limit)
     return chapters
 
 
 @router.get("/chaptergetbyid/{chapter_id}", response_model=CourseChapterResponse)
-def get_single_chapter(
+async def get_single_chapter(
     chapter_id: int,
-    db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    db: AsyncSession = Depends(database.get_async_read_db),
+    current_user: Principal = Depends(current_principal),
 ):
-
-    current_user = get_current_user(authorization, db)
-
-    chapter = service.get_chapter_by_id(db, chapter_id)
+    chapter = await service.get_chapter_by_id(db, chapter_id)
 
     if not chapter:
         from fastapi import HTTPException
@@ -104,7 +97,7 @@ def get_single_chapter(
 
 
 @router.post("/{chapter_id}/contents")
-async def create_chapter_content(
+def create_chapter_content(
     chapter_id: int,
     title: str = Form(...),
     slug: str = Form(...),
@@ -115,19 +108,18 @@ async def create_chapter_content(
     position: int = Form(...),
     is_published: bool = Form(...),
     is_free: bool = Form(...),
-    user_id: int = Form(...),
     meta_data: str = Form(...),
     video_duration: Optional[int] = Form(...),
     db: Session = Depends(database.get_db),
-    authorization: Optional[str] = Header(None),
+    current_user: Principal = Depends(current_principal),
     content_file: UploadFile = File(None)
 ):
     try:
 
-        new_content = await service.create_chapter_content_service(
+        new_content = service.create_chapter_content_service(
             db=db,
             chapter_id=chapter_id,
-            user_id=user_id,
+            user_id=current_user.id,
             title=title,
             slug=slug,
             description=description,
@@ -148,6 +140,8 @@ async def create_chapter_content(
 
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -156,12 +150,10 @@ async def create_chapter_content(
 @router.get("/{chapter_id}/contents")
 async def get_chapter_content(
         chapter_id: int,
-        db: Session = Depends(database.get_db),
-        authorization: Optional[str] = Header(None),
+        db: AsyncSession = Depends(database.get_async_read_db),
+        current_user: Principal = Depends(current_principal),
 ):
-    current_user = get_current_user(authorization, db)
-
-    contents = service.get_chapter_content_by_chapter_id(db, chapter_id, current_user.id)
+    contents = await service.get_chapter_content_by_chapter_id(db, chapter_id, current_user.id)
 
     return {
         "status": True,
@@ -171,7 +163,7 @@ async def get_chapter_content(
 
 # Update Chapter Content
 @router.post("/chapter-contents/{id}")
-async def update_chapter_content(
+def update_chapter_content(
     id: int,
     title: str = Form(...),
     slug: str = Form(...),
@@ -182,20 +174,19 @@ async def update_chapter_content(
     position: int = Form(...),
     is_published: bool = Form(...),
     is_free: bool = Form(...),
-    user_id: int = Form(...),
     meta_data: str = Form(...),
     video_duration: Optional[int] = Form(...),
     db: Session = Depends(database.get_db),
-    authorization: Optional[str] = Header(None),
+    current_user: Principal = Depends(current_principal),
     content_file: UploadFile = File(None)
 ):
     #return id
     try:
 
-        new_content = await service.update_chapter_content_service(
+        new_content = service.update_chapter_content_service(
             db=db,
             id=id,
-            user_id=user_id,
+            user_id=current_user.id,
             title=title,
             slug=slug,
             description=description,
@@ -216,23 +207,27 @@ async def update_chapter_content(
 
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
     # Delete Chapter Content
 
 @router.delete("/chapter-delete-contents/{id}")
-async def delete_chapter_content(
+def delete_chapter_content(
         id: int,
         db: Session = Depends(database.get_db),
-        authorization: str | None = Header(None)
+        current_user: Principal = Depends(current_principal),
 ):
 
     try:
-        success = await service.delete_chapter_content_service(db, id)
+        success = service.delete_chapter_content_service(db, id, current_user.id)
         if not success:
             raise HTTPException(status_code=404, detail="Chapter content not found")
         return {"status": True, "message": "Chapter content deleted successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -240,56 +235,63 @@ async def delete_chapter_content(
 #Get Student course chapter
 
 @router.get("/student-course/{course_id}")
-def get_chapters_by_course_id(
+async def get_chapters_by_course_id(
     course_id: int,
-    db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    db: AsyncSession = Depends(database.get_async_read_db),
+    current_user: Principal = Depends(current_principal),
     search: Optional[str] = Query(None, description="Search by chapter title"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
 ):
-
-    current_user = get_current_user(authorization, db)
     #return current_user
 
-    chapters = service.get_student_chapters_by_course_id(db, course_id, current_user.id, search, page, limit)
+    chapters = await service.get_student_chapters_by_course_id(db, course_id, current_user.id, search, page, limit)
     return chapters
 
 
+def progress_student_id(
+    studentId: Optional[int] = None,
+    current_user: Principal = Depends(current_principal),
+    db: Session = Depends(database.get_db),
+) -> int:
+    """The caller's own progress, or another student's with users:read."""
+    if studentId is None or studentId == current_user.id:
+        return current_user.id
+    if not permission_matrix.allows(current_user.role_ids, "users", "read", db):
+        raise AuthError(403, 403, "Permission denied: You do not have permission to perform this action.")
+    return studentId
+
+
 #Get Student course chapter and completed course chapter
 @router.get("/content-totals/{course_id}")
-def get_course_content_completed_percentage(
+async def get_course_content_completed_percentage(
     course_id: int,
-    studentId: int,
-    db: Session = Depends(database.get_db)
+    student_id: int = Depends(progress_student_id),
+    db: AsyncSession = Depends(database.get_async_read_db)
 ):
-    chapters = service.get_course_content_completed_percentage_service(db, course_id, studentId)
+    chapters = await service.get_course_content_completed_percentage_service(db, course_id, student_id)
     return chapters
 
 
 # Get Student course chapter and completed course chapter by student id
 # It is created for the student dasahboard
 @router.get("/content-student-totals")
-def get_course_content_completed_percentage(
-    authorization: str = Header(...),
-    db: Session = Depends(database.get_db)
+async def get_course_content_completed_percentage(
+    current_user: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(database.get_async_read_db)
 ):
-    current_user = get_current_user(authorization, db)
-    chapters = service.get_student_course_content_completed_percentage_service(db,  current_user.id)
+    chapters = await service.get_student_course_content_completed_percentage_service(db,  current_user.id)
     return chapters
 
 #Get chapter content detail by the chapter id
 @router.get("/chapter-content/{content_id}")
 async def get_chapter_content_detail(
     content_id: int,
-    db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    db: AsyncSession = Depends(database.get_async_read_db),
+    current_user: Principal = Depends(current_principal),
 ):
-    # Authenticate user
-    current_user = get_current_user(authorization, db)
-
     # Fetch content from service
-    content = service.get_chapter_content_by_id(db, content_id)
+    content = await service.get_chapter_content_by_id(db, content_id)
 
     if not content:
         raise HTTPException(status_code=404, detail="Content not found")
@@ -1,16 +1,18 @@
-from fastapi import APIRouter, Depends, Header, UploadFile, File, Form, Query, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Form, Query, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.services.course_service import CourseService
 from app.db.session import db as database
 from app.schemas.course import CourseCreate, CourseOut
-from app.helper.dependencies import check_permission, get_current_user
+from app.core.principal_cache import Principal
+from app.helper.dependencies import current_principal
 from app.controllers.course_controller import CourseController
 
 
 router = APIRouter()
 @router.post("/courses")
 @router.post("/courses")
-async def create_course(
+def create_course(
     # Text fields
     course_type: str = Form(...),
     course_price: str = Form(...),
@@ -33,7 +35,7 @@ async def create_course(
     # File field
     course_thumb: UploadFile = File(...),
     # Auth + DB
-    authorization: str = Header(...),
+    current_user: Principal = Depends(current_principal),
     db: Session = Depends(database.get_db)
 ):
 
@@ -63,7 +65,6 @@ async def create_course(
     )
 
     # Save course (example: controller/service)
-    current_user = get_current_user(authorization, db)
     new_course = CourseController.create(payload, current_user.id, db)
 
     return {
@@ -83,12 +84,14 @@ async def list_courses(
     # Pagination
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1),
+    cursor: str | None = Query(None, description="Keyset pagination: next_cursor of the previous page, empty for the first page"),
+    include_total: bool = Query(True, description="false skips counting the matching courses"),
+    estimate_total: bool = Query(False, description="Row estimate instead of an exact count when no filter is set"),
     # Auth + DB
-    authorization: str = Header(...),
-    db: Session = Depends(database.get_db)
+    current_user: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(database.get_async_read_db)
 ):
-    current_user = get_current_user(authorization, db)
-    result = CourseController.list(
+    result = await CourseController.list(
         db=db,
         user_id=current_user.id,
         title=title,
@@ -96,7 +99,10 @@ async def list_courses(
         course_mode=course_mode,
         category_id=category_id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        estimate_total=estimate_total
     )
     return result
     return {
@@ -116,12 +122,14 @@ async def list_courses(
     # Pagination
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1),
+    cursor: str | None = Query(None, description="Keyset pagination: next_cursor of the previous page, empty for the first page"),
+    include_total: bool = Query(True, description="false skips counting the matching courses"),
+    estimate_total: bool = Query(False, description="Row estimate instead of an exact count when no filter is set"),
     # Auth + DB
-    authorization: str = Header(...),
-    db: Session = Depends(database.get_db)
+    current_user: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(database.get_async_read_db)
 ):
-    current_user = get_current_user(authorization, db)
-    result = CourseController.adminCourseList(
+    result = await CourseController.adminCourseList(
         db=db,
         user_id=current_user.id,
         title=title,
@@ -129,7 +137,10 @@ async def list_courses(
         course_mode=course_mode,
         category_id=category_id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        estimate_total=estimate_total
     )
     return result
     return {
@@ -145,11 +156,10 @@ async def list_courses(
 @router.get("/courses/{id}")
 async def get_course_detail(
     id: int,
-    authorization: str = Header(...),
-    db: Session = Depends(database.get_db)
+    current_user: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(database.get_async_read_db)
 ):
-    current_user = get_current_user(authorization, db)
-    course = CourseController.get(id, current_user.id, db)
+    course = await CourseController.get(id, current_user.id, db)
 
 
 
@@ -185,7 +195,7 @@ async def get_course_detail(
 
 
 @router.put("/courses/{course_id}")
-async def update_course(
+def update_course(
     course_id: int,
     course_type: str | None = Form(None),
     course_price: str | None = Form(None),
@@ -201,11 +211,9 @@ async def update_course(
     subtitle_languages: str | None = Form(None),
     topic_tags: str | None = Form(None),
     course_thumb: UploadFile | None = File(None),  # optional
-    authorization: str = Header(...),
+    current_user: Principal = Depends(current_principal),
     db: Session = Depends(database.get_db)
 ):
-    current_user = get_current_user(authorization, db)
-
     # Handle image upload
     course_thumb_path = None
     if course_thumb:  # only save if a new file is uploaded
@@ -238,13 +246,11 @@ async def update_course(
 
 
 @router.delete("/courses/{id}")
-async def delete_course(
+def delete_course(
     id: int,
-    authorization: str = Header(...),
+    current_user: Principal = Depends(current_principal),
     db: Session = Depends(database.get_db)
 ):
-    current_user = get_current_user(authorization, db)
-
     course = CourseController.delete(id, current_user.id, db)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found or not owned by you")
@@ -261,9 +267,9 @@ async def delete_course(
 async def get_latest_courses_by_category(
     category_id: int,
     limit: int = Query(3, ge=1, le=20, description="Number of latest courses to fetch"),
-    db: Session = Depends(database.get_db)
+    db: AsyncSession = Depends(database.get_async_read_db)
 ):
-    result = CourseController.get_latest_by_category(category_id, db, limit)
+    result = await CourseController.get_latest_by_category(category_id, db, limit)
     return {
         "success": True,
         "message": f"Latest {limit} courses fetched successfully",
@@ -274,17 +280,17 @@ async def get_latest_courses_by_category(
 @router.get("/courses/view/{id}")
 async def get_course_detail(
     id: int,
-    db: Session = Depends(database.get_db)
+    db: AsyncSession = Depends(database.get_async_read_db)
 ):
-    course = CourseController.ViewCourse(id, db)
+    course = await CourseController.ViewCourse(id, db)
     return course
 
 
 @router.get("/courses/list/all", summary="Get all courses for dropdown")
 async def get_all_courses_for_dropdown(
-    db: Session = Depends(database.get_db)
+    db: AsyncSession = Depends(database.get_async_read_db)
 ):
-    courses = CourseController.get_all(db)
+    courses = await CourseController.get_all(db)
     return {
         "success": True,
         "message": "All courses fetched successfully",
@@ -297,14 +303,11 @@ async def get_all_courses_for_dropdown(
 
 @router.get("/courses/list-by-user/all", summary="Get all courses for dropdown")
 async def get_all_courses_for_dropdown(
-    authorization: str = Header(...),
-    db: Session = Depends(database.get_db)
+    current_user: Principal = Depends(current_principal),
+    db: AsyncSession = Depends(database.get_async_read_db)
 ):
-    # 1. Get logged-in user
-    current_user = get_current_user(authorization, db)
-
-    # 2. Fetch courses created by this user
-    courses = CourseController.get_all_by_user(current_user.id, db)
+    # Fetch courses created by this user
+    courses = await CourseController.get_all_by_user(current_user.id, db)
 
     return {
         "success": True,
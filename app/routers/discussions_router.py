@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db.session import db as database
@@ -37,11 +38,11 @@ def create_discussion(payload: DiscussionCreate, db: Session = Depends(database.
 
 #Get discussions by content_id
 @router.get("/", response_model=list[DiscussionOut])
-def get_discussions_by_content_id(
+async def get_discussions_by_content_id(
     content_id: int = Query(..., description="ID of chapter_content"),
-    db: Session = Depends(database.get_db)
+    db: AsyncSession = Depends(database.get_async_read_db)
 ):
-    return DiscussionService.get_discussions_by_content_id(db, content_id)
+    return await DiscussionService.get_discussions_by_content_id(db, content_id)
 
 
 # ---------------------------------------------------------
@@ -92,5 +93,5 @@ def create_comment(
 # GET ALL COMMENTS (NESTED)
 # ---------------------------------------------------------
 @router.get("/{discussion_id}/comments")
-def get_comments(discussion_id: int, db: Session = Depends(database.get_db)):
-    return DiscussionService.get_comments_by_discussion(db, discussion_id)
+async def get_comments(discussion_id: int, db: AsyncSession = Depends(database.get_async_read_db)):
+    return await DiscussionService.get_comments_by_discussion(db, discussion_id)
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends, Header, Path
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Path
 from sqlalchemy.orm import Session
 from app.db.session import db as database
 from app.schemas.module import ModuleCreate, ModuleUpdate
 from app.controllers.module_controller import ModuleController
-from app.helper.dependencies import check_permission
+from app.core.principal_cache import Principal
+from app.helper.dependencies import require
 
 router = APIRouter(prefix="/modules", tags=["Modules"])
 
@@ -13,36 +13,16 @@ router = APIRouter(prefix="/modules", tags=["Modules"])
 def create_module(
     payload: ModuleCreate,
     db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(require("modules", "create")),
 ):
-    has_permission = check_permission(authorization, "modules", "create", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 401,
-                "success": False,
-                "message": "Permission denied: You are not authorized to view modules",
-            },
-        )
     return ModuleController.create(payload, db)
 
 
 @router.get("/")
 def list_modules(
-    authorization: str = Header(...),
+    current_user: Principal = Depends(require("modules", "read")),
     db: Session = Depends(database.get_db),
 ):
-    has_permission = check_permission(authorization, "modules", "read", db)
-
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 401,
-                "success": False,
-                "message": "Permission denied: You are not authorized to view modules",
-            },
-        )
-
     return ModuleController.list(db)
 
 
@@ -51,17 +31,8 @@ def update_module(
     module_id: int = Path(...),
     payload: ModuleUpdate = None,
     db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(require("modules", "update")),
 ):
-    has_permission = check_permission(authorization, "modules", "update", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 401,
-                "success": False,
-                "message": "Permission denied: You are not authorized to update modules",
-            },
-        )
     return ModuleController.update(module_id, payload, db)
 
 
@@ -69,18 +40,8 @@ def update_module(
 def delete_module(
     module_id: int = Path(...),
     db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(require("modules", "delete")),
 ):
-
-    has_permission = check_permission(authorization, "modules", "delete", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 401,
-                "success": False,
-                "message": "Permission denied: You are not authorized to delete modules",
-            },
-        )
     return ModuleController.delete(module_id, db)
 
 
@@ -88,15 +49,6 @@ def delete_module(
 def get_module(
     module_id: int = Path(...),
     db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(require("modules", "update")),
 ):
-    has_permission = check_permission(authorization, "modules", "update", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 401,
-                "success": False,
-                "message": "Permission denied: You are not authorized to view modules",
-            },
-        )
     return ModuleController.get_by_id(module_id, db)
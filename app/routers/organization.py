@@ -7,7 +7,7 @@ from app.models.organization import Organization
 router = APIRouter(prefix="/organizations", tags=["Organizations"])
 
 @router.get("/list/all", summary="Get all organizations for dropdown")
-async def get_all_organizations_for_dropdown(
+def get_all_organizations_for_dropdown(
     db: Session = Depends(database.get_db)
 ):
     organizations = (
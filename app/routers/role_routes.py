@@ -1,79 +1,30 @@
-from fastapi import APIRouter, Depends, Header, Path
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Path
 from sqlalchemy.orm import Session
 from app.db.session import db as database
 from app.schemas.role import RoleCreate, RoleUpdate
 from app.controllers.role_controller import RoleController
-from app.helper.dependencies import check_permission
+from app.core.principal_cache import Principal
+from app.helper.dependencies import require
 
 router = APIRouter(prefix="/roles", tags=["Roles"])
 
 @router.post("/")
-def create_role(payload: RoleCreate, db: Session = Depends(database.get_db), authorization: str = Header(...)):
-    has_permission = check_permission(authorization, "roles", "read", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 401,
-                "success": False,
-                "message": "Permission denied: You are not authorized to view roles",
-            },
-        )
+def create_role(payload: RoleCreate, db: Session = Depends(database.get_db), current_user: Principal = Depends(require("roles", "read"))):
     return RoleController.create(payload, db)
 
 @router.get("/")
-def list_roles(authorization: str = Header(...), db: Session = Depends(database.get_db)):
-    check_permission(authorization, "roles", "read", db)
-    has_permission = check_permission(authorization, "roles", "read", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 401,
-                "success": False,
-                "message": "Permission denied: You are not authorized to view roles",
-            },
-        )
-
+def list_roles(current_user: Principal = Depends(require("roles", "read")), db: Session = Depends(database.get_db)):
     return RoleController.list(db)
 
 @router.put("/{role_id}")
-def update_role(role_id: int = Path(...), payload: RoleUpdate = None, db: Session = Depends(database.get_db), authorization: str = Header(...)):
-    has_permission = check_permission(authorization, "roles", "read", db)
-    if not has_permission:
-        return JSONResponse(
-             content={
-                "error_code": 401,
-                "success": False,
-                "message": "Permission denied: You are not authorized to view roles",
-            },
-        )
+def update_role(role_id: int = Path(...), payload: RoleUpdate = None, db: Session = Depends(database.get_db), current_user: Principal = Depends(require("roles", "read"))):
     return RoleController.update(role_id, payload, db)
 
 
 @router.delete("/{role_id}")
-def delete_role(role_id: int = Path(...), db: Session = Depends(database.get_db), authorization: str = Header(...)):
-    check_permission(authorization, "roles", "delete", db)
-    has_permission = check_permission(authorization, "roles", "read", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 401,
-                "success": False,
-                "message": "Permission denied: You are not authorized to view roles",
-            },
-        )
+def delete_role(role_id: int = Path(...), db: Session = Depends(database.get_db), current_user: Principal = Depends(require("roles", "read"))):
     return RoleController.delete(role_id, db)
 
 @router.get("/{role_id}")
-def get_role(role_id: int = Path(...), db: Session = Depends(database.get_db), authorization: str = Header(...)):
-    check_permission(authorization, "roles", "read", db)
-    has_permission = check_permission(authorization, "roles", "read", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 401,
-                "success": False,
-                "message": "Permission denied: You are not authorized to view roles",
-            },
-        )
+def get_role(role_id: int = Path(...), db: Session = Depends(database.get_db), current_user: Principal = Depends(require("roles", "read"))):
     return RoleController.get_by_id(role_id, db)
@@ -7,7 +7,7 @@ from app.models.semester import Semester
 router = APIRouter(prefix="/semesters", tags=["Semesters"])
 
 @router.get("/list/all", summary="Get all semesters for dropdown")
-async def get_all_semesters_for_dropdown(
+def get_all_semesters_for_dropdown(
     db: Session = Depends(database.get_db)
 ):
     semesters = (
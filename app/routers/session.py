@@ -7,7 +7,7 @@ from app.models.session import SessionModel
 router = APIRouter(prefix="/session", tags=["session"])
 
 @router.get("/list/all", summary="Get all sessions for dropdown")
-async def get_all_sessions_for_dropdown(
+def get_all_sessions_for_dropdown(
     db: Session = Depends(database.get_db)
 ):
     sessions = (
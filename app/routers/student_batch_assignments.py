@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Header, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from pydantic import BaseModel
-from app.helper.dependencies import check_permission, get_current_user
+from app.core.principal_cache import Principal
+from app.helper.dependencies import current_principal
 from app.db.session import db as database
 from app.services.student_batch_assignments_service import assign_students_to_batch_service, assign_student_self_enroll_service
 
@@ -44,12 +45,10 @@ def assign_students_to_batch(
 def student_self_enroll(
     batch_id: int,
     db: Session = Depends(database.get_db),
-    authorization: str = Header(..., description="Bearer access token"),
+    current_user: Principal = Depends(current_principal),
 ):
 
     try:
-        current_user = get_current_user(authorization, db)
-
         # Make sure current user is a student (optional role check)
         # if getattr(current_user, "role", None) not in ["student", "Student"]:
         #     raise HTTPException(status_code=403, detail="Only students can enroll themselves")
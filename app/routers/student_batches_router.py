@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Header, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.db.session import db as database
 from app.schemas.student_batches import StudentBatchCreate
 from app.services.student_batches_service import create_student_batch, get_all_student_batches, get_student_batch_by_id, update_student_batch, delete_student_batch, get_students_by_batch_id, get_batches_by_course_id_with_user
-from app.helper.dependencies import get_current_user
+from app.core.principal_cache import Principal
+from app.helper.dependencies import current_principal
 
 router = APIRouter(prefix="/student-batches", tags=["Student Batches"])
 
@@ -11,10 +12,9 @@ router = APIRouter(prefix="/student-batches", tags=["Student Batches"])
 def add_student_batch(
     batch: StudentBatchCreate,
     db: Session = Depends(database.get_db),
-    authorization: str = Header(..., description="Bearer access token")
+    current_user: Principal = Depends(current_principal)
 ):
     try:
-        current_user = get_current_user(authorization, db)
         batch.user_id = current_user.id
 
         result = create_student_batch(db, batch)
@@ -65,10 +65,9 @@ def add_student_batch(
 @router.get("/list/all", summary="Get all student batches")
 def list_student_batches(
         db: Session = Depends(database.get_db),
-        authorization: str = Header(..., description="Bearer access token")
+        current_user: Principal = Depends(current_principal)
 ):
     try:
-        current_user = get_current_user(authorization, db)
         return get_all_student_batches(db, user_id=current_user.id)
     except HTTPException:
         raise
@@ -79,10 +78,9 @@ def list_student_batches(
 def get_single_student_batch(
         batch_id: int,
         db: Session = Depends(database.get_db),
-        authorization: str = Header(..., description="Bearer access token")
+        current_user: Principal = Depends(current_principal)
 ):
     try:
-        current_user = get_current_user(authorization, db)
         batch = get_student_batch_by_id(db, batch_id=batch_id, user_id=current_user.id)
 
         if not batch:
@@ -118,10 +116,9 @@ def update_student_batch_api(
         batch_id: int,
         batch_data: StudentBatchCreate,  # reuse your create schema for updates
         db: Session = Depends(database.get_db),
-        authorization: str = Header(..., description="Bearer access token")
+        current_user: Principal = Depends(current_principal)
 ):
     try:
-        current_user = get_current_user(authorization, db)
         existing_batch = get_student_batch_by_id(db, batch_id=batch_id, user_id=current_user.id)
 
         if not existing_batch:
@@ -157,10 +154,9 @@ def update_student_batch_api(
 def delete_student_batch_api(
         batch_id: int,
         db: Session = Depends(database.get_db),
-        authorization: str = Header(..., description="Bearer access token")
+        current_user: Principal = Depends(current_principal)
 ):
     try:
-        current_user = get_current_user(authorization, db)
         batch = get_student_batch_by_id(db, batch_id=batch_id, user_id=current_user.id)
 
         if not batch:
@@ -185,12 +181,10 @@ def delete_student_batch_api(
 def get_students_in_batch(
         batch_id: int,
         db: Session = Depends(database.get_db),
-        authorization: str = Header(..., description="Bearer access token")
+        current_user: Principal = Depends(current_principal)
 ):
 
     try:
-        current_user = get_current_user(authorization, db)
-
         students = get_students_by_batch_id(db, batch_id=batch_id, user_id=current_user.id)
 
         if students is None:
@@ -222,12 +216,10 @@ def get_students_in_batch(
 def get_batches_by_course_id_api(
         course_id: int,
         db: Session = Depends(database.get_db),
-        authorization: str = Header(..., description="Bearer access token")
+        current_user: Principal = Depends(current_principal)
 ):
 
     try:
-        current_user = get_current_user(authorization, db)
-
         batches = get_batches_by_course_id_with_user(db, course_id=course_id, user_id=current_user.id)
 
         if not batches:
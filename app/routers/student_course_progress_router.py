@@ -1,25 +1,31 @@
-from fastapi import APIRouter, Depends, Header, Form, HTTPException
+from fastapi import APIRouter, Depends, Form, HTTPException
 from sqlalchemy.orm import Session
 from app.db.session import db as database
-from app.services.student_course_progress_service import mark_content_read
-from app.helper.dependencies import check_permission, get_current_user
+from app.services.student_course_progress_service import mark_content_read, mark_content_read_batch
+from app.schemas.student_course_progress import ProgressBatchRequest
+from app.core.progress_buffer import progress_buffer
+from app.core.principal_cache import Principal
+from app.helper.dependencies import current_principal
 
 
 router = APIRouter(prefix="/student-course-progress", tags=["Users"])
 
 
 @router.post("/mark-read")
-async def mark_course_content_read(
+def mark_course_content_read(
     course_id: int = Form(...),
     chapter_id: int = Form(...),
     content_id: int = Form(...),
     percentage: str = Form(...),
     db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(current_principal),
 ):
-    current_user = get_current_user(authorization, db)
-
     try:
+        if progress_buffer.enabled:
+            # coalesced in memory, written in bulk (completions right away)
+            progress_buffer.record(current_user.id, course_id, chapter_id, content_id, percentage)
+            return {"status": True, "message": "Progress saved successfully"}
+
         result = mark_content_read(
             db=db,
             student_id=current_user.id,
@@ -30,5 +36,20 @@ async def mark_course_content_read(
         )
         return result
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/mark-read/batch")
+def mark_course_content_read_batch(
+    payload: ProgressBatchRequest,
+    db: Session = Depends(database.get_db),
+    current_user: Principal = Depends(current_principal),
+):
+    """Replay of offline progress events: one request, one transaction, status per event."""
+    try:
+        return mark_content_read_batch(db=db, student_id=current_user.id, events=payload.events)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, Query
+from app.core.principal_cache import Principal, principal_cache
+from app.core.permission_matrix import permission_matrix
+from app.core.token_revocation import token_revocation
+from app.core.password_hasher import password_hasher
+from app.core.activity_sink import activity_sink
+from app.core.progress_buffer import progress_buffer
+from app.core.session_purge import session_purger
+from app.core.rate_limit import login_admission
+from app.db.count_cache import count_cache
+from app.db.session import db as database
+from app.db.slow_query import slow_query_log
+from app.helper.dependencies import require
+
+router = APIRouter(prefix="/system", tags=["System"])
+
+
+@router.get("/metrics")
+def get_metrics(current_user: Principal = Depends(require("system", "read"))):
+    return {
+        "success": True,
+        "message": "Metrics fetched successfully",
+        "data": {
+            "db_pool": database.pool_stats(),
+            "password_hasher": password_hasher.stats(),
+            "principal_cache": principal_cache.stats(),
+            "permission_matrix": permission_matrix.stats(),
+            "token_revocation": token_revocation.stats(),
+            "activity_sink": activity_sink.stats(),
+            "progress_buffer": progress_buffer.stats(),
+            "session_purge": session_purger.stats(),
+            "login_admission": login_admission.stats(),
+            "slow_queries": slow_query_log.stats(),
+            "count_cache": count_cache.stats(),
+        },
+    }
+
+
+@router.get("/slow-queries")
+def get_slow_queries(
+    limit: int = Query(50, ge=1, le=500),
+    order_by: str = Query("total_ms", description="total_ms | max_ms | avg_ms | count"),
+    current_user: Principal = Depends(require("system", "read")),
+):
+    """Slow statements since worker start, aggregated by statement fingerprint."""
+    return {
+        "success": True,
+        "message": "Slow queries fetched successfully",
+        "data": {
+            "threshold_ms": slow_query_log.threshold_ms,
+            "items": slow_query_log.report(limit, order_by),
+        },
+    }
@@ -1,15 +1,18 @@
-from fastapi import APIRouter, Depends, Header, Path, Query, Form
+from fastapi import APIRouter, Depends, Path, Query, Form
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import or_
 
 from app.controllers import user_controller
 from app.db.session import db as database
-from app.schemas.auth import UserCreate, UserUpdate, UserLogin, UserOut, Token, UpdateUserPermissionsRequest, AssignPermissionRequest
+from app.schemas.auth import UserCreate, UserUpdate, UserLogin, UserOut, Token, UpdateUserPermissionsRequest, AssignPermissionRequest, AssignPermissionMatrixRequest
 from app.schemas.user_details import UserDetailsBase
 from app.controllers.user_controller import UserController
-from app.helper.dependencies import check_permission
+from app.core.principal_cache import Principal
+from app.helper.dependencies import current_principal, require
 from app.models.models import User
+from app.db.count_cache import list_total
+from app.utils.pagination import InvalidCursor, apply_keyset, cursor_for, keyset_result
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -18,21 +21,11 @@ router = APIRouter(prefix="/users", tags=["Users"])
 def create_user(
     payload: UserCreate,
     db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(require("users", "create")),
 ):
 
     try:
-        has_permission = check_permission(authorization, "users", "create", db)
-        if not has_permission:
-            return JSONResponse(
-                content={
-                    "error_code": 403,
-                    "success": False,
-                    "message": "Permission denied: Only admins can create users",
-                },
-                status_code=403,
-            )
-        return UserController.create(payload, db, authorization)
+        return UserController.create(payload, db)
     except Exception as e:
         return JSONResponse(
             content={"success": False, "message": str(e)},
@@ -43,7 +36,7 @@ def create_user(
 @router.post("/detail")
 def assign_permissions(
         db: Session = Depends(database.get_db),
-        authorization: str = Header(...),
+        current_user: Principal = Depends(current_principal),
         user_id: int = Form(...),
         name: str = Form(...),
         email: str = Form(...),
@@ -53,8 +46,7 @@ def assign_permissions(
         linkedin: str = Form(""),
         instagram: str = Form("")
 ):
-    current_user = get_current_user(authorization, db)
-    user_id = current_user["data"]["id"]
+    user_id = current_user.id
 
     payload = {
         "name": name,
@@ -80,34 +72,19 @@ def assign_permissions(
 
 @router.get("/")
 def list_users(
-    authorization: str = Header(...),
+    current_user: Principal = Depends(require("users", "read")),
     db: Session = Depends(database.get_db),
     page: int = Query(None, ge=1, description="Page number"),
     page_size: int = Query(None, le=100, description="Records per page"),
     skip: int = Query(None, ge=0, description="Number of records to skip"),
     limit: int = Query(None, le=100, description="Number of records to return"),
     search: str = Query(None, description="Search users by username or email"),
+    cursor: str = Query(None, description="Keyset pagination: next_cursor of the previous page, empty for the first page"),
+    include_total: bool = Query(True, description="false skips counting the matching users"),
+    estimate_total: bool = Query(False, description="Row estimate instead of an exact count when no search is set"),
 ):
-    has_permission = check_permission(authorization, "users", "read", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 403,
-                "success": False,
-                "message": "Permission denied: You are not authorized to view users",
-            },
-            status_code=403,
-        )
-
-    # Pagination logic
-    if page is not None and page_size is not None:
-        skip = (page - 1) * page_size
-        limit = page_size
-    elif skip is None or limit is None:
-        skip, limit = 0, 10  # default
-
     # Build query
-    query = db.query(User)
+    query = db.query(User).options(selectinload(User.roles))
 
     if search:
         search_pattern = f"%{search}%"
@@ -118,25 +95,38 @@ def list_users(
             )
         )
 
-    total = query.count()
-    users = query.offset(skip).limit(limit).all()
+    if cursor is not None:
+        limit = page_size or limit or 10
+        try:
+            rows = apply_keyset(query, User.id, cursor=cursor, limit=limit, descending=False).all()
+        except InvalidCursor as e:
+            return JSONResponse(content={"success": False, "message": str(e)}, status_code=400)
+        users, next_cursor = keyset_result(rows, limit)
+        return UserController.list(db, limit=limit, users=users, cursor=cursor, next_cursor=next_cursor)
 
-    return UserController.list(db, skip=skip, limit=limit, users=users, total=total)
+    # Pagination logic
+    if page is not None and page_size is not None:
+        skip = (page - 1) * page_size
+        limit = page_size
+    elif skip is None or limit is None:
+        skip, limit = 0, 10  # default
+
+    total, estimated = list_total(db, User.__tablename__, {"search": search}, query.count, include_total, estimate_total)
+    users = query.order_by(User.id).offset(skip).limit(limit + 1).all()
+    # lets an offset client switch to keyset pagination for the following pages
+    next_cursor = cursor_for(users[limit - 1]) if len(users) > limit else None
+
+    return UserController.list(db, skip=skip, limit=limit, users=users[:limit], total=total,
+                               next_cursor=next_cursor, total_estimated=estimated)
 
 #Get user detail by the user token
 @router.get("/user-details-by-token")
 def get_user_detail_by_token(
-    authorization: str = Header(None),
+    current_user: Principal = Depends(current_principal),
     db: Session = Depends(database.get_db)
 ):
-    if not authorization:
-        return JSONResponse(
-            content={"success": False, "message": "Authorization header missing"},
-            status_code=400
-        )
-
     try:
-        user = UserController.get_user_by_token(authorization, db)
+        user = UserController.get_user_details(current_user.id, db)
         if not user:
             return JSONResponse(
                 content={"success": False, "message": "Invalid or expired token"},
@@ -154,19 +144,9 @@ def update_user(
     user_id: int = Path(...),
     payload: UserUpdate = None,
     db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(require("users", "update")),
 ):
     #return user_id
-    has_permission = check_permission(authorization, "users", "update", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 403,
-                "success": False,
-                "message": "Permission denied: You are not authorized to update users",
-            },
-            status_code=403,
-        )
     return UserController.update(user_id, payload, db)
 
 
@@ -174,18 +154,8 @@ def update_user(
 def delete_user(
     user_id: int = Path(...),
     db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(require("users", "delete")),
 ):
-    has_permission = check_permission(authorization, "users", "delete", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 403,
-                "success": False,
-                "message": "Permission denied: You are not authorized to delete users",
-            },
-            status_code=403,
-        )
     return UserController.delete(user_id, db)
 
 
@@ -193,19 +163,9 @@ def delete_user(
 def get_user(
     user_id: int = Path(...),
     db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(require("users", "read")),
 ):
     return user_id
-    has_permission = check_permission(authorization, "users", "read", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 403,
-                "success": False,
-                "message": "Permission denied: You are not authorized to view users",
-            },
-            status_code=403,
-        )
     #return user_id
     return UserController.get_by_id(user_id, db)
 
@@ -214,35 +174,15 @@ def get_user(
 def get_user_by_id(
     user_id: int = Path(...),
     db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(require("users", "read")),
 ):
     #return user_id
-    has_permission = check_permission(authorization, "users", "read", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 403,
-                "success": False,
-                "message": "Permission denied: You are not authorized to view users",
-            },
-            status_code=403,
-        )
     #return user_id
     return UserController.get_user_with_permissions(user_id, db)
 
 
 @router.get("/{user_id}/permissions")
-def get_user_permissions_route(user_id: int, db: Session = Depends(database.get_db), authorization: str = Header(...),):
-    has_permission = check_permission(authorization, "users", "read", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 403,
-                "success": False,
-                "message": "Permission denied: You are not authorized to view users",
-            },
-            status_code=403,
-        )
+def get_user_permissions_route(user_id: int, db: Session = Depends(database.get_db), current_user: Principal = Depends(require("users", "read")),):
     return UserController.get_permissions(user_id, db)
 
 @router.get("/permissions/{permission_id}")
@@ -254,19 +194,8 @@ def update_user_permissions_route(
     permissions_id: int,
     payload: UpdateUserPermissionsRequest,
     db: Session = Depends(database.get_db),
-    authorization: str = Header(...),
+    current_user: Principal = Depends(require("users", "update")),
 ):
-    has_permission = check_permission(authorization, "users", "update", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 403,
-                "success": False,
-                "message": "Permission denied: You are not authorized to update user permissions",
-            },
-            status_code=403,
-        )
-
     return UserController.update_permissions(permissions_id, payload.permission_ids, db)
 
 
@@ -274,19 +203,8 @@ def update_user_permissions_route(
 def get_user_roles(
         user_id: int = Path(...),
         db: Session = Depends(database.get_db),
-        authorization: str = Header(...),
+        current_user: Principal = Depends(require("users", "read")),
 ):
-    has_permission = check_permission(authorization, "users", "read", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 403,
-                "success": False,
-                "message": "Permission denied: You are not authorized to view user roles",
-            },
-            status_code=403,
-        )
-
     return UserController.get_user_roles(user_id, db)
 
 
@@ -294,36 +212,28 @@ def get_user_roles(
 def assign_permissions(
         payload: AssignPermissionRequest,
         db: Session = Depends(database.get_db),
-        authorization: str = Header(...),
+        current_user: Principal = Depends(require("permissions", "create")),
 ):
     #return payload
-    has_permission = check_permission(authorization, "permissions", "create", db)
-    if not has_permission:
-        return JSONResponse(
-            content={
-                "error_code": 403,
-                "success": False,
-                "message": "Permission denied: You are not authorized to assign permissions",
-            },
-            status_code=403,
-        )
-
     return UserController.assign_permissions(payload, db)
 
 
+@router.post("/assign-module-permissions/bulk")
+def assign_permission_matrix(
+        payload: AssignPermissionMatrixRequest,
+        db: Session = Depends(database.get_db),
+        current_user: Principal = Depends(require("permissions", "create")),
+):
+    return UserController.assign_permission_matrix(payload, db)
+
+
 @router.post("/me")
 def get_current_user(
-    authorization: str = Header(None),
+    current_user: Principal = Depends(current_principal),
     db: Session = Depends(database.get_db)
 ):
-    if not authorization:
-        return JSONResponse(
-            content={"success": False, "message": "Authorization header missing"},
-            status_code=400
-        )
-
     try:
-        user = UserController.get_user_by_token(authorization, db)
+        user = UserController.get_user_details(current_user.id, db)
         if not user:
             return JSONResponse(
                 content={"success": False, "message": "Invalid or expired token"},
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import date, datetime
 from typing import List, Optional
 
@@ -48,10 +48,21 @@ class UserLogin(BaseModel):
 
 class Token(BaseModel):
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str
     user: UserOut
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class RefreshedToken(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str
+
+
 class ModuleBase(BaseModel):
     name: str
     description: Optional[str]
@@ -96,3 +107,14 @@ class AssignPermissionRequest(BaseModel):
     module_id: int
     user_id: int
     permission_ids: List[int]
+
+
+class PermissionCell(BaseModel):
+    role_id: int
+    module_id: int
+    # [create, read, update, delete] as 0/1, same as AssignPermissionRequest
+    permission_ids: List[int] = Field(..., min_length=4, max_length=4)
+
+
+class AssignPermissionMatrixRequest(BaseModel):
+    permissions: List[PermissionCell] = Field(..., min_length=1)
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import List
+
+# replayed events accepted per request
+MAX_BATCH_EVENTS = 500
+
+
+class ProgressEvent(BaseModel):
+    course_id: int
+    chapter_id: int
+    content_id: int
+    # validated by the service, so one bad event does not reject the whole batch
+    percentage: str
+    client_ts: datetime
+
+
+class ProgressBatchRequest(BaseModel):
+    events: List[ProgressEvent] = Field(..., min_length=1, max_length=MAX_BATCH_EVENTS)
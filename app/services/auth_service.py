@@ -1,13 +1,21 @@
 from fastapi import Depends, HTTPException, Header
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+import uuid
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.db.session import db as database # <-- FIX: import the actual get_db
 from app.schemas.auth import UserCreate, UserLogin
 from app.repositories.user_repo import UserRepository
-from app.repositories.activity_repo import ActivityRepository
+from app.repositories.activity_repo import ActivityRepository, BufferedActivityRepository
+from app.repositories.auth_session_repo import AuthSessionRepository
+from app.repositories.refresh_token_repo import RefreshTokenRepository
 from app.core.security import security
+from app.core.password_hasher import password_hasher
+from app.core.rate_limit import login_admission
+from app.core.principal_cache import principal_cache, token_digest
+from app.core.token_revocation import token_revocation
 from app.models.models import User
 from app.core.config import settings  # SECRET_KEY, ALGORITHM
 from app.services.user_service import UserService
@@ -16,14 +24,19 @@ from app.services.user_service import UserService
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
+
 class AuthService:
     def __init__(
         self,
         repo: UserRepository | None = None,
-        activity_repo: ActivityRepository | None = None
+        activity_repo: ActivityRepository | None = None,
+        session_repo: AuthSessionRepository | None = None,
+        refresh_repo: RefreshTokenRepository | None = None,
     ):
         self.repo = repo or UserRepository()
-        self.activity_repo = activity_repo or ActivityRepository()
+        self.activity_repo = activity_repo or BufferedActivityRepository()
+        self.session_repo = session_repo or AuthSessionRepository()
+        self.refresh_repo = refresh_repo or RefreshTokenRepository()
 
     def register(self, db: Session, user: UserCreate):
 
@@ -31,7 +44,17 @@ class AuthService:
             raise ValueError("Username already exists")
 
         hashed = security.hash_password(user.password)
-        #return hashed
+        return self._create_user(db, user, hashed)
+
+    async def register_async(self, db: Session, user: UserCreate):
+        """Same as register, with bcrypt on the password pool and DB work on the threadpool."""
+        if await run_in_threadpool(self.repo.get_by_username, db, user.username):
+            raise ValueError("Username already exists")
+
+        hashed = await password_hasher.hash(user.password)
+        return await run_in_threadpool(self._create_user, db, user, hashed)
+
+    def _create_user(self, db: Session, user: UserCreate, hashed: str):
         created = self.repo.create(
             db,
             name=user.name,
@@ -46,33 +69,142 @@ class AuthService:
         )
         return created
 
-    def login(self, db: Session, login: UserLogin) -> tuple[User, str]:
+    def login(self, db: Session, login: UserLogin, user_agent: str | None = None) -> tuple[User, str, str]:
         user = self.repo.get_by_username(db, login.username)
-        #return user, user.hashed_password
-        if not user or not security.verify_password(login.password, user.hashed_password):
+        if not user:
+            raise ValueError("Invalid credentials")
+
+        with login_admission.verify_slot():
+            valid, new_hash = security.verify_and_update(login.password, user.hashed_password)
+        if not valid:
+            raise ValueError("Invalid credentials")
+
+        return self._start_session(db, user, new_hash, user_agent)
+
+    async def login_async(self, db: Session, login: UserLogin, user_agent: str | None = None) -> tuple[User, str, str]:
+        """Same as login, with bcrypt on the password pool and DB work on the threadpool."""
+        user = await run_in_threadpool(self.repo.get_by_username, db, login.username)
+        if not user:
+            raise ValueError("Invalid credentials")
+
+        with login_admission.verify_slot():
+            valid, new_hash = await password_hasher.verify_and_update(login.password, user.hashed_password)
+        if not valid:
             raise ValueError("Invalid credentials")
 
+        return await run_in_threadpool(self._start_session, db, user, new_hash, user_agent)
+
+    def _start_session(
+        self,
+        db: Session,
+        user: User,
+        new_hash: str | None = None,
+        user_agent: str | None = None,
+    ) -> tuple[User, str, str]:
+        if new_hash:
+            # stored hash used an older work factor
+            user.hashed_password = new_hash
+
         self.activity_repo.create(db, user_id=user.id, action="login")
 
-        token = security.create_access_token(
-            subject=user.id,   # use user.id as sub
-            role='admin'
-        )
         permissions = UserService.get_user_permissions(user.id, db)
-        expire = datetime.now(timezone.utc) + timedelta(minutes=90)
-        # update user record in DB
-
-        user.access_token = token
+        token, refresh_token, expire = self._issue_tokens(db, user, uuid.uuid4().hex, user_agent)
         user.token_expiry = expire
         db.add(user)
         db.commit()
         db.refresh(user)
-        return user, token
-        
-    def logout(self, db: Session, username: str):
-        user = self.repo.get_by_username(db, username)
-        if user:
-            self.activity_repo.create(db, user_id=user.id, action="logout")  
+        return user, token, refresh_token
+
+    def refresh(self, db: Session, refresh_token: str, user_agent: str | None = None) -> tuple[str, str]:
+        """
+        Rotate a refresh token: the presented token is used up and a new
+        access token plus a successor refresh token are returned.
+        No password check, so no bcrypt and no activity log row.
+        """
+        stored = self.refresh_repo.get_by_digest(db, security.refresh_token_digest(refresh_token))
+        if not stored or stored.revoked_at is not None or stored.expires_at <= datetime.utcnow():
+            raise ValueError("Invalid refresh token")
+
+        if stored.used_at is not None or not self.refresh_repo.mark_used(db, stored.id):
+            # an already rotated token came back: treat the family as stolen
+            db.rollback()
+            self.refresh_repo.revoke_family(db, stored.family_id)
+            self.session_repo.delete_for_family(db, stored.family_id)
+            principal_cache.evict_user(stored.user_id)
+            raise ValueError("Refresh token reuse detected, please log in again")
+
+        user = self.repo.get_by_id(db, stored.user_id)
+        if not user:
+            db.rollback()
+            raise ValueError("Invalid refresh token")
+
+        token, new_refresh_token, _ = self._issue_tokens(db, user, stored.family_id, user_agent)
+        db.commit()
+        return token, new_refresh_token
+
+    def _issue_tokens(
+        self,
+        db: Session,
+        user: User,
+        family_id: str,
+        user_agent: str | None = None,
+    ) -> tuple[str, str, datetime]:
+        """Adds the session and refresh rows for a new access token; the caller commits."""
+        token = security.create_access_token(
+            subject=user.id,   # use user.id as sub
+            role=user.role,
+            minutes=settings.ACCESS_TOKEN_MINUTES,
+            role_ids=[r.id for r in user.roles],
+            permission_version=token_revocation.user_version(user.id),
+        )
+        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_MINUTES)
+        # one session row per device, earlier sessions stay valid
+        self.session_repo.add(
+            db,
+            user_id=user.id,
+            token_digest=token_digest(token),
+            expires_at=expire,
+            user_agent=user_agent,
+            family_id=family_id,
+        )
+
+        refresh_token = security.new_refresh_token()
+        self.refresh_repo.add(
+            db,
+            user_id=user.id,
+            family_id=family_id,
+            token_digest=security.refresh_token_digest(refresh_token),
+            expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_DAYS),
+        )
+        return token, refresh_token, expire
+
+    def logout(self, db: Session, user_id: int, token: str | None = None, all_devices: bool = False):
+        """
+        Ends the session of the given token, or every session of the user with
+        all_devices. user_id must come from an authenticated principal.
+        """
+        user = self.repo.get(db, user_id)
+        if not user:
+            return
+
+        if token:
+            digest = token_digest(token)
+            session = self.session_repo.get_by_digest(db, digest)
+            if session and session.user_id == user.id and session.family_id:
+                # the refresh chain of this device ends with it
+                self.refresh_repo.revoke_family(db, session.family_id)
+            self.session_repo.delete_by_digest(db, digest, user_id=user.id)
+            principal_cache.evict_token(token)
+            claims = security.decode_access_token(token)
+            if claims and str(claims.get("sub")) == str(user.id):
+                token_revocation.deny(claims.get("jti"), claims["exp"])
+        if all_devices:
+            self.session_repo.delete_for_user(db, user.id)
+            self.refresh_repo.revoke_for_user(db, user.id)
+            principal_cache.evict_user(user.id)
+            # stateless tokens of this user stop verifying
+            token_revocation.bump_user(user.id)
+        self.activity_repo.create(db, user_id=user.id, action="logout")
 
     def get_current_user(
         self,
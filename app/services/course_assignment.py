@@ -4,7 +4,10 @@ from app.models.course_assignment import CourseAssignment
 from app.utils.file_utils import save_uploaded_file
 from fastapi import UploadFile
 from typing import Optional, Dict, Any
+from app.db.count_cache import list_total
+from app.models.course import Course
 from app.services.course_service import CourseService
+from app.utils.pagination import apply_keyset, cursor_for, keyset_result
 
 
 class CourseAssignmentService:
@@ -33,7 +36,9 @@ class CourseAssignmentService:
             page: int = 1,
             limit: int = 10,
             search: Optional[str] = None,
-            course_id: Optional[int] = None
+            course_id: Optional[int] = None,
+            cursor: Optional[str] = None,
+            include_total: bool = True
     ):
 
         query = self.db.query(CourseAssignment).filter(CourseAssignment.deleted_at.is_(None))
@@ -48,23 +53,57 @@ class CourseAssignmentService:
                 )
             )
 
-        total = query.count()
+        if cursor is not None:
+            # keyset mode: continue after the last id of the previous page, no COUNT(*)
+            items, next_cursor = keyset_result(
+                apply_keyset(query, CourseAssignment.id, cursor=cursor, limit=limit).all(), limit
+            )
+            return {
+                "limit": limit,
+                "cursor": cursor or None,
+                "next_cursor": next_cursor,
+                "items": self._with_courses(items)
+            }
+
+        # deleted_at IS NULL is part of every count, so only the request filters key the cache.
+        # No row estimate here: the table estimate would include soft-deleted rows.
+        total, estimated = list_total(
+            self.db, CourseAssignment.__tablename__, {"course_id": course_id, "search": search},
+            query.count, include_total
+        )
 
         items = (
             query.order_by(CourseAssignment.id.desc())
             .offset((page - 1) * limit)
-            .limit(limit)
+            .limit(limit + 1)
             .all()
         )
+        has_next = len(items) > limit
+        items = items[:limit]
+
+        return {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "total_estimated": estimated,
+            "total_pages": (total + limit - 1) // limit if total is not None else None,
+            "next_cursor": cursor_for(items[-1]) if has_next else None,
+            "items": self._with_courses(items)
+        }
+
+    def _with_courses(self, items):
+        # Attach course details per assignment, all courses of the page in one query
+        course_ids = {assignment.course_id for assignment in items}
+        courses = {
+            course.id: course
+            for course in self.db.query(Course)
+            .options(joinedload(Course.category), joinedload(Course.user))
+            .filter(Course.id.in_(course_ids))
+        } if course_ids else {}
 
-        # Attach course details per assignment
         response_items = []
         for assignment in items:
-            course_data = CourseService.get_singal_course(
-                db=self.db,
-                id=assignment.course_id,
-                request=None
-            )
+            course_data = CourseService._singal_course_detail(courses.get(assignment.course_id), request=None)
 
             response_items.append({
                 "id": assignment.id,
@@ -78,14 +117,7 @@ class CourseAssignmentService:
                 "updated_at": assignment.updated_at,
                 "course": course_data
             })
-
-        return {
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "total_pages": (total + limit - 1) // limit,
-            "items": response_items
-        }
+        return response_items
 
     # GET BY ID
     def get_assignment(self, assignment_id: int) -> Optional[CourseAssignment]:
@@ -7,6 +7,7 @@ from app.schemas.course_category import (
     CourseCategoryUpdate
 )
 from sqlalchemy import or_
+from app.db.count_cache import list_total
 
 # Create a new category
 def create_category(db: Session, payload: CourseCategoryCreate):
@@ -28,7 +29,7 @@ def get_category(db: Session, category_id: int) -> Optional[CourseCategory]:
 
 
 # Get categories with pagination
-def get_categories(db, skip: int = 0, limit: int = 10, search=None):
+def get_categories(db, skip: int = 0, limit: int = 10, search=None, include_total=True, estimate_total=False):
     # Build query
     query = db.query(CourseCategory)
     if search:
@@ -39,10 +40,13 @@ def get_categories(db, skip: int = 0, limit: int = 10, search=None):
             )
         )
 
-    total = query.count()
+    total, estimated = list_total(
+        db, CourseCategory.__tablename__, {"search": search}, query.count, include_total, estimate_total
+    )
     items = query.offset(skip).limit(limit).all()
     return {
         "total": total,
+        "total_estimated": estimated,
         "skip": skip,
         "limit": limit,
         "items": items,
@@ -1,3 +1,4 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, aliased
 from fastapi import APIRouter, Depends, UploadFile, File, Form
 from app.models.course_chapter import CourseChapter
@@ -7,78 +8,87 @@ from app.schemas.course_chapter import CourseChaptersCreate
 from datetime import datetime
 from fastapi import UploadFile, HTTPException
 import os
+import shutil
 import uuid
 from app.utils.pagination import paginate_query
 from math import ceil
-from app.utils.file_utils import save_uploaded_file
-
-from sqlalchemy import text
+from app.utils.file_utils import store_uploaded_file
+from app.repositories.course_chapter_repo import CourseChapterRepository
+from app.services.student_course_summary_service import (
+    adjust_course_totals,
+    get_course_completion,
+    get_enrolled_course_completion,
+    remove_content,
+)
+
+from sqlalchemy import func, select, text
 BASE_URL: str = "http://localhost:8000/"
+chapter_repo = CourseChapterRepository()
 
 
 
 def create_multiple_chapters(db: Session, data: CourseChaptersCreate, user_id: int):
-    new_chapters = []
-
-    for ch in data.chapters:
-        chapter = CourseChapter(
-            course_id=data.course_id,
-            user_id=user_id,
-            chapter_name=ch.title,
-            description=ch.description,
-            order=ch.order,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
-        new_chapters.append(chapter)
+    now = datetime.utcnow()
+    rows = [
+        {
+            "course_id": data.course_id,
+            "user_id": user_id,
+            "chapter_name": ch.title,
+            "description": ch.description,
+            "order": ch.order,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for ch in data.chapters
+    ]
 
-    db.add_all(new_chapters)
-    db.commit()
+    # one multi-row INSERT per chunk; the response is built from the rows, no reload
+    ids = chapter_repo.create_many(db, rows)
 
-    return new_chapters
+    return [{"id": id, **row} for id, row in zip(ids, rows)]
 
 
-def get_chapters_by_course_id(
-    db: Session,
+async def get_chapters_by_course_id(
+    db: AsyncSession,
     course_id: int,
     user_id: int,
     search: str = None,
     page: int = 1,
     limit: int = 10
     ):
-    query = db.query(CourseChapter).filter(CourseChapter.course_id == course_id)
+    stmt = select(CourseChapter).where(CourseChapter.course_id == course_id)
 
     if search:
-        query = query.filter(CourseChapter.chapter_name.ilike(f"%{search}%"))
+        stmt = stmt.where(CourseChapter.chapter_name.ilike(f"%{search}%"))
 
     if user_id :
-        query = query.filter(CourseChapter.user_id == user_id)
+        stmt = stmt.where(CourseChapter.user_id == user_id)
 
     offset = (page - 1) * limit
-    chapters = query.offset(offset).limit(limit).all()
+    chapters = (await db.execute(stmt.offset(offset).limit(limit))).scalars().all()
 
     return chapters
 
 
-def get_chapter_by_id(db: Session, chapter_id: int):
-    return db.query(CourseChapter).filter(CourseChapter.id == chapter_id).first()
+async def get_chapter_by_id(db: AsyncSession, chapter_id: int):
+    return await db.get(CourseChapter, chapter_id)
 
 
 UPLOAD_DIR = "uploads/chapter_contents"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-async def save_file(file: UploadFile) -> str:
+def save_file(file: UploadFile) -> str:
     ext = file.filename.split(".")[-1]
     filename = f"{uuid.uuid4()}.{ext}"
     filepath = os.path.join(UPLOAD_DIR, filename)
 
     with open(filepath, "wb") as f:
-        f.write(await file.read())
+        shutil.copyfileobj(file.file, f)
 
     return filepath
 
 
-async def create_chapter_content_service(
+def create_chapter_content_service(
     db: Session,
     chapter_id: int,
     user_id: int,
@@ -96,11 +106,20 @@ async def create_chapter_content_service(
     meta_data: str = None,
 ):
 
+    chapter = db.execute(
+        text("SELECT id, user_id FROM course_chapters WHERE id = :id"),
+        {"id": chapter_id}
+    ).fetchone()
+    if not chapter:
+        raise HTTPException(status_code=404, detail="Chapter not found")
+    if chapter.user_id != user_id:
+        raise HTTPException(status_code=403, detail="You are not authorized to add content to this chapter")
+
     content_path = None
 
     if content_file and content_file.filename:
         # file validation + save done inside utils
-        content_path = await save_uploaded_file(content_file, directory="uploads/chapter_contents")
+        content_path = store_uploaded_file(content_file, directory="uploads/chapter_contents")
 
     final_content_url = content_path if content_path else content_url
 
@@ -155,6 +174,7 @@ async def create_chapter_content_service(
         "is_free": is_free,
         "meta_data": meta_data,
     })
+    adjust_course_totals(db, chapter_id, +1)
 
     db.commit()
     return result.lastrowid
@@ -162,40 +182,42 @@ async def create_chapter_content_service(
 
 # Get chapter content by the chapter id
 
-def get_chapter_content_by_chapter_id(db: Session, chapter_id: int, user_id: int):
-
-    query = text("""
-        SELECT 
-            cc.id,
-            cc.chapter_id,
-            cc.user_id,
-            cc.title,
-            cc.slug,
-            cc.description,
-            cc.content_type,
-            cc.content_url,
-            cc.content,
-            cc.position,
-            cc.is_published,
-            cc.is_free,
-            cc.meta_data,
-            cc.video_duration,
-
-            scp.complete_per,
-            scp.is_completed,
-            scp.student_id,
-            scp.last_accessed
-
-        FROM chapter_contents AS cc
-        LEFT JOIN student_course_content_progress AS scp
-            ON scp.content_id = cc.id AND scp.student_id = :student_id
-
-        WHERE cc.chapter_id = :chapter_id
-        ORDER BY cc.position ASC
-    """)
-
-    result = db.execute(
-        query,
+# Contents of one chapter with the student's progress on each
+CHAPTER_CONTENT_WITH_PROGRESS = text("""
+    SELECT 
+        cc.id,
+        cc.chapter_id,
+        cc.user_id,
+        cc.title,
+        cc.slug,
+        cc.description,
+        cc.content_type,
+        cc.content_url,
+        cc.content,
+        cc.position,
+        cc.is_published,
+        cc.is_free,
+        cc.meta_data,
+        cc.video_duration,
+
+        scp.complete_per,
+        scp.is_completed,
+        scp.student_id,
+        scp.last_accessed
+
+    FROM chapter_contents AS cc
+    LEFT JOIN student_course_content_progress AS scp
+        ON scp.content_id = cc.id AND scp.student_id = :student_id
+
+    WHERE cc.chapter_id = :chapter_id
+    ORDER BY cc.position ASC
+""")
+
+
+async def get_chapter_content_by_chapter_id(db: AsyncSession, chapter_id: int, user_id: int):
+
+    result = await db.execute(
+        CHAPTER_CONTENT_WITH_PROGRESS,
         {
             "chapter_id": chapter_id,
             "student_id": user_id
@@ -220,7 +242,7 @@ def get_chapter_content_by_chapter_id(db: Session, chapter_id: int, user_id: int
 
 
 # Update Chapter Content
-async def update_chapter_content_service(
+def update_chapter_content_service(
     db: Session,
     id: int,
     user_id: int,
@@ -237,17 +259,25 @@ async def update_chapter_content_service(
     is_free: bool = False,
     meta_data: str = None,
 ):
+    existing = db.execute(
+        text("SELECT id, user_id FROM chapter_contents WHERE id = :id"),
+        {"id": id}
+    ).fetchone()
+    if not existing:
+        raise HTTPException(status_code=404, detail="Chapter content not found")
+    if existing.user_id != user_id:
+        raise HTTPException(status_code=403, detail="You are not authorized to update this content")
+
     # Handle file upload (optional)
     content_path = None
     if content_file and hasattr(content_file, "filename") and content_file.filename:
-        content_path = await save_file(content_file)
+        content_path = save_file(content_file)
 
     final_content_url = content_path if content_path else content_url
 
     query = text("""
         UPDATE chapter_contents
         SET
-            user_id = :user_id,
             title = :title,
             slug = :slug,
             description = :description,
@@ -265,7 +295,6 @@ async def update_chapter_content_service(
 
     db.execute(query, {
         "id": id,
-        "user_id": user_id,
         "title": title,
         "slug": slug,
         "description": description,
@@ -284,19 +313,22 @@ async def update_chapter_content_service(
 
 
 # Delete Chapter Content
-async def delete_chapter_content_service(db: Session, content_id: int):
+def delete_chapter_content_service(db: Session, content_id: int, user_id: int):
     query = db.execute(
-        text("SELECT id FROM chapter_contents WHERE id = :id"),
+        text("SELECT id, chapter_id, user_id FROM chapter_contents WHERE id = :id"),
         {"id": content_id}
     ).fetchone()
 
     if not query:
         return False
+    if query.user_id != user_id:
+        raise HTTPException(status_code=403, detail="You are not authorized to delete this content")
 
     db.execute(
         text("DELETE FROM chapter_contents WHERE id = :id"),
         {"id": content_id}
     )
+    remove_content(db, query.chapter_id, content_id)
     db.commit()
     return True
 
@@ -312,8 +344,8 @@ async def delete_chapter_content_service(db: Session, content_id: int):
 #
 #     return paginate_query(query, page, limit)
 #################################################################################
-def get_student_chapters_by_course_id(
-    db: Session,
+async def get_student_chapters_by_course_id(
+    db: AsyncSession,
     course_id: int,
     student_id: int,
     search: str,
@@ -321,30 +353,29 @@ def get_student_chapters_by_course_id(
     limit: int
 ):
     # Query only CourseChapter table
-    query = (
-        db.query(CourseChapter)
-        .filter(CourseChapter.course_id == course_id)
-    )
+    stmt = select(CourseChapter).where(CourseChapter.course_id == course_id)
 
     if search:
-        query = query.filter(CourseChapter.chapter_name.ilike(f"%{search}%"))
+        stmt = stmt.where(CourseChapter.chapter_name.ilike(f"%{search}%"))
 
     # Pagination
     offset = (page - 1) * limit
-    results = query.offset(offset).limit(limit).all()
-    total_items = query.count()
+    results = (await db.execute(stmt.offset(offset).limit(limit))).scalars().all()
+    total_items = (
+        await db.execute(select(func.count()).select_from(stmt.order_by(None).subquery()))
+    ).scalar_one()
     total_pages = ceil(total_items / limit) if total_items else 1
 
+    # Progress for the whole page in one query instead of one per chapter
+    progress_by_id = await get_progress_by_content_ids(db, [chapter.id for chapter in results], student_id)
+
     chapters = []
 
     for chapter in results:
         chapter_data = chapter.__dict__.copy()
         #chapter_data.pop("_sa_instance_state", None)
 
-        # Fetch progress separately for each chapter
-        progress = get_progress_by_content_id(db, chapter.id, student_id)
-
-        chapter_data["progress"] = progress
+        chapter_data["progress"] = progress_by_id.get(chapter.id)
 
         chapters.append(chapter_data)
 
@@ -357,22 +388,30 @@ def get_student_chapters_by_course_id(
 
 
 
-def get_progress_by_content_id(db: Session, content_id: int, student_id: int):
-    progress = (
-        db.query(StudentCourseProgress)
-        .filter(
-            StudentCourseProgress.content_id == content_id,
-            StudentCourseProgress.student_id == student_id
-        )
-        .first()
-    )
-
-    if not progress:
-        return None
+async def get_progress_by_content_ids(db: AsyncSession, content_ids: list[int], student_id: int) -> dict:
+    """First progress row per content id for one student, keyed by content id."""
+    if not content_ids:
+        return {}
 
-    data = progress.__dict__.copy()
-    data.pop("_sa_instance_state", None)
-    return data
+    rows = (
+        await db.execute(
+            select(StudentCourseProgress)
+            .where(
+                StudentCourseProgress.content_id.in_(content_ids),
+                StudentCourseProgress.student_id == student_id
+            )
+            .order_by(StudentCourseProgress.id)
+        )
+    ).scalars().all()
+
+    progress = {}
+    for row in rows:
+        if row.content_id in progress:
+            continue
+        data = row.__dict__.copy()
+        data.pop("_sa_instance_state", None)
+        progress[row.content_id] = data
+    return progress
 ####################################################################################
 # def get_student_chapters_by_course_id(
 #     db: Session,
@@ -473,42 +512,12 @@ def update_chapter_service(db: Session, chapter_id: int, chapter_name: str, desc
     return chapter
 
 ##Get Student course chapter and completed course chapter
-def get_course_content_completed_percentage_service(db: Session, course_id: int, student_id: int):
-
-    # 1. Get all chapter IDs in the course
-    chapter_ids = (
-        db.query(CourseChapter.id)
-        .filter(CourseChapter.course_id == course_id)
-        .all()
-    )
-    chapter_ids = [c.id for c in chapter_ids]
-
-    if not chapter_ids:
-        return {
-            "total_contents": 0,
-            "completed_contents": 0,
-            "completion_percentage": 0.0
-        }
+async def get_course_content_completed_percentage_service(db: AsyncSession, course_id: int, student_id: int):
 
-    # 2. Count total contents in these chapters
-    total_contents = (
-        db.query(ChapterContent)
-        .filter(ChapterContent.chapter_id.in_(chapter_ids))
-        .count()
-    )
-
-    # 3. Count completed contents from progress table
-    completed_contents = (
-        db.query(StudentCourseProgress)
-        .filter(
-    StudentCourseProgress.student_id == student_id,
-            StudentCourseProgress.is_completed == True,
-            StudentCourseProgress.course_id == course_id
-        )
-        .count()
-    )
+    # 1. Totals from the student_course_summary rollup
+    total_contents, completed_contents = await get_course_completion(db, course_id, student_id)
 
-    # 4. Calculate percentage
+    # 2. Calculate percentage
     percentage = 0.0
     if total_contents > 0:
         percentage = round((completed_contents / total_contents) * 100, 2)
@@ -542,51 +551,31 @@ def update_chapter_service(db: Session, chapter_id: int, chapter_name: str, desc
 
 # Get Student course chapter and completed course chapter by student id
 # It is created for the student dasahboard
-def get_student_course_content_completed_percentage_service(db: Session, student_id: int):
-
-    # 1. Get all chapter IDs in the course
-    chapter_ids = (
-        db.query(CourseChapter.id)
-       .all()
-    )
-    chapter_ids = [c.id for c in chapter_ids]
+async def get_student_course_content_completed_percentage_service(db: AsyncSession, student_id: int):
 
-    if not chapter_ids:
-        return {
-            "total_contents": 0,
-            "completed_contents": 0,
-            "completion_percentage": 0.0
-        }
-
-    # 2. Count total contents in these chapters
-    total_contents = (
-        db.query(ChapterContent)
-        .filter(ChapterContent.chapter_id.in_(chapter_ids))
-        .count()
-    )
+    # 1. Per-course totals of the courses the student is enrolled in (batch assignments)
+    courses = await get_enrolled_course_completion(db, student_id)
 
-    # 3. Count completed contents from progress table
-    completed_contents = (
-        db.query(StudentCourseProgress)
-        .filter(
-    StudentCourseProgress.student_id == student_id,
-            StudentCourseProgress.is_completed == True,
-
-        )
-        .count()
-    )
+    # 2. Calculate percentage per course and over all enrolled courses
+    for course in courses:
+        course["completion_percentage"] = _percentage(course["completed_contents"], course["total_contents"])
 
-    # 4. Calculate percentage
-    percentage = 0.0
-    if total_contents > 0:
-        percentage = round((completed_contents / total_contents) * 100, 2)
+    total_contents = sum(course["total_contents"] for course in courses)
+    completed_contents = sum(course["completed_contents"] for course in courses)
 
     return {
         "total_contents": total_contents,
         "completed_contents": completed_contents,
-        "completion_percentage": percentage
+        "completion_percentage": _percentage(completed_contents, total_contents),
+        "courses": courses,
     }
 
+
+def _percentage(completed: int, total: int) -> float:
+    if total > 0:
+        return round((completed / total) * 100, 2)
+    return 0.0
+
 #Get chapter content detail by the chapter id
-def get_chapter_content_by_id(db: Session, content_id: int):
-    return db.query(ChapterContent).filter(ChapterContent.id == content_id).first()
+async def get_chapter_content_by_id(db: AsyncSession, content_id: int):
+    return await db.get(ChapterContent, content_id)
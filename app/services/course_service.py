@@ -1,11 +1,15 @@
 import os
 import shutil
 from fastapi import UploadFile, HTTPException, Request
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 from app.models.course import Course
 import uuid
 from app.schemas.course import CourseCreate
 from app.core.config import settings
+from app.db.count_cache import list_total_async
+from app.utils.pagination import InvalidCursor, apply_keyset, cursor_for, keyset_order, keyset_result
 
 
 class CourseService:
@@ -77,120 +81,155 @@ class CourseService:
 
 
     @staticmethod
-    def list_courses(db: Session, user_id: int, title=None, course_type=None, course_mode=None, category_id=None,
-                     skip=0, limit=10):
-        query = db.query(Course).options(
+    def _filtered_courses(title=None, course_type=None, course_mode=None, category_id=None):
+        stmt = select(Course).options(
             joinedload(Course.category),
             joinedload(Course.user)
         )
-        query = query.filter(Course.user_id == user_id)
 
         if title:
-            query = query.filter(Course.title.ilike(f"%{title}%"))
+            stmt = stmt.where(Course.title.ilike(f"%{title}%"))
         if course_type:
-            query = query.filter(Course.course_type == course_type)
+            stmt = stmt.where(Course.course_type == course_type)
         if course_mode:
-            query = query.filter(Course.course_mode == course_mode)
+            stmt = stmt.where(Course.course_mode == course_mode)
         if category_id:
-            query = query.filter(Course.category_id == category_id)
-        query = query.order_by(Course.created_at.desc())
-        total = query.count()
-        courses = query.offset(skip).limit(limit).all()
+            stmt = stmt.where(Course.category_id == category_id)
+        return stmt
 
-        items = []
-        for c in courses:
-            items.append({
-                "id": c.id,
-                "title": c.title,
-                "description": c.description,
-                "subtitle": c.subtitle,
-                "language": c.language,
-                "level": c.level,
-                "course_type": c.course_type,
-                "course_mode": c.course_mode,
-                "course_price": str(c.course_price) if c.course_price else None,
-                "category_id": c.category_id,
-                "category_name": c.category.name if c.category else None,
-                "user": {
-                    "id": c.user.id,
-                    "name": c.user.name,
-                    "email": c.user.email,
-                } if c.user else None,
-                "created_at": c.created_at,
-                "updated_at": c.updated_at
-            })
+    @staticmethod
+    async def _page(db: AsyncSession, stmt, skip: int, limit: int, filters: dict,
+                    include_total: bool = True, estimate_total: bool = False):
+        async def count():
+            # count on the filtered ids only, without the eager loads
+            count_stmt = select(func.count()).select_from(
+                stmt.with_only_columns(Course.id).order_by(None).subquery()
+            )
+            return (await db.execute(count_stmt)).scalar_one()
+
+        total, estimated = await list_total_async(
+            db, Course.__tablename__, filters, count, include_total, estimate_total
+        )
+        # one extra row tells whether there is a next page without the total
+        rows = (await db.execute(stmt.offset(skip).limit(limit + 1))).scalars().all()
+        return total, estimated, rows[:limit], len(rows) > limit
+
+    @staticmethod
+    async def _keyset_page(db: AsyncSession, stmt, cursor: str, limit: int, sort_col=None):
+        try:
+            stmt = apply_keyset(stmt, Course.id, sort_col, cursor, limit)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        rows = (await db.execute(stmt)).scalars().all()
+        return keyset_result(rows, limit, sort_attr=sort_col.key if sort_col is not None else None)
+
+    @staticmethod
+    def _list_item(c: Course) -> dict:
+        return {
+            "id": c.id,
+            "title": c.title,
+            "description": c.description,
+            "subtitle": c.subtitle,
+            "language": c.language,
+            "level": c.level,
+            "course_type": c.course_type,
+            "course_mode": c.course_mode,
+            "course_price": str(c.course_price) if c.course_price else None,
+            "category_id": c.category_id,
+            "category_name": c.category.name if c.category else None,
+            "user": {
+                "id": c.user.id,
+                "name": c.user.name,
+                "email": c.user.email,
+            } if c.user else None,
+            "created_at": c.created_at,
+            "updated_at": c.updated_at
+        }
 
+    @staticmethod
+    async def list_courses(db: AsyncSession, user_id: int, title=None, course_type=None, course_mode=None,
+                           category_id=None, skip=0, limit=10, cursor=None, include_total=True,
+                           estimate_total=False):
+        stmt = CourseService._filtered_courses(title, course_type, course_mode, category_id)
+        stmt = keyset_order(stmt.where(Course.user_id == user_id), Course.id, Course.created_at)
+
+        if cursor is not None:
+            courses, next_cursor = await CourseService._keyset_page(db, stmt, cursor, limit, Course.created_at)
+            return {
+                "cursor": cursor or None,
+                "next_cursor": next_cursor,
+                "limit": limit,
+                "items": [CourseService._list_item(c) for c in courses]
+            }
+
+        filters = {"user_id": user_id, "title": title, "course_type": course_type,
+                   "course_mode": course_mode, "category_id": category_id}
+        total, estimated, courses, has_next = await CourseService._page(
+            db, stmt, skip, limit, filters, include_total, estimate_total
+        )
         return {
             "total": total,
+            "total_estimated": estimated,
             "skip": skip,
             "limit": limit,
-            "items": items
+            "next_cursor": cursor_for(courses[-1], sort_attr="created_at") if has_next else None,
+            "items": [CourseService._list_item(c) for c in courses]
         }
 
     @staticmethod
-    def adminCourseList(db: Session, user_id: int, title=None, course_type=None, course_mode=None, category_id=None,
-                     skip=0, limit=10):
-        query = db.query(Course).options(
-            joinedload(Course.category),
-            joinedload(Course.user)
+    async def adminCourseList(db: AsyncSession, user_id: int, title=None, course_type=None, course_mode=None,
+                              category_id=None, skip=0, limit=10, cursor=None, include_total=True,
+                              estimate_total=False):
+        # newest first by primary key: no secondary index needed without a user filter
+        stmt = keyset_order(CourseService._filtered_courses(title, course_type, course_mode, category_id), Course.id)
+
+        if cursor is not None:
+            courses, next_cursor = await CourseService._keyset_page(db, stmt, cursor, limit)
+            return {
+                "cursor": cursor or None,
+                "next_cursor": next_cursor,
+                "limit": limit,
+                "items": [CourseService._list_item(c) for c in courses]
+            }
+
+        filters = {"title": title, "course_type": course_type, "course_mode": course_mode,
+                   "category_id": category_id}
+        total, estimated, courses, has_next = await CourseService._page(
+            db, stmt, skip, limit, filters, include_total, estimate_total
         )
-        #query = query.filter(Course.user_id == user_id)
-
-        if title:
-            query = query.filter(Course.title.ilike(f"%{title}%"))
-        if course_type:
-            query = query.filter(Course.course_type == course_type)
-        if course_mode:
-            query = query.filter(Course.course_mode == course_mode)
-        if category_id:
-            query = query.filter(Course.category_id == category_id)
-
-        total = query.count()
-        courses = query.offset(skip).limit(limit).all()
-
-        items = []
-        for c in courses:
-            items.append({
-                "id": c.id,
-                "title": c.title,
-                "description": c.description,
-                "subtitle": c.subtitle,
-                "language": c.language,
-                "level": c.level,
-                "course_type": c.course_type,
-                "course_mode": c.course_mode,
-                "course_price": str(c.course_price) if c.course_price else None,
-                "category_id": c.category_id,
-                "category_name": c.category.name if c.category else None,
-                "user": {
-                    "id": c.user.id,
-                    "name": c.user.name,
-                    "email": c.user.email,
-                } if c.user else None,
-                "created_at": c.created_at,
-                "updated_at": c.updated_at
-            })
 
         return {
             "total": total,
+            "total_estimated": estimated,
             "skip": skip,
             "limit": limit,
-            "items": items
+            "next_cursor": cursor_for(courses[-1]) if has_next else None,
+            "items": [CourseService._list_item(c) for c in courses]
         }
 
     @staticmethod
-    def get_course(db: Session, course_id: int, user_id: int):
+    async def get_course(db: AsyncSession, course_id: int, user_id: int):
         course = (
-            db.query(Course)
-            .options(joinedload(Course.category))  # eager load category
-            .filter(Course.id == course_id, Course.user_id == user_id)
-            .first()
-        )
+            await db.execute(
+                select(Course)
+                .options(joinedload(Course.category))  # eager load category
+                .where(Course.id == course_id, Course.user_id == user_id)
+            )
+        ).scalars().first()
         if not course:
             raise HTTPException(status_code=404, detail="Course not found")
 
         return course
 
+    @staticmethod
+    async def list_all(db: AsyncSession, user_id: int = None):
+        stmt = select(Course.id, Course.title)
+        if user_id is not None:
+            stmt = stmt.where(Course.user_id == user_id)
+        else:
+            stmt = stmt.order_by(Course.title.asc())
+        return (await db.execute(stmt)).all()
+
     @staticmethod
     def update_course(db: Session, course_id: int, user_id: int, course_data: dict):
         course = db.query(Course).filter(Course.id == course_id, Course.user_id == user_id).first()
@@ -217,19 +256,19 @@ class CourseService:
 
 
     @staticmethod
-    def get_latest_courses_by_category(db: Session, category_id: int, limit: int = 3):
-        query = (
-            db.query(Course)
+    async def get_latest_courses_by_category(db: AsyncSession, category_id: int, limit: int = 3):
+        stmt = (
+            select(Course)
             .options(
                 joinedload(Course.category),
                 joinedload(Course.user)
             )
-            .filter(Course.category_id == category_id)
+            .where(Course.category_id == category_id)
             .order_by(Course.created_at.desc())
             .limit(limit)
         )
 
-        courses = query.all()
+        courses = (await db.execute(stmt)).scalars().all()
         items = []
         for c in courses:
             items.append({
@@ -269,7 +308,24 @@ class CourseService:
             .filter(Course.id == id)
             .first()
         )
+        return CourseService._singal_course_detail(course, request)
+
+    @staticmethod
+    async def get_singal_course_async(db: AsyncSession, id: int, request: Request = None):
+        course = (
+            await db.execute(
+                select(Course)
+                .options(
+                    joinedload(Course.category),
+                    joinedload(Course.user)
+                )
+                .where(Course.id == id)
+            )
+        ).scalars().first()
+        return CourseService._singal_course_detail(course, request)
 
+    @staticmethod
+    def _singal_course_detail(course: Course, request: Request = None):
         if not course:
             raise HTTPException(status_code=404, detail="Course not found")
         BASE_URL = settings.BASE_URL.rstrip()
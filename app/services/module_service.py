@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from app.models.models import Module
 from app.schemas.module import ModuleCreate, ModuleUpdate
+from app.core.permission_matrix import permission_matrix
 
 
 class ModuleService:
@@ -41,6 +42,8 @@ class ModuleService:
 
         db.commit()
         db.refresh(module)
+        # the matrix is keyed by module name
+        permission_matrix.invalidate()
         return module
 
     @staticmethod
@@ -51,4 +54,5 @@ class ModuleService:
 
         db.delete(module)
         db.commit()
+        permission_matrix.invalidate()
         return True
@@ -2,6 +2,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from app.models.models import Role
 from app.schemas.role import RoleCreate, RoleUpdate
+from app.core.principal_cache import principal_cache
+from app.core.permission_matrix import permission_matrix
 
 class RoleService:
     def create(self, db: Session, payload: RoleCreate) -> Role:
@@ -28,6 +30,9 @@ class RoleService:
         if role:
             db.delete(role)
             db.commit()
+            # cached principals may still carry the deleted role id
+            principal_cache.clear()
+            permission_matrix.discard_role(role_id)
             return True
         return False
 
@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from typing import List
-from app.helper.dependencies import check_permission, get_current_user
 from app.models.student_batch_assignments import StudentBatchAssignment
 from app.models.student_batches import StudentBatch
 from app.models.student import Student
+from app.repositories.student_batch_assignment_repo import StudentBatchAssignmentRepository
+
+batch_assignment_repo = StudentBatchAssignmentRepository()
 
 
 def assign_students_to_batch_service(db: Session, batch_id: int, student_ids: List[int]):
@@ -14,26 +16,14 @@ def assign_students_to_batch_service(db: Session, batch_id: int, student_ids: Li
         raise HTTPException(status_code=404, detail="Batch not found")
 
     # Check valid students
-    students = db.query(Student).filter(Student.id.in_(student_ids)).all()
+    students = db.query(Student.id).filter(Student.id.in_(student_ids)).all()
     if not students:
         raise HTTPException(status_code=404, detail="No valid students found")
 
-    assigned_count = 0
-
-    for student in students:
-        exists = (
-            db.query(StudentBatchAssignment)
-            .filter(
-                StudentBatchAssignment.student_id == student.id,
-                StudentBatchAssignment.batch_id == batch_id,
-            )
-            .first()
-        )
-        if not exists:
-            db.add(StudentBatchAssignment(student_id=student.id, batch_id=batch_id))
-            assigned_count += 1
-
-    db.commit()
+    # uq_student_batch skips the students already in the batch
+    assigned_count = batch_assignment_repo.insert_ignore_many(
+        db, [{"student_id": student.id, "batch_id": batch_id} for student in students]
+    )
 
     return {
         "success": True,
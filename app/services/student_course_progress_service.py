@@ -1,6 +1,68 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from sqlalchemy import DECIMAL, case, cast, func, or_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.orm import Session
 from app.models.student_course_progress import StudentCourseProgress
+from app.services.student_course_summary_service import apply_summary_deltas, lock_progress, summary_deltas
+
+# content counts as completed from this percentage on
+COMPLETION_THRESHOLD = 90
+
+
+def parse_percentage(complete_per) -> float:
+    try:
+        value = float(complete_per)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid percentage: {complete_per!r}")
+    if not 0 <= value <= 100:
+        raise ValueError("percentage must be between 0 and 100")
+    return value
+
+
+def progress_upsert(rows: list[dict]):
+    """
+    One INSERT ... ON DUPLICATE KEY UPDATE on uq_progress_student_content for
+    any number of progress rows. A row that already exists keeps the highest
+    complete_per, stays completed once completed and keeps the newest access time.
+    """
+    table = StudentCourseProgress.__table__
+    stmt = mysql_insert(table).values(rows)
+    new_per = cast(stmt.inserted.complete_per, DECIMAL(6, 2))
+    old_per = cast(table.c.complete_per, DECIMAL(6, 2))
+    # MySQL applies the assignments left to right, and later ones see the
+    # updated columns: everything that reads complete_per goes before it
+    return stmt.on_duplicate_key_update([
+        ("is_completed", or_(table.c.is_completed == True, new_per >= COMPLETION_THRESHOLD)),
+        # replayed offline events must not move last_accessed backwards
+        ("last_accessed", func.greatest(func.coalesce(table.c.last_accessed, stmt.inserted.last_accessed),
+                                        stmt.inserted.last_accessed)),
+        ("updated_at", stmt.inserted.updated_at),
+        ("complete_per", case((new_per > old_per, stmt.inserted.complete_per), else_=table.c.complete_per)),
+    ])
+
+
+def write_progress(conn, rows: list[dict]) -> None:
+    """Upsert progress rows and add their new completions to the course rollup, in conn's transaction."""
+    before = lock_progress(conn, rows)
+    conn.execute(progress_upsert(rows))
+    apply_summary_deltas(conn, summary_deltas(rows, before))
+
+
+def progress_row(student_id: int, course_id: int, chapter_id: int, content_id: int, complete_per,
+                 accessed_at: datetime | None = None) -> dict:
+    accessed_at = accessed_at or datetime.utcnow()
+    return {
+        "student_id": student_id,
+        "course_id": course_id,
+        "chapter_id": chapter_id,
+        "content_id": content_id,
+        "complete_per": str(complete_per).strip(),
+        "is_completed": parse_percentage(complete_per) >= COMPLETION_THRESHOLD,
+        "last_accessed": accessed_at,
+        "created_at": accessed_at,
+        "updated_at": accessed_at,
+    }
+
 
 def mark_content_read(
     db: Session,
@@ -10,34 +72,68 @@ def mark_content_read(
     content_id: int,
     complete_per: str
 ):
-    # Check if already exists
-    existing = (
-        db.query(StudentCourseProgress)
-        .filter(
-            StudentCourseProgress.student_id == student_id,
-            StudentCourseProgress.course_id == course_id,
-            StudentCourseProgress.chapter_id == chapter_id,
-            StudentCourseProgress.content_id == content_id,
-        )
-        .first()
-    )
-
-    if existing:
-        existing.complete_per = complete_per
-        existing.is_completed = 1 if float(complete_per) >= 90 else 0
-        existing.last_accessed = datetime.utcnow()
-    else:
-        new_entry = StudentCourseProgress(
-            student_id=student_id,
-            course_id=course_id,
-            chapter_id=chapter_id,
-            content_id=content_id,
-            complete_per=complete_per,
-            is_completed=1,
-            last_accessed=datetime.utcnow(),
-        )
-        db.add(new_entry)
-
+    # single statement: concurrent heartbeats from two tabs cannot create a second row
+    write_progress(db, [progress_row(student_id, course_id, chapter_id, content_id, complete_per)])
     db.commit()
-    db.flush()
     return {"status": True, "message": "Progress saved successfully"}
+
+
+def _utc_naive(ts: datetime) -> datetime:
+    """Client timestamps may carry an offset; the table stores naive UTC."""
+    return ts.astimezone(timezone.utc).replace(tzinfo=None) if ts.tzinfo else ts
+
+
+def mark_content_read_batch(db: Session, student_id: int, events: list) -> dict:
+    """
+    Apply replayed progress events in one transaction with one multi-row upsert.
+    Events are ordered by client_ts and folded into one row per content (highest
+    percentage, latest access). Status per event, in request order:
+    "applied" (the event the row was built from), "merged" (folded into that row),
+    "duplicate" (same content, timestamp and percentage as an earlier event) or "invalid".
+    """
+    now = datetime.utcnow()
+    results = [None] * len(events)
+    rows: dict[int, dict] = {}
+    source: dict[int, int] = {}  # content_id -> index of the event the row was built from
+    seen = set()
+
+    for index, event in sorted(enumerate(events), key=lambda item: _utc_naive(item[1].client_ts)):
+        # client clocks run ahead too; never store an access time in the future
+        accessed_at = min(_utc_naive(event.client_ts), now)
+        try:
+            row = progress_row(student_id, event.course_id, event.chapter_id, event.content_id,
+                               event.percentage, accessed_at)
+        except ValueError as e:
+            results[index] = {"index": index, "content_id": event.content_id, "status": "invalid", "message": str(e)}
+            continue
+
+        fingerprint = (event.content_id, accessed_at, float(row["complete_per"]))
+        if fingerprint in seen:
+            results[index] = {"index": index, "content_id": event.content_id, "status": "duplicate"}
+            continue
+        seen.add(fingerprint)
+
+        current = rows.get(event.content_id)
+        if current is None or float(row["complete_per"]) > float(current["complete_per"]):
+            if current is not None:
+                results[source[event.content_id]]["status"] = "merged"
+                row["is_completed"] = row["is_completed"] or current["is_completed"]
+                row["created_at"] = current["created_at"]
+            rows[event.content_id] = row
+            source[event.content_id] = index
+            results[index] = {"index": index, "content_id": event.content_id, "status": "applied"}
+        else:
+            # a lower or equal percentage only moves the access time forward
+            current["last_accessed"] = current["updated_at"] = accessed_at
+            results[index] = {"index": index, "content_id": event.content_id, "status": "merged"}
+
+    if rows:
+        write_progress(db, list(rows.values()))
+        db.commit()
+
+    return {
+        "status": True,
+        "message": "Progress saved successfully",
+        "applied": len(rows),
+        "events": results,
+    }
@@ -0,0 +1,250 @@
+from datetime import datetime
+from sqlalchemy import and_, func, select, text, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.chapter_content import ChapterContent
+from app.models.course import Course
+from app.models.course_chapter import CourseChapter
+from app.models.student_batch_assignments import StudentBatchAssignment
+from app.models.student_batches import StudentBatch
+from app.models.student_course_progress import StudentCourseProgress
+from app.models.student_course_summary import StudentCourseSummary
+
+# Full recompute of the summary rows of a range of students from the progress
+# table, only used by rebuild_summaries(); progress writes update the rollup
+# incrementally (apply_summary_deltas()).
+REBUILD_SUMMARIES = text("""
+    INSERT INTO student_course_summary
+        (student_id, course_id, total_contents, completed_contents, last_accessed, updated_at)
+    SELECT
+        p.student_id,
+        p.course_id,
+        (
+            SELECT COUNT(cc.id)
+            FROM chapter_contents cc
+            JOIN course_chapters ch ON ch.id = cc.chapter_id
+            WHERE ch.course_id = p.course_id
+        ) AS total_contents,
+        -- progress left behind by a deleted content does not count
+        COALESCE(SUM(p.is_completed = 1 AND cc.id IS NOT NULL), 0) AS completed_contents,
+        MAX(p.last_accessed) AS last_accessed,
+        UTC_TIMESTAMP() AS updated_at
+    FROM student_course_content_progress p
+    LEFT JOIN chapter_contents cc ON cc.id = p.content_id
+    WHERE p.student_id BETWEEN :first_student AND :last_student
+    GROUP BY p.student_id, p.course_id
+    ON DUPLICATE KEY UPDATE
+        total_contents = VALUES(total_contents),
+        completed_contents = VALUES(completed_contents),
+        last_accessed = VALUES(last_accessed),
+        updated_at = VALUES(updated_at)
+""")
+
+ADJUST_COURSE_TOTALS = text("""
+    UPDATE student_course_summary s
+    JOIN course_chapters ch ON ch.course_id = s.course_id
+    SET s.total_contents = GREATEST(s.total_contents + :delta, 0)
+    WHERE ch.id = :chapter_id
+""")
+
+# A deleted content's completions leave the summaries of the students who had them
+UNCOUNT_CONTENT_COMPLETIONS = text("""
+    UPDATE student_course_summary s
+    JOIN student_course_content_progress p
+      ON p.student_id = s.student_id AND p.course_id = s.course_id
+    SET s.completed_contents = GREATEST(s.completed_contents - 1, 0)
+    WHERE p.content_id = :content_id AND p.is_completed = 1
+""")
+
+DELETE_CONTENT_PROGRESS = text("DELETE FROM student_course_content_progress WHERE content_id = :content_id")
+
+
+def lock_progress(conn, rows: list[dict]) -> dict:
+    """
+    Lock the existing progress rows of `rows` before they are upserted and return
+    {(student_id, content_id): (course_id, is_completed)}, their state before the write.
+    """
+    keys = sorted({(row["student_id"], row["content_id"]) for row in rows})
+    result = conn.execute(
+        select(
+            StudentCourseProgress.student_id,
+            StudentCourseProgress.content_id,
+            StudentCourseProgress.course_id,
+            StudentCourseProgress.is_completed,
+        )
+        .where(tuple_(StudentCourseProgress.student_id, StudentCourseProgress.content_id).in_(keys))
+        .with_for_update()
+    )
+    return {(r.student_id, r.content_id): (r.course_id, bool(r.is_completed)) for r in result}
+
+
+def summary_deltas(rows: list[dict], before: dict) -> dict:
+    """
+    {(student_id, course_id): [newly completed contents, newest last_accessed]}
+    for upserted `rows`, given their state before the write (lock_progress()).
+    Completion is sticky, so only a row that was not completed before counts.
+    """
+    deltas = {}
+    counted = set()
+    for row in rows:
+        key = (row["student_id"], row["content_id"])
+        # the upsert keeps the course_id of an existing row
+        course_id, was_completed = before.get(key, (row["course_id"], False))
+        entry = deltas.setdefault((row["student_id"], course_id), [0, None])
+        if row["is_completed"] and not was_completed and key not in counted:
+            counted.add(key)
+            entry[0] += 1
+        if entry[1] is None or row["last_accessed"] > entry[1]:
+            entry[1] = row["last_accessed"]
+    return deltas
+
+
+def _course_totals(conn, course_ids) -> dict:
+    result = conn.execute(
+        select(CourseChapter.course_id, func.count(ChapterContent.id))
+        .join(ChapterContent, ChapterContent.chapter_id == CourseChapter.id)
+        .where(CourseChapter.course_id.in_(sorted(course_ids)))
+        .group_by(CourseChapter.course_id)
+    )
+    return dict(result.all())
+
+
+def apply_summary_deltas(conn, deltas: dict) -> None:
+    """
+    Add summary_deltas() to the rollup in the progress write's transaction.
+    total_contents is counted only when a (student, course) gets its first
+    summary row; after that adjust_course_totals() maintains it.
+    """
+    if not deltas:
+        return
+    pairs = sorted(deltas)
+    existing = set(
+        conn.execute(
+            select(StudentCourseSummary.student_id, StudentCourseSummary.course_id)
+            .where(tuple_(StudentCourseSummary.student_id, StudentCourseSummary.course_id).in_(pairs))
+        ).all()
+    )
+    missing_courses = {course_id for student_id, course_id in pairs if (student_id, course_id) not in existing}
+    totals = _course_totals(conn, missing_courses) if missing_courses else {}
+
+    now = datetime.utcnow()
+    table = StudentCourseSummary.__table__
+    stmt = mysql_insert(table).values([
+        {
+            "student_id": student_id,
+            "course_id": course_id,
+            "total_contents": totals.get(course_id, 0),
+            "completed_contents": deltas[(student_id, course_id)][0],
+            "last_accessed": deltas[(student_id, course_id)][1],
+            "updated_at": now,
+        }
+        for student_id, course_id in pairs
+    ])
+    # a row created since the check above keeps its total, the completions add up
+    conn.execute(stmt.on_duplicate_key_update([
+        ("completed_contents", table.c.completed_contents + stmt.inserted.completed_contents),
+        ("last_accessed", func.greatest(func.coalesce(table.c.last_accessed, stmt.inserted.last_accessed),
+                                        stmt.inserted.last_accessed)),
+        ("updated_at", stmt.inserted.updated_at),
+    ]))
+
+
+def adjust_course_totals(db: Session, chapter_id: int, delta: int) -> None:
+    """A content of chapter_id was added (+1) or removed (-1): move every summary of its course."""
+    db.execute(ADJUST_COURSE_TOTALS, {"chapter_id": chapter_id, "delta": delta})
+
+
+def remove_content(db: Session, chapter_id: int, content_id: int) -> None:
+    """
+    A content of chapter_id is being deleted, in the caller's transaction: its
+    completions leave the summaries, its progress rows go, and every summary of
+    the course loses one content from its total.
+    """
+    db.execute(UNCOUNT_CONTENT_COMPLETIONS, {"content_id": content_id})
+    db.execute(DELETE_CONTENT_PROGRESS, {"content_id": content_id})
+    adjust_course_totals(db, chapter_id, -1)
+
+
+def rebuild_summaries(db: Session, student_batch: int = 1000) -> int:
+    """
+    Recompute every summary from the progress table, one transaction per range
+    of student_batch student ids, and drop summaries that no progress row backs
+    any more. Returns the number of summary rows afterwards.
+    """
+    bounds = db.execute(text(
+        "SELECT MIN(student_id), MAX(student_id) FROM student_course_content_progress"
+    )).one()
+    if bounds[0] is not None:
+        first = bounds[0]
+        while first <= bounds[1]:
+            last = first + student_batch - 1
+            db.execute(REBUILD_SUMMARIES, {"first_student": first, "last_student": last})
+            db.commit()
+            first = last + 1
+
+    db.execute(text("""
+        DELETE s FROM student_course_summary s
+        LEFT JOIN student_course_content_progress p
+          ON p.student_id = s.student_id AND p.course_id = s.course_id
+        WHERE p.id IS NULL
+    """))
+    db.commit()
+    return db.execute(text("SELECT COUNT(*) FROM student_course_summary")).scalar()
+
+
+async def get_course_completion(db: AsyncSession, course_id: int, student_id: int) -> tuple[int, int]:
+    """(total_contents, completed_contents) from the rollup: one primary key lookup."""
+    summary = await db.get(StudentCourseSummary, (student_id, course_id))
+    if summary is not None:
+        return summary.total_contents, summary.completed_contents
+
+    # no progress yet: nothing completed, the total still comes from the course
+    total_contents = (
+        await db.execute(
+            select(func.count(ChapterContent.id))
+            .join(CourseChapter, CourseChapter.id == ChapterContent.chapter_id)
+            .where(CourseChapter.course_id == course_id)
+        )
+    ).scalar_one()
+    return total_contents, 0
+
+
+async def get_enrolled_course_completion(db: AsyncSession, student_id: int) -> list[dict]:
+    """
+    (course_id, title, total_contents, completed_contents) of every course the
+    student is enrolled in through a batch, in one query: the rollup row per
+    course, or a content count of that course when there is no progress yet.
+    """
+    enrolled = (
+        select(StudentBatch.course_id)
+        .join(StudentBatchAssignment, StudentBatchAssignment.batch_id == StudentBatch.id)
+        .where(StudentBatchAssignment.student_id == student_id)
+        .distinct()
+        .subquery()
+    )
+    course_total = (
+        select(func.count(ChapterContent.id))
+        .join(CourseChapter, CourseChapter.id == ChapterContent.chapter_id)
+        .where(CourseChapter.course_id == enrolled.c.course_id)
+        .scalar_subquery()
+    )
+    rows = await db.execute(
+        select(
+            enrolled.c.course_id,
+            Course.title,
+            func.coalesce(StudentCourseSummary.total_contents, course_total).label("total_contents"),
+            func.coalesce(StudentCourseSummary.completed_contents, 0).label("completed_contents"),
+        )
+        .select_from(enrolled)
+        .outerjoin(Course, Course.id == enrolled.c.course_id)
+        .outerjoin(
+            StudentCourseSummary,
+            and_(
+                StudentCourseSummary.student_id == student_id,
+                StudentCourseSummary.course_id == enrolled.c.course_id,
+            ),
+        )
+        .order_by(enrolled.c.course_id)
+    )
+    return [dict(row._mapping) for row in rows]
@@ -1,7 +1,13 @@
 from sqlalchemy.orm import Session, joinedload
-from app.models.models import User, UserRole, Role, Permission
-from app.schemas.auth import UserCreate, UserUpdate, UserLogin, UserOut, Token, AssignPermissionRequest
+from app.models.models import User, UserRole, Role, Permission, Module
+from app.schemas.auth import UserCreate, UserUpdate, UserLogin, UserOut, Token, AssignPermissionRequest, AssignPermissionMatrixRequest
 from app.core.security import security
+from app.core.principal_cache import principal_cache
+from app.core.permission_matrix import permission_matrix
+from app.core.token_revocation import token_revocation
+from app.repositories.permission_repo import PermissionRepository
+
+permission_repo = PermissionRepository()
 
 
 class UserService:
@@ -72,6 +78,9 @@ class UserService:
                 new_role = UserRole(user_id=user.id, role_id=r_id)
                 db.add(new_role)
             db.commit()
+            # role ids are baked into stateless tokens
+            token_revocation.bump_user(user.id)
+        principal_cache.evict_user(user.id)
         #user = db.query(User).filter(User.id == user_id).first()
         return user
 
@@ -86,6 +95,8 @@ class UserService:
 
         db.delete(user)
         db.commit()
+        principal_cache.evict_user(user_id)
+        token_revocation.bump_user(user_id)
         return True
 
     @staticmethod
@@ -226,8 +237,60 @@ class UserService:
 
         db.commit()
         db.refresh(permission)
+        permission_matrix.apply_permission(permission)
         return permission
 
+    @staticmethod
+    def assign_permission_matrix(payload: AssignPermissionMatrixRequest, db: Session) -> dict:
+        """
+        Apply a whole role x module matrix in one transaction with a single
+        multi-row INSERT ... ON DUPLICATE KEY UPDATE (uq_role_module).
+        Returns what was created and updated.
+        """
+        flags = ("can_create", "can_read", "can_update", "can_delete")
+
+        # last cell wins when the same (role, module) is sent twice
+        cells = {}
+        for cell in payload.permissions:
+            cells[(cell.role_id, cell.module_id)] = dict(zip(flags, (bool(x) for x in cell.permission_ids)))
+
+        role_ids = {role_id for role_id, _ in cells}
+        module_ids = {module_id for _, module_id in cells}
+        known_roles = {r.id for r in db.query(Role.id).filter(Role.id.in_(role_ids))}
+        known_modules = {m.id for m in db.query(Module.id).filter(Module.id.in_(module_ids))}
+        if role_ids - known_roles:
+            raise ValueError(f"Unknown role ids: {sorted(role_ids - known_roles)}")
+        if module_ids - known_modules:
+            raise ValueError(f"Unknown module ids: {sorted(module_ids - known_modules)}")
+
+        existing = {
+            (p.role_id, p.module_id): p
+            for p in db.query(Permission).filter(
+                Permission.role_id.in_(role_ids), Permission.module_id.in_(module_ids)
+            )
+        }
+
+        created, updated, rows = [], [], []
+        unchanged = 0
+        for (role_id, module_id), values in cells.items():
+            current = existing.get((role_id, module_id))
+            if current is None:
+                created.append({"role_id": role_id, "module_id": module_id, **values})
+            else:
+                before = {flag: bool(getattr(current, flag)) for flag in flags}
+                if before == values:
+                    unchanged += 1
+                    continue
+                updated.append({"role_id": role_id, "module_id": module_id, "before": before, "after": values})
+            rows.append({"role_id": role_id, "module_id": module_id, **values})
+
+        if rows:
+            permission_repo.upsert_many(db, rows, update_columns=list(flags))
+            # one rebuild instead of patching cell by cell
+            permission_matrix.invalidate()
+
+        return {"created": created, "updated": updated, "unchanged": unchanged}
+
 
     @staticmethod
     def get_users_by_role(role_name: str, db: Session):
@@ -1,4 +1,5 @@
 import os
+import shutil
 import time
 import random
 from fastapi import UploadFile, HTTPException
@@ -16,6 +17,10 @@ ALLOWED_EXT: Set[str] = ALLOWED_IMAGE_EXT | ALLOWED_VIDEO_EXT | ALLOWED_DOC_EXT
 
 
 async def validate_file_type(file: UploadFile):
+    check_file_type(file)
+
+
+def check_file_type(file: UploadFile):
     if not file or not file.filename:
         return
 
@@ -48,3 +53,19 @@ async def save_uploaded_file(file: UploadFile, directory: str = "uploads") -> st
         buffer.write(await file.read())
 
     return file_path
+
+
+def store_uploaded_file(file: UploadFile, directory: str = "uploads") -> str:
+    """save_uploaded_file() for sync routes, which FastAPI runs in its threadpool."""
+    check_file_type(file)
+
+    Path(directory).mkdir(parents=True, exist_ok=True)
+
+    ext = file.filename.split(".")[-1].lower()
+    new_filename = f"{int(time.time() * 1000)}_{random.randint(1000, 9999)}.{ext}"
+    file_path = os.path.join(directory, new_filename)
+
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    return file_path
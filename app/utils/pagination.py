@@ -1,8 +1,17 @@
+import base64
+import json
+from datetime import date, datetime
 from math import ceil
+from sqlalchemy import and_, or_
+from app.db.count_cache import count_cache
 
-def paginate_query(query, page: int = 1, limit: int = 10):
+def paginate_query(query, page: int = 1, limit: int = 10, count_key: tuple | None = None):
+    """count_key=(table, filters) caches the total in count_cache until the table is written."""
 
-    total_items = query.count()
+    if count_key is not None:
+        total_items = count_cache.count(*count_key, query.count)
+    else:
+        total_items = query.count()
     total_pages = ceil(total_items / limit) if total_items else 1
 
     items = query.offset((page - 1) * limit).limit(limit).all()
@@ -17,3 +26,117 @@ def paginate_query(query, page: int = 1, limit: int = 10):
         "has_prev": page > 1,
         "data": items,
     }
+
+
+# ---------------------------------------------------------------------------
+# Keyset (cursor) pagination
+#
+# A page continues after the (sort key, id) of the last row of the previous
+# page, so page 5000 costs the same index range scan as page 1 instead of
+# reading and discarding every skipped row as OFFSET does. The cursor handed
+# to clients is that tuple, JSON encoded and base64url'd: opaque, not signed.
+# ---------------------------------------------------------------------------
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values: tuple) -> str:
+    def dump(value):
+        if isinstance(value, datetime):
+            return {"dt": value.isoformat()}
+        if isinstance(value, date):
+            return {"d": value.isoformat()}
+        return value
+
+    raw = json.dumps([dump(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    def load(value):
+        if isinstance(value, dict):
+            if "dt" in value:
+                return datetime.fromisoformat(value["dt"])
+            if "d" in value:
+                return date.fromisoformat(value["d"])
+            raise InvalidCursor("Invalid cursor")
+        return value
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        raise InvalidCursor("Invalid cursor")
+    if not isinstance(values, list) or not values:
+        raise InvalidCursor("Invalid cursor")
+    return tuple(load(v) for v in values)
+
+
+def _after(sort_col, id_col, sort_value, last_id, descending: bool):
+    """Rows after (sort_value, last_id) in ORDER BY sort_col, id_col (MySQL: NULLs first ascending, last descending)."""
+    if descending:
+        if sort_value is None:
+            return and_(sort_col.is_(None), id_col < last_id)
+        return or_(sort_col < sort_value, and_(sort_col == sort_value, id_col < last_id), sort_col.is_(None))
+    if sort_value is None:
+        return or_(sort_col.is_not(None), and_(sort_col.is_(None), id_col > last_id))
+    return or_(sort_col > sort_value, and_(sort_col == sort_value, id_col > last_id))
+
+
+def keyset_order(stmt, id_col, sort_col=None, descending: bool = True):
+    """ORDER BY (sort_col, id_col): id_col breaks ties so the order is total."""
+    columns = [sort_col, id_col] if sort_col is not None else [id_col]
+    return stmt.order_by(None).order_by(*[c.desc() if descending else c.asc() for c in columns])
+
+
+def apply_keyset(stmt, id_col, sort_col=None, cursor: str | None = None, limit: int = 10, descending: bool = True):
+    """
+    Restrict a Query or select() to the page after `cursor` (None or "" for the
+    first page). One row more than `limit` is fetched to know if there is a next page.
+    """
+    stmt = keyset_order(stmt, id_col, sort_col, descending)
+    if cursor:
+        values = decode_cursor(cursor)
+        if sort_col is None:
+            if len(values) != 1:
+                raise InvalidCursor("Invalid cursor")
+            stmt = stmt.where(id_col < values[0] if descending else id_col > values[0])
+        else:
+            if len(values) != 2:
+                raise InvalidCursor("Invalid cursor")
+            stmt = stmt.where(_after(sort_col, id_col, values[0], values[1], descending))
+    return stmt.limit(limit + 1)
+
+
+def cursor_for(row, id_attr: str = "id", sort_attr: str | None = None) -> str:
+    values = (getattr(row, sort_attr), getattr(row, id_attr)) if sort_attr else (getattr(row, id_attr),)
+    return encode_cursor(values)
+
+
+def keyset_result(rows, limit: int, id_attr: str = "id", sort_attr: str | None = None):
+    """(items, next_cursor) from the limit + 1 rows fetched by apply_keyset."""
+    rows = list(rows)
+    has_next = len(rows) > limit
+    items = rows[:limit]
+    next_cursor = cursor_for(items[-1], id_attr, sort_attr) if has_next else None
+    return items, next_cursor
+
+
+def paginate_cursor(query, id_col, sort_col=None, cursor: str | None = None, limit: int = 10,
+                    descending: bool = True):
+    """Keyset counterpart of paginate_query for ORM Query objects; no COUNT(*)."""
+    items, next_cursor = keyset_result(
+        apply_keyset(query, id_col, sort_col, cursor, limit, descending).all(),
+        limit,
+        id_col.key,
+        sort_col.key if sort_col is not None else None,
+    )
+    return {
+        "success": True,
+        "limit": limit,
+        "cursor": cursor or None,
+        "next_cursor": next_cursor,
+        "has_next": next_cursor is not None,
+        "data": items,
+    }
@@ -0,0 +1,133 @@
+import importlib
+import pkgutil
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.mysql import LONGTEXT
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateTable
+
+import app.models
+from app.core.principal_cache import Principal
+from app.db.query_stats import install_query_stats, query_budget as budget
+from app.db.session import db as database
+from app.helper.dependencies import AuthError, auth_error_handler, current_principal
+
+# every model module, so relationship() names resolve across the three bases
+for module in pkgutil.iter_modules(app.models.__path__):
+    importlib.import_module(f"app.models.{module.name}")
+
+from app.models.chapter_content import ChapterContent
+from app.models.course import Course
+from app.models.course_category import CourseCategory
+from app.models.course_chapter import CourseChapter
+from app.models.discussion_comments import DiscussionComment
+from app.models.discussions import Discussion
+from app.models.models import User
+from app.models.student_course_progress import StudentCourseProgress
+from app.routers import course_chapter_routes, discussions_router
+
+TABLES = [User, CourseCategory, Course, CourseChapter, ChapterContent, StudentCourseProgress,
+          Discussion, DiscussionComment]
+
+
+@compiles(LONGTEXT, "sqlite")
+def _longtext(type_, compiler, **kw):
+    return "TEXT"
+
+
+def seed(session) -> None:
+    now = datetime(2026, 1, 1)
+    session.add_all([
+        User(id=i, name=f"User {i}", username=f"user{i}", email=f"user{i}@example.com", mobile=str(i),
+             hashed_password="x")
+        for i in range(1, 6)
+    ])
+    session.add(CourseCategory(id=1, name="Category"))
+    session.add(Course(id=1, title="Course", slug="course", user_id=1, category_id=1, course_type="online",
+                       course_mode="free", created_at=now))
+    session.add_all([
+        CourseChapter(id=i, course_id=1, user_id=1, chapter_name=f"Chapter {i}", description="d", order=i,
+                      created_at=now, updated_at=now)
+        for i in range(1, 6)
+    ])
+    session.flush()
+    session.execute(ChapterContent.__table__.insert(), [
+        dict(id=i, chapter_id=1, user_id=1, title=f"Content {i}", slug=f"content-{i}", content_type="text",
+             position=i, description="d", content_url="u", content="c", meta_data="{}", video_duration=1, thumbnail_url="t")
+        for i in range(1, 6)
+    ])
+    session.add_all([
+        StudentCourseProgress(student_id=2, course_id=1, chapter_id=1, content_id=i, complete_per="100",
+                              is_completed=True)
+        for i in range(1, 4)
+    ])
+    session.add_all([
+        Discussion(id=i, course_id=1, chapter_id=1, content_id=1, user_id=i, title=f"Question {i}", content="c",
+                   likes=0, created_at=now, updated_at=now)
+        for i in range(1, 6)
+    ])
+    session.add_all([
+        DiscussionComment(id=i, course_id=1, chapter_id=1, content_id=1, discussion_id=1, user_id=i,
+                          content="reply", likes=0, created_at=now)
+        for i in range(1, 6)
+    ])
+    session.commit()
+
+
+@pytest.fixture
+def client(tmp_path):
+    """TestClient over the chapter and discussion routers, on a seeded SQLite file, as student 2."""
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    engine = create_engine(url)
+    for model in TABLES:
+        with engine.begin() as conn:
+            conn.execute(CreateTable(model.__table__, include_foreign_key_constraints=[]))
+    SessionLocal = sessionmaker(bind=engine)
+    with SessionLocal() as session:
+        seed(session)
+
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    install_query_stats(engine)
+    install_query_stats(async_engine.sync_engine)
+
+    def get_db():
+        session = SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    async def get_async_db():
+        async with AsyncSessionLocal() as session:
+            yield session
+
+    test_app = FastAPI()
+    test_app.add_exception_handler(AuthError, auth_error_handler)
+    test_app.include_router(course_chapter_routes.router)
+    test_app.include_router(discussions_router.router)
+    test_app.dependency_overrides[database.get_db] = get_db
+    test_app.dependency_overrides[database.get_async_db] = get_async_db
+    test_app.dependency_overrides[database.get_async_read_db] = get_async_db
+    test_app.dependency_overrides[current_principal] = lambda: Principal(2, "user2", "student", [2], None)
+
+    with TestClient(test_app) as test_client:
+        yield test_client
+    engine.dispose()
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Assert the statements run by a block, e.g.
+
+        with query_budget(3, max_repeats=1):
+            client.get("/discussions/?content_id=1")
+    """
+    return budget
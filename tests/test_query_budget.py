@@ -0,0 +1,31 @@
+def test_discussions_batch_user_lookups(client, query_budget):
+    # discussions, their comments, and one IN query for every author
+    with query_budget(3, max_repeats=1):
+        response = client.get("/discussions/?content_id=1")
+
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+    assert len(response.json()[0]["comments"]) == 5
+
+
+def test_discussion_comments_batch_user_lookups(client, query_budget):
+    with query_budget(2, max_repeats=1):
+        response = client.get("/discussions/1/comments")
+
+    assert response.status_code == 200
+
+
+def test_student_chapter_list_batches_progress(client, query_budget):
+    with query_budget(3, max_repeats=1):
+        response = client.get("/chapters/student-course/1")
+
+    assert response.status_code == 200
+
+
+def test_chapter_contents_with_progress_is_one_query(client, query_budget):
+    with query_budget(1):
+        response = client.get("/chapters/1/contents")
+
+    assert response.status_code == 200
+    completed = [item["is_completed"] for item in response.json()["data"]]
+    assert completed == [1, 1, 1, None, None]
@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Integer, String, create_engine, select
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import StaticPool
+
+from app.db.routing import ReadRouter, RoutingSession
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50))
+
+
+def make_session():
+    primary = create_engine("sqlite://", poolclass=StaticPool)
+    replica = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(primary)
+    Base.metadata.create_all(replica)
+    router = ReadRouter([replica])
+    return RoutingSession(bind=primary, router=router), router
+
+
+def test_reads_go_to_the_replica_before_any_write():
+    session, router = make_session()
+
+    assert session.scalar(select(Item)) is None
+    assert router.replica_reads == 1
+    assert not session.wrote
+
+
+def test_flush_pins_later_reads_to_the_primary():
+    session, router = make_session()
+
+    session.add(Item(id=1, name="written"))
+    session.flush()
+
+    assert session.wrote
+    assert router.writes >= 1
+    # the replica has no copy of the row, only the primary can return it
+    assert session.scalar(select(Item).where(Item.id == 1)).name == "written"
+    assert router.sticky_reads == 1
+
+
+def test_commit_pins_later_reads_to_the_primary():
+    session, router = make_session()
+
+    session.add(Item(id=2, name="committed"))
+    session.commit()
+
+    assert session.scalar(select(Item.name).where(Item.id == 2)) == "committed"